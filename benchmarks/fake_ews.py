@@ -0,0 +1,679 @@
+"""Local stand-in for an Exchange Web Services endpoint.
+
+Implements just enough of the EWS SOAP protocol for exchangelib and this
+integration: version discovery (ConvertId), GetFolder, FindItem with a
+CalendarView, GetItem, CreateItem, UpdateItem, DeleteItem,
+SyncFolderItems, and GetUserAvailability with the GetServerTimeZones lookup
+it needs. Every mailbox shares the one calendar. Recurring items are weekly
+series kept at the same wall-clock time in the configured time zone, and
+describe their pattern in the Recurrence element. Single occurrences can be
+deleted, also by OccurrenceItemId, and are then listed as DeletedOccurrences.
+The calendar is generated from a seed, so runs with the same settings see the
+same data. Every request is counted per operation, with the
+bytes received and sent, and can be delayed to simulate a remote server. A
+share of the calendar requests can be answered with ErrorServerBusy to
+exercise throttling; those are counted as ``ServerBusy``. The counters are
+served as JSON on ``GET /stats``.
+
+Run standalone with ``python -m benchmarks.fake_ews --port 8080``.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+from zoneinfo import ZoneInfo
+
+from exchangelib.winzone import CLDR_TO_MS_TIMEZONE_MAP
+
+SOAP = "http://schemas.xmlsoap.org/soap/envelope/"
+MNS  = "http://schemas.microsoft.com/exchange/services/2006/messages"
+TNS  = "http://schemas.microsoft.com/exchange/services/2006/types"
+ENS  = "http://schemas.microsoft.com/exchange/services/2006/errors"
+
+SERVER_VERSION = (
+    f'<h:ServerVersionInfo xmlns:h="{TNS}" MajorVersion="15" MinorVersion="1" '
+    'MajorBuildNumber="2507" MinorBuildNumber="6" Version="Exchange2016"/>'
+)
+
+ORGANIZER     = "organizer@example.com"
+CATEGORIES    = ((), ("Red category",), (), ("Blue category", "Red category"))
+BUSY_STATUSES = ("Busy", "Busy", "Tentative", "Free", "OOF")
+
+# FieldURI -> element name, in the order the EWS schema expects them
+ITEM_FIELDS = {
+    "item:Subject":                       "Subject",
+    "item:Body":                          "Body",
+    "item:Categories":                    "Categories",
+    "calendar:Start":                     "Start",
+    "calendar:End":                       "End",
+    "calendar:IsAllDayEvent":             "IsAllDayEvent",
+    "calendar:LegacyFreeBusyStatus":      "LegacyFreeBusyStatus",
+    "calendar:Location":                  "Location",
+    "calendar:CalendarItemType":          "CalendarItemType",
+    "calendar:Organizer":                 "Organizer",
+    "calendar:Recurrence":                "Recurrence",
+    "calendar:LastOccurrence":            "LastOccurrence",
+    "calendar:DeletedOccurrences":        "DeletedOccurrences",
+    "calendar:StartTimeZone":             "StartTimeZone",
+    "calendar:EndTimeZone":               "EndTimeZone",
+}
+
+
+def _t(tag: str) -> str:
+    return f"{{{TNS}}}{tag}"
+
+
+def _m(tag: str) -> str:
+    return f"{{{MNS}}}{tag}"
+
+
+def _format_time(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+@dataclass
+class FakeItem:
+    """A calendar item as the fake server stores it."""
+
+    item_id: str
+    changekey: int
+    subject: str
+    start: datetime
+    end: datetime
+    location: Optional[str]
+    body: str
+    categories: Tuple[str, ...] = ()
+    organizer: str = ORGANIZER
+    busy_status: str = "Busy"
+    item_type: str = "Single"
+    # Weekly occurrences of a recurring master, including the first one, and the time zone they recur in
+    occurrences: int = 0
+    zone: tzinfo = timezone.utc
+    # All-day items start and end at midnight in their time zone
+    all_day: bool = False
+    # Indexes of the occurrences of a recurring master deleted on their own
+    deleted: Tuple[int, ...] = ()
+
+    def occurrence(self, index: int) -> "FakeItem":
+        # Adding to a local time keeps the wall-clock time across daylight saving changes
+        start = (self.start.astimezone(self.zone) + timedelta(weeks=index)).astimezone(timezone.utc)
+        return FakeItem(
+            item_id=f"{self.item_id}.{index}",
+            changekey=self.changekey,
+            subject=self.subject,
+            start=start,
+            end=start + (self.end - self.start),
+            location=self.location,
+            body=self.body,
+            categories=self.categories,
+            organizer=self.organizer,
+            busy_status=self.busy_status,
+            item_type="Occurrence",
+            zone=self.zone,
+            all_day=self.all_day,
+        )
+
+    def expand(self) -> List["FakeItem"]:
+        """Return what a CalendarView shows for this item."""
+        if self.item_type != "RecurringMaster":
+            return [self]
+        return [self.occurrence(index) for index in range(self.occurrences) if index not in self.deleted]
+
+
+@dataclass
+class FakeCalendarSettings:
+    """Shape of the generated calendar and behaviour of the server."""
+
+    items: int = 2000
+    days: int = 365
+    recurring_ratio: float = 0.1
+    occurrences: int = 26
+    body_size: int = 2048
+    latency: float = 0.05
+    # Share of item requests answered with ErrorServerBusy, and the back-off the answer asks for in seconds
+    busy_ratio: float = 0.0
+    busy_back_off: float = 0.2
+    timezone: str = "Europe/London"
+    seed: int = 1
+
+
+class FakeCalendar:
+    """The mailbox's calendar folder, with a change log for SyncFolderItems."""
+
+    def __init__(self, settings: FakeCalendarSettings):
+        self._lock    = threading.Lock()
+        self._items: Dict[str, FakeItem] = {}
+        # Item ids in the order they changed; a sync state is an offset into this log
+        self._changes: List[str] = []
+        self._next_id = 0
+        self._body    = "x" * settings.body_size
+
+        rng   = random.Random(settings.seed)
+        now   = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        first = now - timedelta(days=settings.days // 2)
+        zone  = ZoneInfo(settings.timezone)
+        for index in range(settings.items):
+            start = first + timedelta(hours=rng.randrange(settings.days * 24))
+            item  = self._add(
+                subject=f"Event {index}",
+                start=start,
+                end=start + timedelta(minutes=rng.choice((30, 60, 90, 120))),
+                location=rng.choice((None, "Room A", "Room B", "Online")),
+                body=self._body,
+                # Derived from the index so the random draws, and with them the calendar, match earlier runs
+                categories=CATEGORIES[index % len(CATEGORIES)],
+                organizer=f"organizer{index % 10}@example.com",
+                busy_status=BUSY_STATUSES[index % len(BUSY_STATUSES)],
+            )
+            if rng.random() < settings.recurring_ratio:
+                item.item_type   = "RecurringMaster"
+                item.occurrences = settings.occurrences
+                item.zone        = zone
+
+    def _add(self, **fields) -> FakeItem:
+        self._next_id += 1
+        item = FakeItem(item_id=f"AAMk{self._next_id:08d}", changekey=1, **fields)
+        self._items[item.item_id] = item
+        self._changes.append(item.item_id)
+        return item
+
+    def _touch(self, item_id: str) -> None:
+        self._changes.append(item_id)
+
+    def get(self, item_id: str) -> Optional[FakeItem]:
+        master_id, _, index = item_id.partition(".")
+        with self._lock:
+            item = self._items.get(master_id)
+        if item is not None and index:
+            return item.occurrence(int(index)) if int(index) < item.occurrences and int(index) not in item.deleted else None
+        return item
+
+    def view(self, start: datetime, end: datetime) -> List[FakeItem]:
+        with self._lock:
+            items = list(self._items.values())
+        return sorted(
+            (
+                occurrence for item in items for occurrence in item.expand()
+                if occurrence.start < end and occurrence.end >= start
+            ),
+            key=lambda occurrence: occurrence.start,
+        )
+
+    def create(self, subject, start, end, location, body) -> FakeItem:
+        with self._lock:
+            return self._add(subject=subject or "", start=start, end=end, location=location, body=body or "")
+
+    def update(self, item_id: str, fields: Dict[str, Optional[str]]) -> Optional[FakeItem]:
+        with self._lock:
+            item = self._items.get(item_id.partition(".")[0])
+            if item is None:
+                return None
+            for name, value in fields.items():
+                if name in ("Start", "End"):
+                    setattr(item, name.lower(), _parse_time(value))
+                elif name in ("Subject", "Location", "Body"):
+                    setattr(item, name.lower(), value if value is not None else ("" if name != "Location" else None))
+            item.changekey += 1
+            self._touch(item.item_id)
+            return item
+
+    def delete(self, item_id: str) -> bool:
+        master_id, _, index = item_id.partition(".")
+        with self._lock:
+            item = self._items.get(master_id)
+            if item is None:
+                return False
+            if index:
+                # Deleting an occurrence changes its master
+                if int(index) >= item.occurrences or int(index) in item.deleted:
+                    return False
+                item.deleted   += (int(index),)
+                item.changekey += 1
+            else:
+                del self._items[master_id]
+            self._touch(master_id)
+            return True
+
+    def changes_since(self, offset: int, limit: int):
+        """Return ([(item id, item or None if deleted)], new offset, last page) for a sync state offset."""
+        with self._lock:
+            page     = {}
+            position = offset
+            while position < len(self._changes) and len(page) < limit:
+                page.setdefault(self._changes[position])
+                position += 1
+            return [(item_id, self._items.get(item_id)) for item_id in page], position, position == len(self._changes)
+
+
+class FakeEwsServer:
+    """Threaded HTTP server answering EWS SOAP requests from a FakeCalendar."""
+
+    def __init__(self, settings: FakeCalendarSettings, host: str = "127.0.0.1", port: int = 0):
+        self.settings   = settings
+        self.calendar   = FakeCalendar(settings)
+        self.requests   = Counter()
+        self.bytes_in   = 0
+        self.bytes_out  = 0
+        self._lock      = threading.Lock()
+        self._busy_rng  = random.Random(settings.seed)
+        self._httpd     = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def service_endpoint(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/EWS/Exchange.asmx"
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def start(self) -> None:
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-ews", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self) -> Dict[str, object]:
+        """Return the request counts and bytes transferred so far."""
+        with self._lock:
+            return {
+                "requests":  dict(self.requests),
+                "bytes_in":  self.bytes_in,
+                "bytes_out": self.bytes_out,
+            }
+
+    def _record(self, operation: str, received: int, sent: int) -> None:
+        with self._lock:
+            self.requests[operation] += 1
+            self.bytes_in  += received
+            self.bytes_out += sent
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                payload = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                operation, body = server.handle(payload)
+                response = _envelope(body).encode("utf-8")
+                if server.settings.latency:
+                    time.sleep(server.settings.latency)
+                # Like Exchange, SOAP faults come with a 500
+                self.send_response(500 if operation == "ServerBusy" else 200)
+                self.send_header("Content-Type", "text/xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+                server._record(operation, len(payload), len(response))
+
+            def do_GET(self):
+                # Lets a benchmark running in another process read the counters
+                response = json.dumps(server.stats()).encode("utf-8")
+                self.send_response(200 if self.path == "/stats" else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def handle(self, payload: bytes):
+        """Return (operation name, SOAP body) for one request."""
+        body      = ET.fromstring(payload).find(f"{{{SOAP}}}Body")
+        request   = body[0]
+        # GetUserAvailability is the one operation whose element carries a Request suffix
+        operation = request.tag.split("}", 1)[1].removesuffix("Request")
+        handler   = getattr(self, f"_{operation}", None)
+        if handler is None:
+            return operation, _fault(f"{operation} is not implemented by the fake server")
+        if operation not in ("ConvertId", "GetFolder") and self._busy():
+            return "ServerBusy", _busy_fault(self.settings.busy_back_off)
+        return operation, handler(request)
+
+    def _busy(self) -> bool:
+        if not self.settings.busy_ratio:
+            return False
+        with self._lock:
+            return self._busy_rng.random() < self.settings.busy_ratio
+
+    # Operations
+
+    def _ConvertId(self, request):
+        # Only used by exchangelib to discover the server version from the response header
+        return _response("ConvertId", [_error("ConvertId", "ErrorInvalidIdMalformed", "Id is malformed.")])
+
+    def _GetFolder(self, request):
+        messages = []
+        for folder in request.find(_m("FolderIds")):
+            name = folder.get("Id")
+            tag  = "CalendarFolder" if name == "calendar" else "Folder"
+            messages.append(_success(
+                "GetFolder",
+                f'<m:Folders><t:{tag}><t:FolderId Id="{name}" ChangeKey="1"/>'
+                f"<t:DisplayName>{name.title()}</t:DisplayName></t:{tag}></m:Folders>",
+            ))
+        return _response("GetFolder", messages)
+
+    def _FindItem(self, request):
+        fields = _requested_fields(request.find(_m("ItemShape")))
+        view   = request.find(_m("CalendarView"))
+        if view is not None:
+            items = self.calendar.view(_parse_time(view.get("StartDate")), _parse_time(view.get("EndDate")))
+            limit = int(view.get("MaxEntriesReturned") or len(items))
+        else:
+            items = self.calendar.view(datetime.min.replace(tzinfo=timezone.utc), datetime.max.replace(tzinfo=timezone.utc))
+            limit = len(items)
+        shown = items[:limit]
+        return _response("FindItem", [_success(
+            "FindItem",
+            f'<m:RootFolder TotalItemsInView="{len(items)}" IncludesLastItemInRange="{str(len(shown) == len(items)).lower()}">'
+            f"<t:Items>{''.join(_item_xml(item, fields) for item in shown)}</t:Items></m:RootFolder>",
+        )])
+
+    def _GetItem(self, request):
+        fields   = _requested_fields(request.find(_m("ItemShape")))
+        messages = []
+        for item_id in request.find(_m("ItemIds")):
+            item = self.calendar.get(_item_id(item_id))
+            if item is None:
+                messages.append(_error("GetItem", "ErrorItemNotFound", "The specified object was not found in the store."))
+            else:
+                messages.append(_success("GetItem", f"<m:Items>{_item_xml(item, fields)}</m:Items>"))
+        return _response("GetItem", messages)
+
+    def _CreateItem(self, request):
+        messages = []
+        for element in request.find(_m("Items")):
+            item = self.calendar.create(
+                subject=element.findtext(_t("Subject")),
+                start=_parse_time(element.findtext(_t("Start"))),
+                end=_parse_time(element.findtext(_t("End"))),
+                location=element.findtext(_t("Location")),
+                body=element.findtext(_t("Body")),
+            )
+            messages.append(_success("CreateItem", f"<m:Items>{_item_xml(item, ())}</m:Items>"))
+        return _response("CreateItem", messages)
+
+    def _UpdateItem(self, request):
+        messages = []
+        for change in request.find(_m("ItemChanges")):
+            fields = {}
+            for update in change.find(_t("Updates")):
+                uri  = update.find(_t("FieldURI"))
+                name = ITEM_FIELDS.get(uri.get("FieldURI")) if uri is not None else None
+                if name is None:
+                    continue
+                if update.tag == _t("DeleteItemField"):
+                    fields[name] = None
+                else:
+                    fields[name] = update.find(_t("CalendarItem")).findtext(_t(name))
+            item = self.calendar.update(change.find(_t("ItemId")).get("Id"), fields)
+            if item is None:
+                messages.append(_error("UpdateItem", "ErrorItemNotFound", "The specified object was not found in the store."))
+            else:
+                messages.append(_success(
+                    "UpdateItem",
+                    f"<m:Items>{_item_xml(item, ())}</m:Items><m:ConflictResults><t:Count>0</t:Count></m:ConflictResults>",
+                ))
+        return _response("UpdateItem", messages)
+
+    def _DeleteItem(self, request):
+        messages = []
+        for item_id in request.find(_m("ItemIds")):
+            if self.calendar.delete(_item_id(item_id)):
+                messages.append(_success("DeleteItem", ""))
+            else:
+                messages.append(_error("DeleteItem", "ErrorItemNotFound", "The specified object was not found in the store."))
+        return _response("DeleteItem", messages)
+
+    def _GetServerTimeZones(self, request):
+        # Every zone is described without daylight saving time; availability times are answered in UTC anyway
+        definitions = "".join(
+            f'<t:TimeZoneDefinition Id="{escape(zone_id.text)}" Name="{escape(zone_id.text)}">'
+            '<t:Periods><t:Period Bias="PT0M" Name="Standard" Id="Std"/></t:Periods>'
+            '<t:TransitionsGroups><t:TransitionsGroup Id="0"><t:Transition><t:To Kind="Period">Std</t:To></t:Transition>'
+            '</t:TransitionsGroup></t:TransitionsGroups>'
+            '<t:Transitions><t:Transition><t:To Kind="Group">0</t:To></t:Transition></t:Transitions>'
+            "</t:TimeZoneDefinition>"
+            for zone_id in request.iter(_t("Id"))
+        )
+        return _response("GetServerTimeZones", [_success(
+            "GetServerTimeZones", f"<m:TimeZoneDefinitions>{definitions}</m:TimeZoneDefinitions>"
+        )])
+
+    def _GetUserAvailability(self, request):
+        window = request.find(f"{_t('FreeBusyViewOptions')}/{_t('TimeWindow')}")
+        items  = self.calendar.view(_parse_time(window.findtext(_t("StartTime"))), _parse_time(window.findtext(_t("EndTime"))))
+        events = "".join(
+            f"<t:CalendarEvent><t:StartTime>{_format_time(item.start)}</t:StartTime>"
+            f"<t:EndTime>{_format_time(item.end)}</t:EndTime><t:BusyType>{item.busy_status}</t:BusyType></t:CalendarEvent>"
+            for item in items
+        )
+        view = (
+            "<m:FreeBusyView><t:FreeBusyViewType>FreeBusy</t:FreeBusyViewType>"
+            f"<t:CalendarEventArray>{events}</t:CalendarEventArray></m:FreeBusyView>"
+        )
+        responses = "".join(
+            '<m:FreeBusyResponse><m:ResponseMessage ResponseClass="Success"><m:ResponseCode>NoError</m:ResponseCode>'
+            f"</m:ResponseMessage>{view}</m:FreeBusyResponse>"
+            for _ in request.find(_m("MailboxDataArray"))
+        )
+        return (
+            f'<m:GetUserAvailabilityResponse xmlns:m="{MNS}" xmlns:t="{TNS}">'
+            f"<m:FreeBusyResponseArray>{responses}</m:FreeBusyResponseArray></m:GetUserAvailabilityResponse>"
+        )
+
+    def _SyncFolderItems(self, request):
+        fields = _requested_fields(request.find(_m("ItemShape")))
+        offset = int(request.findtext(_m("SyncState")) or 0)
+        limit  = int(request.findtext(_m("MaxChangesReturned")) or 100)
+        changes, offset, last = self.calendar.changes_since(offset, limit)
+        elements = []
+        for item_id, item in changes:
+            if item is None:
+                elements.append(f'<t:Delete><t:ItemId Id="{item_id}" ChangeKey="0"/></t:Delete>')
+            else:
+                elements.append(f"<t:Create>{_item_xml(item, fields)}</t:Create>")
+        return _response("SyncFolderItems", [_success(
+            "SyncFolderItems",
+            f"<m:SyncState>{offset}</m:SyncState>"
+            f"<m:IncludesLastItemInRange>{str(last).lower()}</m:IncludesLastItemInRange>"
+            f"<m:Changes>{''.join(elements)}</m:Changes>",
+        )])
+
+
+def _requested_fields(shape) -> List[str]:
+    if shape is None:
+        return list(ITEM_FIELDS.values())
+    names = []
+    for uri in shape.iter(_t("FieldURI")):
+        name = ITEM_FIELDS.get(uri.get("FieldURI"))
+        if name:
+            names.append(name)
+    if shape.findtext(_t("BaseShape")) == "AllProperties" and not names:
+        names = list(ITEM_FIELDS.values())
+    return names
+
+
+def _item_id(element) -> str:
+    """Return the fake id an ItemId or OccurrenceItemId element refers to."""
+    if element.tag == _t("OccurrenceItemId"):
+        # Instance indexes count from 1
+        return f"{element.get('RecurringMasterId')}.{int(element.get('InstanceIndex')) - 1}"
+    return element.get("Id")
+
+
+def _item_xml(item: FakeItem, fields) -> str:
+    parts = [f'<t:ItemId Id="{item.item_id}" ChangeKey="{item.changekey}"/>']
+    for name in ITEM_FIELDS.values():
+        if name not in fields:
+            continue
+        if name == "Subject":
+            parts.append(f"<t:Subject>{escape(item.subject)}</t:Subject>")
+        elif name == "Body":
+            parts.append(f'<t:Body BodyType="Text">{escape(item.body)}</t:Body>')
+        elif name in ("Start", "End"):
+            parts.append(f"<t:{name}>{_format_time(getattr(item, name.lower()))}</t:{name}>")
+        elif name == "IsAllDayEvent":
+            parts.append(f"<t:IsAllDayEvent>{'true' if item.all_day else 'false'}</t:IsAllDayEvent>")
+        elif name == "Location" and item.location is not None:
+            parts.append(f"<t:Location>{escape(item.location)}</t:Location>")
+        elif name == "Categories" and item.categories:
+            strings = "".join(f"<t:String>{escape(category)}</t:String>" for category in item.categories)
+            parts.append(f"<t:Categories>{strings}</t:Categories>")
+        elif name == "LegacyFreeBusyStatus":
+            parts.append(f"<t:LegacyFreeBusyStatus>{item.busy_status}</t:LegacyFreeBusyStatus>")
+        elif name == "Organizer":
+            parts.append(f"<t:Organizer><t:Mailbox><t:EmailAddress>{escape(item.organizer)}</t:EmailAddress></t:Mailbox></t:Organizer>")
+        elif name == "CalendarItemType":
+            parts.append(f"<t:CalendarItemType>{item.item_type}</t:CalendarItemType>")
+        elif name == "Recurrence" and item.item_type == "RecurringMaster":
+            local = item.start.astimezone(item.zone)
+            parts.append(
+                "<t:Recurrence><t:WeeklyRecurrence><t:Interval>1</t:Interval>"
+                f"<t:DaysOfWeek>{local.strftime('%A')}</t:DaysOfWeek></t:WeeklyRecurrence>"
+                f"<t:NumberedRecurrence><t:StartDate>{local.strftime('%Y-%m-%d')}{local.isoformat()[-6:]}</t:StartDate>"
+                f"<t:NumberOfOccurrences>{item.occurrences}</t:NumberOfOccurrences></t:NumberedRecurrence></t:Recurrence>"
+            )
+        elif name == "LastOccurrence" and item.item_type == "RecurringMaster":
+            last = item.occurrence(item.occurrences - 1)
+            parts.append(
+                f'<t:LastOccurrence><t:ItemId Id="{last.item_id}" ChangeKey="{last.changekey}"/>'
+                f"<t:Start>{_format_time(last.start)}</t:Start><t:End>{_format_time(last.end)}</t:End>"
+                f"<t:OriginalStart>{_format_time(last.start)}</t:OriginalStart></t:LastOccurrence>"
+            )
+        elif name == "DeletedOccurrences" and item.deleted:
+            occurrences = "".join(
+                f"<t:DeletedOccurrence><t:Start>{_format_time(item.occurrence(index).start)}</t:Start></t:DeletedOccurrence>"
+                for index in sorted(item.deleted)
+            )
+            parts.append(f"<t:DeletedOccurrences>{occurrences}</t:DeletedOccurrences>")
+        elif name in ("StartTimeZone", "EndTimeZone"):
+            parts.append(f'<t:{name} Id="{_ms_zone(item.zone)}"/>')
+    return f"<t:CalendarItem>{''.join(parts)}</t:CalendarItem>"
+
+
+def _ms_zone(zone: tzinfo) -> str:
+    """Return the Windows time zone id of a zone, the way EWS names the zones of items."""
+    if zone is timezone.utc:
+        return "UTC"
+    return CLDR_TO_MS_TIMEZONE_MAP[str(zone)][0]
+
+
+def _success(operation: str, content: str) -> str:
+    return (
+        f'<m:{operation}ResponseMessage ResponseClass="Success"><m:ResponseCode>NoError</m:ResponseCode>'
+        f"{content}</m:{operation}ResponseMessage>"
+    )
+
+
+def _error(operation: str, code: str, text: str) -> str:
+    return (
+        f'<m:{operation}ResponseMessage ResponseClass="Error"><m:MessageText>{escape(text)}</m:MessageText>'
+        f"<m:ResponseCode>{code}</m:ResponseCode><m:DescriptiveLinkKey>0</m:DescriptiveLinkKey>"
+        f"</m:{operation}ResponseMessage>"
+    )
+
+
+def _response(operation: str, messages: List[str]) -> str:
+    return (
+        f'<m:{operation}Response xmlns:m="{MNS}" xmlns:t="{TNS}">'
+        f"<m:ResponseMessages>{''.join(messages)}</m:ResponseMessages></m:{operation}Response>"
+    )
+
+
+def _fault(text: str) -> str:
+    return f"<s:Fault><faultcode>s:Client</faultcode><faultstring>{escape(text)}</faultstring></s:Fault>"
+
+
+def _busy_fault(back_off: float) -> str:
+    return (
+        "<s:Fault><faultcode>s:Server</faultcode>"
+        "<faultstring>The server cannot service this request right now. Try again later.</faultstring>"
+        f'<detail><e:ResponseCode xmlns:e="{ENS}">ErrorServerBusy</e:ResponseCode>'
+        f'<e:Message xmlns:e="{ENS}">The server cannot service this request right now. Try again later.</e:Message>'
+        f'<t:MessageXml xmlns:t="{TNS}"><t:Value Name="BackOffMilliseconds">{int(back_off * 1000)}</t:Value></t:MessageXml>'
+        "</detail></s:Fault>"
+    )
+
+
+def _envelope(body: str) -> str:
+    return (
+        f'<?xml version="1.0" encoding="utf-8"?><s:Envelope xmlns:s="{SOAP}">'
+        f"<s:Header>{SERVER_VERSION}</s:Header><s:Body>{body}</s:Body></s:Envelope>"
+    )
+
+
+def serve(settings: FakeCalendarSettings, ready, port: int = 0) -> None:
+    """Run a server until the process is terminated, reporting its endpoint on the ready queue."""
+    server = FakeEwsServer(settings, port=port)
+    ready.put(server.service_endpoint)
+    server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a generated calendar over a fake EWS endpoint.")
+    parser.add_argument("--port", type=int, default=8080)
+    add_settings_arguments(parser)
+    args   = parser.parse_args()
+    server = FakeEwsServer(settings_from_arguments(args), port=args.port)
+    print(f"Serving {args.items} items on {server.service_endpoint}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def add_settings_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the FakeCalendarSettings options to a command line parser."""
+    defaults = FakeCalendarSettings()
+    parser.add_argument("--items", type=int, default=defaults.items, help="calendar items to generate")
+    parser.add_argument("--days", type=int, default=defaults.days, help="days the items are spread over, centred on now")
+    parser.add_argument("--recurring-ratio", type=float, default=defaults.recurring_ratio, help="share of items that are weekly series")
+    parser.add_argument("--occurrences", type=int, default=defaults.occurrences, help="occurrences per series")
+    parser.add_argument("--body-size", type=int, default=defaults.body_size, help="body length in characters")
+    parser.add_argument("--latency", type=float, default=defaults.latency * 1000, help="delay added to every request, in ms")
+    parser.add_argument("--busy-ratio", type=float, default=defaults.busy_ratio, help="share of item requests answered with ErrorServerBusy")
+    parser.add_argument("--busy-back-off", type=float, default=defaults.busy_back_off * 1000, help="back-off asked for by ErrorServerBusy, in ms")
+    parser.add_argument("--timezone", default=defaults.timezone, help="time zone of the series, and of Home Assistant and the entry in the benchmark")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def settings_from_arguments(args: argparse.Namespace) -> FakeCalendarSettings:
+    return FakeCalendarSettings(
+        items=args.items,
+        days=args.days,
+        recurring_ratio=args.recurring_ratio,
+        occurrences=args.occurrences,
+        body_size=args.body_size,
+        latency=args.latency / 1000,
+        busy_ratio=args.busy_ratio,
+        busy_back_off=args.busy_back_off / 1000,
+        timezone=args.timezone,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
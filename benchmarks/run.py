@@ -0,0 +1,376 @@
+"""Benchmark the integration against a local fake EWS server.
+
+Run from the repository root with Home Assistant and exchangelib installed:
+
+    python -m benchmarks.run --latency 50 --items 2000 --recurring-ratio 0.1
+
+The fake server runs in its own process so its allocations and CPU time stay
+out of the measurements. Each scenario drives the integration's real code
+paths (the shared client, the calendar entity and the services) and reports
+latency percentiles, the EWS requests it caused per operation, the bytes sent
+and received, and the peak Python memory allocated while it ran. ``--json``
+writes the same figures to a file for comparing runs.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import statistics
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from collections import Counter
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+
+from exchangelib import Configuration, Credentials
+from exchangelib.transport import NOAUTH
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.exchange_calendar import _async_setup_entry_data, _create_executor, async_register_services
+from custom_components.exchange_calendar.calendar import ExchangeCalendarEntity
+from custom_components.exchange_calendar.connection import ExchangeConnection
+from custom_components.exchange_calendar.const import (
+    DOMAIN,
+    CONF_CALENDARS,
+    CONF_EXPAND_RECURRENCES,
+    DEFAULT_MAX_CONNECTIONS,
+    SERVICE_BULK_CREATE_EVENTS,
+    SERVICE_BULK_DELETE_EVENTS,
+    SERVICE_CREATE_EVENT,
+    SERVICE_DELETE_EVENT,
+    SERVICE_EDIT_EVENT,
+    SERVICE_EXPORT_ICS,
+    SERVICE_GET_AVAILABILITY,
+    SERVICE_SEARCH_EVENT,
+)
+
+from .fake_ews import add_settings_arguments, serve, settings_from_arguments
+
+EMAIL    = "benchmark@example.com"
+ENTRY_ID = "benchmark"
+# Events created by the bulk scenario, enough for several chunks
+BULK_EVENTS = 250
+# Queued edits to the same event in the write queue scenario
+QUEUED_EDITS = 10
+
+
+class FakeServerProcess:
+    """The fake EWS server in a child process."""
+
+    def __init__(self, settings):
+        ready = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=serve, args=(settings, ready), daemon=True)
+        self._process.start()
+        self.service_endpoint = ready.get(timeout=60)
+        self._stats_url = self.service_endpoint.rsplit("/EWS/", 1)[0] + "/stats"
+
+    def stats(self) -> Dict[str, Any]:
+        with urllib.request.urlopen(self._stats_url) as response:
+            return json.load(response)
+
+    def stop(self) -> None:
+        self._process.terminate()
+        self._process.join()
+
+
+class Scenario:
+    """Collects the figures of one benchmark scenario."""
+
+    def __init__(self, name: str, server: FakeServerProcess):
+        self.name      = name
+        self._server   = server
+        self.latencies: List[float] = []
+
+    async def async_measure(self, func: Callable[[], Awaitable[Any]], iterations: int) -> Dict[str, Any]:
+        before = await asyncio.to_thread(self._server.stats)
+        tracemalloc.reset_peak()
+        base_memory = tracemalloc.get_traced_memory()[0]
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await func()
+            self.latencies.append((time.perf_counter() - started) * 1000)
+        peak_memory = tracemalloc.get_traced_memory()[1] - base_memory
+        after = await asyncio.to_thread(self._server.stats)
+
+        requests = Counter(after["requests"])
+        requests.subtract(before["requests"])
+        return {
+            "name":       self.name,
+            "calls":      len(self.latencies),
+            "latency_ms": _percentiles(self.latencies),
+            "requests":   {operation: count for operation, count in sorted(requests.items()) if count},
+            "bytes_sent": after["bytes_in"] - before["bytes_in"],
+            "bytes_received": after["bytes_out"] - before["bytes_out"],
+            "peak_memory": peak_memory,
+        }
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if len(values) == 1:
+        return {"p50": values[0], "p95": values[0], "p99": values[0], "max": values[0]}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(values)}
+
+
+async def async_setup(hass: HomeAssistant, server: FakeServerProcess, timezone, calendars: int = 0, expand: bool = False):
+    """Set up the integration against the fake server with the code async_setup_entry runs.
+
+    Only the connection differs: the fake server speaks plain HTTP without
+    authentication, so it is built here instead of by the connection manager.
+    """
+    # Extra calendars are delegate mailboxes; the fake server answers them all from the same calendar
+    entry = SimpleNamespace(entry_id=ENTRY_ID, options={
+        CONF_CALENDARS: [f"room{index}@example.com" for index in range(calendars)],
+        CONF_EXPAND_RECURRENCES: expand,
+    })
+    metrics, executor = _create_executor(entry)
+    config = Configuration(
+        service_endpoint=server.service_endpoint,
+        credentials=Credentials(username=EMAIL, password="benchmark"),
+        auth_type=NOAUTH,
+        max_connections=DEFAULT_MAX_CONNECTIONS,
+    )
+    connection = ExchangeConnection(hass, executor, EMAIL, config)
+    connection.start()
+    await connection.async_get_account()
+
+    data = await _async_setup_entry_data(hass, entry, connection, executor, metrics, timezone)
+    async_register_services(hass, entry)
+    return data
+
+
+async def async_run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    server = FakeServerProcess(settings_from_arguments(args))
+    results = []
+    data: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        timezone = dt_util.get_time_zone(args.timezone)
+        dt_util.set_default_time_zone(timezone)
+        tracemalloc.start()
+        try:
+            async def setup():
+                data.update(await async_setup(hass, server, timezone, args.calendars, args.expand_recurrences))
+                await asyncio.gather(*(client.async_refresh() for client in data["clients"].values()))
+
+            results.append(await Scenario("setup and initial sync", server).async_measure(setup, 1))
+            client, cache, sync = data["client"], data["cache"], data["sync"]
+            entity = ExchangeCalendarEntity(client, data["timezone"], "Benchmark", ENTRY_ID)
+            entity.hass = hass
+            entities = [
+                ExchangeCalendarEntity(calendar, data["timezone"], f"Benchmark {key}", ENTRY_ID)
+                for key, calendar in data["clients"].items()
+            ]
+            for calendar_entity in entities:
+                calendar_entity.hass = hass
+
+            iterations = args.iterations
+            now        = dt_util.now()
+
+            async def services(service: str, service_data: Dict[str, Any]):
+                # A failed call would be timed and counted like a successful one, so it stops the run instead
+                response = await hass.services.async_call(
+                    DOMAIN, service, service_data, blocking=True, return_response=True
+                )
+                if not response.get("success", True):
+                    raise RuntimeError(f"{service} failed: {response}")
+                return response
+
+            async def cold_month():
+                cache.invalidate()
+                await client.async_get_events(now, now + timedelta(days=30))
+
+            async def warm_month():
+                await client.async_get_events(now, now + timedelta(days=30))
+
+            async def cold_year():
+                cache.invalidate()
+                await client.async_get_events(now - timedelta(days=180), now + timedelta(days=180))
+
+            async def concurrent_month():
+                cache.invalidate()
+                await asyncio.gather(*(client.async_get_events(now, now + timedelta(days=30)) for _ in range(8)))
+
+            async def changed_update():
+                cache.invalidate()
+                client.next_event.invalidate()
+                await entity.async_update()
+
+            async def changed_update_all():
+                # The entities of every calendar looking up their next event again at once
+                for calendar in data["clients"].values():
+                    calendar.next_event.invalidate()
+                await asyncio.gather(*(calendar_entity.async_update() for calendar_entity in entities))
+
+            async def availability():
+                await services(SERVICE_GET_AVAILABILITY, {
+                    "date_start": now.isoformat(),
+                    "date_end":   (now + timedelta(days=30)).isoformat(),
+                    "mailboxes":  [EMAIL, "room1@example.com", "room2@example.com"],
+                    "duration":   30,
+                })
+
+            async def export(incremental: bool):
+                await services(SERVICE_EXPORT_ICS, {
+                    "date_start":   (now - timedelta(days=180)).isoformat(),
+                    "date_end":     (now + timedelta(days=180)).isoformat(),
+                    "include_body": True,
+                    "incremental":  incremental,
+                })
+
+            scenarios = [
+                ("async_get_events 30 days, cold cache", cold_month),
+                ("async_get_events 30 days, warm cache", warm_month),
+                ("async_get_events 1 year, cold cache", cold_year),
+                ("async_get_events 30 days x8 concurrent", concurrent_month),
+                ("entity async_update", entity.async_update),
+                ("entity async_update after a change", changed_update),
+                (f"async_update after a change, {len(entities)} calendars", changed_update_all),
+                ("search_event 30 days with bodies", lambda: services(SERVICE_SEARCH_EVENT, {
+                    "date_start": now.isoformat(),
+                    "date_end":   (now + timedelta(days=30)).isoformat(),
+                })),
+                ("search_event 30 days without bodies", lambda: services(SERVICE_SEARCH_EVENT, {
+                    "date_start":   now.isoformat(),
+                    "date_end":     (now + timedelta(days=30)).isoformat(),
+                    "include_body": False,
+                })),
+                ("search_event 30 days filtered, compact", lambda: services(SERVICE_SEARCH_EVENT, {
+                    "date_start":  now.isoformat(),
+                    "date_end":    (now + timedelta(days=30)).isoformat(),
+                    "busy_status": ["Busy", "OOF"],
+                    "categories":  ["Red category"],
+                    "compact":     True,
+                })),
+                ("search_event 30 days first page of 20", lambda: services(SERVICE_SEARCH_EVENT, {
+                    "date_start": now.isoformat(),
+                    "date_end":   (now + timedelta(days=30)).isoformat(),
+                    "limit":      20,
+                })),
+                ("get_availability 30 days, 3 mailboxes", availability),
+                ("export_ics 1 year with bodies", lambda: export(False)),
+                ("export_ics 1 year with bodies, incremental", lambda: export(True)),
+            ]
+            for name, func in scenarios:
+                results.append(await Scenario(name, server).async_measure(func, iterations))
+
+            # Mutations work on their own events, placed where the default search windows find them
+            subjects = iter(range(iterations))
+            results.append(await Scenario("create_event", server).async_measure(
+                lambda: _create(services, next(subjects), now), iterations
+            ))
+            subjects = iter(range(iterations))
+            results.append(await Scenario("edit_event", server).async_measure(
+                lambda: services(SERVICE_EDIT_EVENT, {
+                    "subject":      _subject(next(subjects)),
+                    "new_location": "Benchmark room",
+                }), iterations
+            ))
+
+            async def queued_edits():
+                # A burst of edits to one event, returning before Exchange is called, then the one write they fold into
+                for index in range(QUEUED_EDITS):
+                    await services(SERVICE_EDIT_EVENT, {
+                        "subject":      _subject(0),
+                        "new_location": f"Benchmark room {index}",
+                        "queued":       True,
+                    })
+                await data["queue"].async_flush()
+
+            results.append(await Scenario(f"edit_event x{QUEUED_EDITS} queued, one event", server).async_measure(
+                queued_edits, iterations
+            ))
+            ids = [
+                item.item_id
+                for index in range(iterations)
+                for item in sync.find_by_subject(_subject(index), now, now + timedelta(days=730)) or []
+            ]
+            pending = iter(ids)
+            results.append(await Scenario("delete_event", server).async_measure(
+                lambda: services(SERVICE_DELETE_EVENT, {"event_id": next(pending)}), len(ids)
+            ))
+
+            created: List[str] = []
+
+            async def bulk_create():
+                start    = now + timedelta(days=90)
+                response = await services(SERVICE_BULK_CREATE_EVENTS, {"events": [
+                    {
+                        "subject":    f"Bulk event {index}",
+                        "date_start": (start + timedelta(hours=index)).isoformat(),
+                        "date_end":   (start + timedelta(hours=index, minutes=30)).isoformat(),
+                    }
+                    for index in range(BULK_EVENTS)
+                ]})
+                created.extend(item["id"] for item in response["results"])
+
+            results.append(await Scenario(f"bulk_create_events x{BULK_EVENTS}", server).async_measure(bulk_create, 1))
+            results.append(await Scenario(f"bulk_delete_events x{len(created)}", server).async_measure(
+                lambda: services(SERVICE_BULK_DELETE_EVENTS, {"event_ids": created}), 1
+            ))
+        finally:
+            tracemalloc.stop()
+            if data:
+                await data["queue"].async_stop()
+                await data["connection"].async_stop()
+                data["executor"].shutdown()
+            await hass.async_stop(force=True)
+            server.stop()
+    return results
+
+
+def _subject(index: int) -> str:
+    # Bracketed, so that no subject is a substring of another and edit_event matches exactly one event
+    return f"[Benchmark event {index}]"
+
+
+async def _create(services, index: int, now):
+    start = now + timedelta(days=60, hours=index)
+    return await services(SERVICE_CREATE_EVENT, {
+        "subject":    _subject(index),
+        "date_start": start.isoformat(),
+        "date_end":   (start + timedelta(hours=1)).isoformat(),
+        "location":   "Benchmark",
+        "body":       "Created by the benchmark",
+    })
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    header = f"{'scenario':42} {'calls':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'EWS':>5} {'KB out':>8} {'KB in':>9} {'peak KB':>8}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        latency = result["latency_ms"]
+        print(
+            f"{result['name']:42} {result['calls']:>5} {latency['p50']:>8.1f} {latency['p95']:>8.1f} "
+            f"{latency['p99']:>8.1f} {latency['max']:>8.1f} {sum(result['requests'].values()):>5} "
+            f"{result['bytes_sent'] / 1024:>8.1f} {result['bytes_received'] / 1024:>9.1f} {result['peak_memory'] / 1024:>8.0f}"
+        )
+    print()
+    for result in results:
+        operations = ", ".join(f"{operation} {count}" for operation, count in result["requests"].items())
+        print(f"{result['name']:42} {operations or '-'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Exchange Calendar integration against a fake EWS server.")
+    add_settings_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=20, help="calls per scenario")
+    parser.add_argument("--calendars", type=int, default=0, help="extra delegate mailbox calendars on the entry")
+    parser.add_argument("--expand-recurrences", action="store_true", help="expand recurring series locally instead of with CalendarView")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_run(args))
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"settings": vars(args), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
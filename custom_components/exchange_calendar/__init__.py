@@ -1,22 +1,39 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 import pytz
-from exchangelib import Account, Credentials, Configuration, DELEGATE, CalendarItem
-from exchangelib.errors import EWSError, TransportError
+from exchangelib import CalendarItem
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
-from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.util import dt as dt_util
 from exchangelib.winzone import MS_TIMEZONE_TO_IANA_MAP
 
 import ssl
 import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
-
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .availability import AvailabilityReader, free_slots, interval_list, merge_busy
+from .cache import EventCache
+from .calendars import PRIMARY_CALENDAR, CalendarSource, parse_calendars
+from .client import SNAPSHOT_STORAGE_VERSION, ExchangeCalendarClient, snapshot_key
+from .connection import ExchangeConnection
+from .bulk import async_bulk, bulk_response, indexed_item, item_reference, resolve_occurrences
+from .events import EventFilter, paginate, split_occurrence_id
+from .executor import EwsExecutor
+from .export import STORAGE_VERSION as EXPORT_STORAGE_VERSION, CalendarExporter, export_key, export_path
+from .manager import async_get_manager, connection_key
+from .metrics import EwsMetrics
+from .mutations import DELETE, EDIT, UPSERT, MutationQueue, queue_key
+from .mutations import STORAGE_VERSION as QUEUE_STORAGE_VERSION
+from .streaming import CalendarStreamingListener
+from .throttle import CircuitBreaker, RequestThrottle
+from .sync import STORAGE_VERSION as SYNC_STORAGE_VERSION, CalendarSync, storage_key
 from .const import (
     DOMAIN,
     CONF_EMAIL,
@@ -24,15 +41,56 @@ from .const import (
     CONF_SERVER,
     CONF_TIMEZONE,
     CONF_AUTH_TYPE,
+    CONF_STREAMING,
+    CONF_CALENDARS,
+    CONF_QUEUE_WRITES,
+    CONF_EXPAND_RECURRENCES,
+    CONF_MAX_WORKERS,
+    CONF_CALL_TIMEOUT,
+    CONF_REQUEST_RATE,
+    CONF_REQUEST_BURST,
+    CONF_MAX_RETRIES,
+    CONF_MAX_CONNECTIONS,
+    CONF_KEEPALIVE,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_CALL_TIMEOUT,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_KEEPALIVE,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    SIGNAL_CALENDAR_UPDATED,
+    SNAPSHOT_SAVE_INTERVAL,
     SERVICE_CREATE_EVENT,
     SERVICE_DELETE_EVENT,
     SERVICE_SEARCH_EVENT,
     SERVICE_EDIT_EVENT,
+    SERVICE_BULK_CREATE_EVENTS,
+    SERVICE_BULK_UPDATE_EVENTS,
+    SERVICE_BULK_DELETE_EVENTS,
+    SERVICE_GET_AVAILABILITY,
+    SERVICE_EXPORT_ICS,
+    DEFAULT_BULK_CHUNK_SIZE,
+    BUSY_STATUSES,
+    DEFAULT_BUSY_STATUSES,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.CALENDAR]
+PLATFORMS = [Platform.CALENDAR, Platform.SENSOR]
+SERVICES  = [
+    SERVICE_CREATE_EVENT,
+    SERVICE_DELETE_EVENT,
+    SERVICE_SEARCH_EVENT,
+    SERVICE_EDIT_EVENT,
+    SERVICE_BULK_CREATE_EVENTS,
+    SERVICE_BULK_UPDATE_EVENTS,
+    SERVICE_BULK_DELETE_EVENTS,
+    SERVICE_GET_AVAILABILITY,
+    SERVICE_EXPORT_ICS,
+]
 
 CREATE_EVENT_SCHEMA = vol.Schema(
     {
@@ -48,11 +106,58 @@ SEARCH_EVENTS_SCHEMA = vol.Schema(
     {
         vol.Required("date_start"): cv.datetime,
         vol.Required("date_end"): cv.datetime,
+        vol.Optional("include_body", default=True): cv.boolean,
+        vol.Optional("subject"): cv.string,
+        vol.Optional("location"): cv.string,
+        vol.Optional("categories"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("organizer"): cv.string,
+        vol.Optional("busy_status"): vol.All(cv.ensure_list, [vol.In(BUSY_STATUSES)]),
+        vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Exclusive("offset", "page"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Exclusive("cursor", "page"): cv.string,
+        vol.Optional("compact", default=False): cv.boolean,
+    }
+)
+
+GET_AVAILABILITY_SCHEMA = vol.Schema(
+    {
+        vol.Required("date_start"): cv.datetime,
+        vol.Required("date_end"): cv.datetime,
+        vol.Optional("mailboxes"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("duration"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("busy_statuses", default=DEFAULT_BUSY_STATUSES): vol.All(cv.ensure_list, [vol.In(BUSY_STATUSES)]),
+        vol.Optional("max_slots"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+EXPORT_ICS_SCHEMA = vol.Schema(
+    {
+        vol.Required("date_start"): cv.datetime,
+        vol.Required("date_end"): cv.datetime,
+        vol.Optional("filename", default="exchange_calendar.ics"): cv.string,
+        vol.Optional("include_body", default=False): cv.boolean,
+        vol.Optional("incremental", default=False): cv.boolean,
+    }
+)
+
+# Fields of the single-event write services choosing the write queue for one call
+QUEUE_FIELDS = {
+    vol.Optional("queued"): cv.boolean,
+    vol.Optional("idempotency_key"): cv.string,
+}
+
+CREATE_EVENT_SERVICE_SCHEMA = CREATE_EVENT_SCHEMA.extend(QUEUE_FIELDS)
+
+DELETE_EVENT_SCHEMA = vol.Schema(
+    {
+        vol.Required("event_id"): cv.string,
+        **QUEUE_FIELDS,
     }
 )
 
 EDIT_EVENT_SCHEMA = vol.Schema(
     {
+        **QUEUE_FIELDS,
         vol.Required("subject"): cv.string,
         vol.Optional("new_subject"): cv.string,
         vol.Optional("new_date_start"): cv.datetime,
@@ -64,6 +169,105 @@ EDIT_EVENT_SCHEMA = vol.Schema(
     }
 )
 
+BULK_CREATE_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required("events"): vol.All(cv.ensure_list, [CREATE_EVENT_SCHEMA]),
+    }
+)
+
+BULK_UPDATE_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required("events"): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required("id"): cv.string,
+                        vol.Optional("subject"): cv.string,
+                        vol.Optional("date_start"): cv.datetime,
+                        vol.Optional("date_end"): cv.datetime,
+                        vol.Optional("location"): cv.string,
+                        vol.Optional("body"): cv.string,
+                    }
+                )
+            ],
+        ),
+    }
+)
+
+BULK_DELETE_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required("event_ids"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+async def _async_setup_calendar(
+    hass: HomeAssistant, entry: ConfigEntry, connection: ExchangeConnection, source: CalendarSource, tzinfo, executor: EwsExecutor
+) -> Tuple[EventCache, CalendarSync, ExchangeCalendarClient]:
+    """Build the cache, mirror and client of one calendar, restored from storage."""
+    cache = EventCache(tzinfo)
+    sync  = CalendarSync(
+        hass, connection, source, tzinfo, storage_key(entry.entry_id, source.key), executor,
+        expand=entry.options.get(CONF_EXPAND_RECURRENCES, False),
+    )
+    await sync.async_load()
+    client = ExchangeCalendarClient(
+        hass, connection, source, tzinfo, cache, sync, executor, snapshot_key(entry.entry_id, source.key)
+    )
+    await client.async_load_snapshot()
+    return cache, sync, client
+
+
+def _create_executor(entry: ConfigEntry) -> Tuple[EwsMetrics, EwsExecutor]:
+    """Build the entry's metrics and the executor running its EWS calls within its rate limits."""
+    metrics  = EwsMetrics()
+    throttle = RequestThrottle(
+        entry.options.get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE),
+        entry.options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST),
+        entry.options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+        CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT),
+    )
+    executor = EwsExecutor(
+        entry.entry_id,
+        entry.options.get(CONF_MAX_WORKERS, DEFAULT_MAX_WORKERS),
+        entry.options.get(CONF_CALL_TIMEOUT, DEFAULT_CALL_TIMEOUT),
+        metrics,
+        throttle,
+    )
+    return metrics, executor
+
+
+async def _async_setup_entry_data(
+    hass: HomeAssistant, entry: ConfigEntry, connection: ExchangeConnection, executor: EwsExecutor, metrics: EwsMetrics, tzinfo
+) -> Dict[str, Any]:
+    """Build the calendars, write queue and readers of an entry and store them in hass.data for the services."""
+    calendars = {
+        source.key: await _async_setup_calendar(hass, entry, connection, source, tzinfo, executor)
+        for source in parse_calendars(connection, entry.options.get(CONF_CALENDARS, []))
+    }
+    cache, sync, client = calendars[PRIMARY_CALENDAR]
+
+    # Queued writes left over from the previous run are written once connected
+    queue = MutationQueue(hass, entry.entry_id, connection, executor, client, sync, tzinfo, queue_key(entry.entry_id))
+    await queue.async_load()
+
+    data = hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        "connection": connection,
+        "executor": executor,
+        "metrics": metrics,
+        "timezone": tzinfo,
+        "cache": cache,
+        "sync": sync,
+        "client": client,
+        "clients": {key: calendar[2] for key, calendar in calendars.items()},
+        "queue": queue,
+        "exporter": CalendarExporter(hass, client, tzinfo, export_key(entry.entry_id)),
+        "availability": AvailabilityReader(connection, executor, tzinfo),
+        "queue_writes": entry.options.get(CONF_QUEUE_WRITES, False),
+    }
+    return data
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Exchange Calendar from a config entry."""
@@ -76,37 +280,84 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if "Customized Time Zone" not in MS_TIMEZONE_TO_IANA_MAP:
         MS_TIMEZONE_TO_IANA_MAP["Customized Time Zone"] = timezone
 
-    try:
-        credentials = Credentials(username=email, password=password)
-        config = Configuration(
-            server=server,
-            credentials=credentials,
-            auth_type=auth_type,
-        )
-        account = await hass.async_add_executor_job(
-            lambda: Account(
-                primary_smtp_address=email,
-                config=config,
-                autodiscover=False,
-                access_type=DELEGATE,
+    metrics, executor = _create_executor(entry)
+    queue: Optional[MutationQueue] = None
+
+    async def shutdown() -> None:
+        # Coroutine callbacks only run as tasks once the plain ones are done, so the queue is stopped here,
+        # letting a write in progress finish before the executor goes away
+        if queue is not None:
+            await queue.async_stop()
+        executor.shutdown()
+
+    entry.async_on_unload(shutdown)
+
+    # Building the Account talks to the server, so it happens in the background and
+    # the calendar starts out on the snapshot saved by the previous run. Entries with
+    # the same server and credentials share the account and its HTTP sessions.
+    manager    = async_get_manager(hass)
+    key        = connection_key(server, email, password, auth_type)
+    connection = await manager.async_acquire(
+        entry.entry_id,
+        key,
+        entry.options.get(CONF_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS),
+        entry.options.get(CONF_KEEPALIVE, DEFAULT_KEEPALIVE),
+        entry.options.get(CONF_CALL_TIMEOUT, DEFAULT_CALL_TIMEOUT),
+    )
+
+    async def release_connection() -> None:
+        await manager.async_release(entry.entry_id, key)
+
+    entry.async_on_unload(release_connection)
+
+    data    = await _async_setup_entry_data(hass, entry, connection, executor, metrics, dt_util.get_time_zone(timezone))
+    queue   = data["queue"]
+    clients = data["clients"]
+
+    async_register_services(hass, entry)
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    async def save_snapshots(*_) -> None:
+        await asyncio.gather(*(client.async_save_snapshot() for client in clients.values()))
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, save_snapshots, timedelta(seconds=SNAPSHOT_SAVE_INTERVAL))
+    )
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, save_snapshots))
+    entry.async_on_unload(save_snapshots)
+
+    async def refresh(calendars, force: bool = False) -> None:
+        # The calendars share the entry's executor, so their syncs run side by side within its worker and rate limits
+        await asyncio.gather(*(calendar.async_refresh(force=force) for calendar in calendars))
+        async_dispatcher_send(hass, SIGNAL_CALENDAR_UPDATED.format(entry.entry_id))
+
+    async def on_connected() -> None:
+        await connection.async_get_account()
+        await refresh(clients.values())
+        queue.schedule(0)
+
+    entry.async_create_background_task(hass, on_connected(), f"exchange_calendar initial refresh {email}")
+
+    if entry.options.get(CONF_STREAMING, False):
+        # One subscription covers every calendar of the account's own mailbox; other mailboxes keep polling
+        streamed = [calendar for calendar in clients.values() if calendar.source.in_primary_mailbox]
+
+        async def on_change(folder_ids) -> None:
+            await refresh(
+                [
+                    calendar for calendar in streamed
+                    if folder_ids is None or calendar.source.folder_id is None or calendar.source.folder_id in folder_ids
+                ],
+                force=True,
             )
-        )
-
-        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
-            "account": account,
-            "timezone": dt_util.get_time_zone(timezone),
-        }
-
-        async_register_services(hass, entry)
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-        return True
 
-    except TransportError as err:
-        _LOGGER.error("Failed to connect to Exchange server %s: %s", server, err)
-        raise ConfigEntryNotReady from err
-    except EWSError as err:
-        _LOGGER.error("Failed to set up Exchange Calendar: %s", err)
-        raise ConfigEntryNotReady from err
+        streaming = CalendarStreamingListener(hass, connection, [calendar.source for calendar in streamed], on_change, metrics)
+        for calendar in streamed:
+            calendar.streaming = streaming
+        streaming.start()
+        entry.async_on_unload(streaming.async_stop)
+    return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -114,34 +365,83 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            for service in SERVICES:
+                hass.services.async_remove(DOMAIN, service)
     return unload_ok
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted calendar mirrors and snapshots when the entry is deleted."""
+    # Sources are only parsed for their keys here, so no connection is needed
+    for source in parse_calendars(None, entry.options.get(CONF_CALENDARS, [])):
+        await Store(hass, SYNC_STORAGE_VERSION, storage_key(entry.entry_id, source.key)).async_remove()
+        await Store(hass, SNAPSHOT_STORAGE_VERSION, snapshot_key(entry.entry_id, source.key)).async_remove()
+    await Store(hass, QUEUE_STORAGE_VERSION, queue_key(entry.entry_id)).async_remove()
+    await Store(hass, EXPORT_STORAGE_VERSION, export_key(entry.entry_id)).async_remove()
+
+
+def _entry_objects(hass: HomeAssistant, entry_id: str, *names: str) -> Tuple[Any, ...]:
+    """Return the named objects of the entry serving the services, or of another loaded entry once it is gone."""
+    entries = hass.data[DOMAIN]
+    data    = entries.get(entry_id) or next(iter(entries.values()))
+    return tuple(data[name] for name in names)
+
+
 def async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Register Exchange Calendar services."""
-    account  = hass.data[DOMAIN][entry.entry_id]["account"]
-    timezone = hass.data[DOMAIN][entry.entry_id]["timezone"]
+    """Register Exchange Calendar services.
+
+    The services are registered once, by the first entry set up, and removed
+    when the last entry unloads. Handlers look up the entry's objects on every
+    call, since each reload replaces them.
+    """
 
     async def create_event(call: ServiceCall) -> ServiceResponse:
         """Create a calendar event, or update it if an event with the same subject already exists."""
         try:
-            validated_data = CREATE_EVENT_SCHEMA(dict(call.data))
+            timezone, queue_writes, queue, connection, client, sync, executor = _entry_objects(
+                hass, entry.entry_id, "timezone", "queue_writes", "queue", "connection", "client", "sync", "executor"
+            )
+            validated_data = CREATE_EVENT_SERVICE_SCHEMA(dict(call.data))
             subject  = validated_data["subject"]
             start_dt = validated_data["date_start"].astimezone(timezone)
             end_dt   = validated_data["date_end"].astimezone(timezone)
             location = validated_data.get("location")
             body     = validated_data.get("body")
 
-            def upsert_event():
-                # Search from now to +2 years (future events only, stays within Exchange limit)
-                now          = datetime.now(tz=timezone)
-                search_start = now
-                search_end   = now + timedelta(days=730)
+            if validated_data.get("queued", queue_writes):
+                return await queue.async_enqueue(
+                    UPSERT,
+                    subject=subject,
+                    fields={"start": start_dt, "end": end_dt, "location": location, "body": body},
+                    idempotency_key=validated_data.get("idempotency_key"),
+                )
+
+            account = await connection.async_get_account(DEFAULT_CALL_TIMEOUT)
 
-                existing = [
-                    e for e in account.calendar.view(start=search_start, end=search_end)
-                    if e.subject and e.subject.lower() == subject.lower()
-                ]
+            # Search from now to +2 years (future events only, stays within Exchange limit)
+            now          = datetime.now(tz=timezone)
+            search_start = now
+            search_end   = now + timedelta(days=730)
+
+            # The subject index answers without a CalendarView unless a recurring series matches;
+            # a forced sync first picks up changes made elsewhere since the last poll
+            await client.async_refresh(force=True)
+            indexed = sync.find_by_subject(subject, search_start, search_end)
+
+            def upsert_event():
+                if indexed is not None:
+                    existing = [indexed_item(account, item) for item in indexed]
+                else:
+                    existing = [
+                        e for e in account.calendar.view(start=search_start, end=search_end).only("subject")
+                        if e.subject and e.subject.lower() == subject.lower()
+                    ]
 
                 if existing:
                     event          = existing[0]
@@ -166,7 +466,8 @@ def async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
                     _LOGGER.info("Created new event: %s", subject)
                     return True, None, "created"
 
-            success, error, action = await hass.async_add_executor_job(upsert_event)
+            success, error, action = await executor.async_run(upsert_event, operation="create_event")
+            await client.async_mutated()
 
             if not success:
                 _LOGGER.error("Failed to upsert event: %s", error)
@@ -185,12 +486,21 @@ def async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Delete a calendar event by ID."""
         event_id = call.data.get("event_id")
         try:
-            event = await hass.async_add_executor_job(
-                lambda: account.calendar.get(id=event_id)
+            queue_writes, queue, connection, executor, client = _entry_objects(
+                hass, entry.entry_id, "queue_writes", "queue", "connection", "executor", "client"
+            )
+            if call.data.get("queued", queue_writes):
+                return await queue.async_enqueue(
+                    DELETE, item_id=event_id, idempotency_key=call.data.get("idempotency_key")
+                )
+            account = await connection.async_get_account(DEFAULT_CALL_TIMEOUT)
+            # A single DeleteItem call; a missing ID comes back as ErrorItemNotFound
+            result, = await executor.async_run(
+                lambda: account.bulk_delete(ids=[item_reference(event_id)]), operation="delete_event"
             )
-            if not event:
-                raise ValueError(f"No event found with ID: {event_id}")
-            await hass.async_add_executor_job(event.delete)
+            if isinstance(result, Exception):
+                raise result
+            await client.async_mutated()
             _LOGGER.info("Deleted event: %s", event_id)
             return {"success": True}
         except Exception as err:
@@ -200,29 +510,63 @@ def async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
     async def search_event(call: ServiceCall) -> ServiceResponse:
         """Search for calendar events in a date range."""
         try:
+            timezone, client = _entry_objects(hass, entry.entry_id, "timezone", "client")
             validated_data = SEARCH_EVENTS_SCHEMA(dict(call.data))
             start_dt = validated_data["date_start"].astimezone(timezone)
             end_dt   = validated_data["date_end"].astimezone(timezone)
 
-            def get_events():
-                return list(account.calendar.view(start=start_dt, end=end_dt))
-
-            events     = await hass.async_add_executor_job(get_events)
-            event_list = [
-                {
-                    "subject":  e.subject,
-                    "start":    e.start.isoformat(),
-                    "end":      e.end.isoformat(),
-                    "location": e.location,
-                    "body":     e.body,
-                    "id":       e.id,
+            # CalendarView takes no restrictions, so the filters run over the projected fields locally
+            events = await client.async_get_events(start_dt, end_dt)
+            event_filter = EventFilter(
+                subject=validated_data.get("subject"),
+                location=validated_data.get("location"),
+                categories=validated_data.get("categories"),
+                organizer=validated_data.get("organizer"),
+                busy_status=validated_data.get("busy_status"),
+            )
+            if event_filter:
+                events = [e for e in events if event_filter.matches(e)]
+            total = len(events)
+            events, next_cursor = paginate(
+                events,
+                validated_data.get("limit"),
+                validated_data.get("offset", 0),
+                validated_data.get("cursor"),
+            )
+
+            compact = validated_data["compact"]
+            # Bodies come from one batched GetItem for the returned page, and only when the caller wants them
+            bodies  = await client.async_load_bodies(events) if validated_data["include_body"] and not compact else None
+            event_list = []
+            for e in events:
+                event = {
+                    "subject": e.subject,
+                    "start":   e.local_start(timezone).isoformat(),
+                    "end":     e.local_end(timezone).isoformat(),
+                    "id":      e.item_id,
                 }
-                for e in events
-            ]
+                if not compact:
+                    event.update({
+                        "location":    e.location,
+                        "categories":  list(e.categories or ()),
+                        "organizer":   e.organizer,
+                        "busy_status": e.busy_status,
+                    })
+                elif e.location:
+                    event["location"] = e.location
+                if bodies is not None:
+                    event["body"] = bodies.get(e.item_id)
+                event_list.append(event)
             _LOGGER.info("Found %d events", len(event_list))
-            return {"success": True, "events": event_list, "count": len(event_list)}
-
-        except vol.Invalid as err:
+            return {
+                "success":     True,
+                "events":      event_list,
+                "count":       len(event_list),
+                "total":       total,
+                "next_cursor": next_cursor,
+            }
+
+        except (vol.Invalid, ValueError) as err:
             _LOGGER.error("Invalid input for search_event: %s", err)
             return {"success": False, "error": str(err)}
         except Exception as err:
@@ -232,6 +576,9 @@ def async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
     async def edit_event(call: ServiceCall) -> ServiceResponse:
         """Find a calendar event by subject and edit only the fields provided."""
         try:
+            timezone, queue_writes, queue, connection, client, sync, executor = _entry_objects(
+                hass, entry.entry_id, "timezone", "queue_writes", "queue", "connection", "client", "sync", "executor"
+            )
             validated_data = EDIT_EVENT_SCHEMA(dict(call.data))
             search_subject = validated_data["subject"]
 
@@ -249,9 +596,40 @@ def async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
             else:
                 search_end = search_end.astimezone(timezone)
 
+            if validated_data.get("queued", queue_writes):
+                changes = {}
+                for key, field in (
+                    ("new_subject", "subject"),
+                    ("new_date_start", "start"),
+                    ("new_date_end", "end"),
+                    ("new_location", "location"),
+                    ("new_body", "body"),
+                ):
+                    if key in validated_data:
+                        value = validated_data[key]
+                        changes[field] = value.astimezone(timezone) if isinstance(value, datetime) else value
+                if not changes:
+                    return {"success": False, "error": "No new values provided — nothing to update."}
+                # Without an explicit range the default one is taken when the edit is written
+                explicit = "search_start" in validated_data or "search_end" in validated_data
+                return await queue.async_enqueue(
+                    EDIT,
+                    subject=search_subject,
+                    fields=changes,
+                    window=[search_start, search_end] if explicit else None,
+                    idempotency_key=validated_data.get("idempotency_key"),
+                )
+
+            account = await connection.async_get_account(DEFAULT_CALL_TIMEOUT)
+            await client.async_refresh(force=True)
+            indexed = sync.find_by_subject(search_subject, search_start, search_end, exact=False)
+
             def find_and_edit():
-                events  = list(account.calendar.view(start=search_start, end=search_end))
-                matches = [e for e in events if e.subject and search_subject.lower() in e.subject.lower()]
+                if indexed is not None:
+                    matches = [indexed_item(account, item) for item in indexed]
+                else:
+                    events  = list(account.calendar.view(start=search_start, end=search_end).only("subject"))
+                    matches = [e for e in events if e.subject and search_subject.lower() in e.subject.lower()]
 
                 if not matches:
                     return False, f"No event found matching subject: '{search_subject}'", None
@@ -284,12 +662,12 @@ def async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
                 event.save(update_fields=changed_fields)
                 return True, None, original_subject
 
-            success, error, original_subject = await hass.async_add_executor_job(find_and_edit)
-
+            success, error, original_subject = await executor.async_run(find_and_edit, operation="edit_event")
             if not success:
                 _LOGGER.error("edit_event failed: %s", error)
                 return {"success": False, "error": error}
 
+            await client.async_mutated()
             _LOGGER.info("Edited event: %s", original_subject)
             return {"success": True, "edited_subject": original_subject}
 
@@ -300,11 +678,220 @@ def async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
             _LOGGER.error("Failed to edit event: %s", err)
             return {"success": False, "error": str(err)}
 
+    async def bulk_create_events(call: ServiceCall) -> ServiceResponse:
+        """Create many calendar events through chunked CreateItem requests."""
+        try:
+            connection, timezone, executor, client = _entry_objects(
+                hass, entry.entry_id, "connection", "timezone", "executor", "client"
+            )
+            validated_data = BULK_CREATE_EVENTS_SCHEMA(dict(call.data))
+            account = await connection.async_get_account(DEFAULT_CALL_TIMEOUT)
+            items = [
+                CalendarItem(
+                    account=account,
+                    folder=account.calendar,
+                    subject=event["subject"],
+                    start=event["date_start"].astimezone(timezone),
+                    end=event["date_end"].astimezone(timezone),
+                    location=event.get("location"),
+                    body=event.get("body"),
+                )
+                for event in validated_data["events"]
+            ]
+
+            results = await async_bulk(
+                executor,
+                lambda chunk: account.bulk_create(folder=account.calendar, items=chunk, chunk_size=DEFAULT_BULK_CHUNK_SIZE),
+                items,
+                "bulk_create",
+            )
+            await client.async_mutated()
+
+            ids = [None if isinstance(result, Exception) else result.id for result in results]
+            response = bulk_response(ids, results)
+            _LOGGER.info("Bulk created %d of %d events", response["succeeded"], len(items))
+            return response
+
+        except vol.Invalid as err:
+            _LOGGER.error("Invalid input for bulk_create_events: %s", err)
+            return {"success": False, "error": str(err)}
+        except Exception as err:
+            _LOGGER.error("Failed to bulk create events: %s", err)
+            return {"success": False, "error": str(err)}
+
+    async def bulk_update_events(call: ServiceCall) -> ServiceResponse:
+        """Update many calendar events by ID through chunked UpdateItem requests."""
+        try:
+            connection, timezone, executor, client = _entry_objects(
+                hass, entry.entry_id, "connection", "timezone", "executor", "client"
+            )
+            validated_data = BULK_UPDATE_EVENTS_SCHEMA(dict(call.data))
+            account = await connection.async_get_account(DEFAULT_CALL_TIMEOUT)
+            events  = validated_data["events"]
+            # Occurrences expanded locally are updated under the ids Exchange gave them
+            occurrences = {}
+            if any(split_occurrence_id(event["id"])[1] is not None for event in events):
+                occurrences = await executor.async_run(
+                    resolve_occurrences, account, [event["id"] for event in events],
+                    operation="resolve_occurrences", idempotent=True,
+                )
+            updates, failed = [], {}
+            for index, event in enumerate(events):
+                item_id = occurrences.get(event["id"], event["id"])
+                if isinstance(item_id, Exception):
+                    failed[index] = item_id
+                    continue
+                item   = CalendarItem(account=account, folder=account.calendar, id=item_id, changekey=None)
+                fields = []
+                if "subject" in event:
+                    item.subject = event["subject"]
+                    fields.append("subject")
+                if "date_start" in event:
+                    item.start = event["date_start"].astimezone(timezone)
+                    fields.append("start")
+                if "date_end" in event:
+                    item.end = event["date_end"].astimezone(timezone)
+                    fields.append("end")
+                if "location" in event:
+                    item.location = event["location"]
+                    fields.append("location")
+                if "body" in event:
+                    item.body = event["body"]
+                    fields.append("body")
+                if not fields:
+                    raise vol.Invalid(f"No new values provided for event {event['id']}")
+                updates.append((item, fields))
+
+            results = await async_bulk(
+                executor,
+                lambda chunk: account.bulk_update(items=chunk, chunk_size=DEFAULT_BULK_CHUNK_SIZE),
+                updates,
+                "bulk_update",
+            )
+            await client.async_mutated()
+
+            written  = iter(results)
+            results  = [failed[index] if index in failed else next(written) for index in range(len(events))]
+            response = bulk_response([event["id"] for event in events], results)
+            _LOGGER.info("Bulk updated %d of %d events", response["succeeded"], len(events))
+            return response
+
+        except vol.Invalid as err:
+            _LOGGER.error("Invalid input for bulk_update_events: %s", err)
+            return {"success": False, "error": str(err)}
+        except Exception as err:
+            _LOGGER.error("Failed to bulk update events: %s", err)
+            return {"success": False, "error": str(err)}
+
+    async def bulk_delete_events(call: ServiceCall) -> ServiceResponse:
+        """Delete many calendar events by ID through chunked DeleteItem requests."""
+        try:
+            connection, executor, client = _entry_objects(hass, entry.entry_id, "connection", "executor", "client")
+            validated_data = BULK_DELETE_EVENTS_SCHEMA(dict(call.data))
+            account = await connection.async_get_account(DEFAULT_CALL_TIMEOUT)
+            event_ids = validated_data["event_ids"]
+
+            results = await async_bulk(
+                executor,
+                lambda chunk: account.bulk_delete(ids=chunk, chunk_size=DEFAULT_BULK_CHUNK_SIZE),
+                [item_reference(event_id) for event_id in event_ids],
+                "bulk_delete",
+            )
+            await client.async_mutated()
+
+            response = bulk_response(event_ids, results)
+            _LOGGER.info("Bulk deleted %d of %d events", response["succeeded"], len(event_ids))
+            return response
+
+        except vol.Invalid as err:
+            _LOGGER.error("Invalid input for bulk_delete_events: %s", err)
+            return {"success": False, "error": str(err)}
+        except Exception as err:
+            _LOGGER.error("Failed to bulk delete events: %s", err)
+            return {"success": False, "error": str(err)}
+
+    async def get_availability(call: ServiceCall) -> ServiceResponse:
+        """Return the merged busy times of one or more mailboxes and the free slots between them."""
+        try:
+            timezone, connection, availability = _entry_objects(
+                hass, entry.entry_id, "timezone", "connection", "availability"
+            )
+            validated_data = GET_AVAILABILITY_SCHEMA(dict(call.data))
+            start_dt = validated_data["date_start"].astimezone(timezone)
+            end_dt   = validated_data["date_end"].astimezone(timezone)
+            if end_dt <= start_dt:
+                raise ValueError("date_end must be after date_start")
+            mailboxes = validated_data.get("mailboxes")
+            if not mailboxes:
+                mailboxes = [(await connection.async_get_account(DEFAULT_CALL_TIMEOUT)).primary_smtp_address]
+
+            busy = await availability.async_busy(mailboxes, start_dt, end_dt, validated_data["busy_statuses"])
+            # A mailbox whose availability is unknown cannot be counted as free, so its slots are not trusted
+            failed = [mailbox for mailbox, intervals in busy.items() if isinstance(intervals, Exception)]
+            merged = merge_busy(intervals for intervals in busy.values() if not isinstance(intervals, Exception))
+            slots  = free_slots(merged, start_dt, end_dt, timedelta(minutes=validated_data.get("duration", 1)))
+            if "max_slots" in validated_data:
+                slots = slots[:validated_data["max_slots"]]
+
+            _LOGGER.info("Found %d free slots across %d mailboxes", len(slots), len(mailboxes))
+            return {
+                "success":   not failed,
+                "available": bool(slots) and not failed,
+                "busy":      interval_list(merged),
+                "free":      interval_list(slots),
+                "mailboxes": [
+                    {"mailbox": mailbox, "success": False, "error": str(intervals)}
+                    if isinstance(intervals, Exception)
+                    else {"mailbox": mailbox, "success": True, "busy": interval_list(intervals)}
+                    for mailbox, intervals in busy.items()
+                ],
+            }
+
+        except (vol.Invalid, ValueError) as err:
+            _LOGGER.error("Invalid input for get_availability: %s", err)
+            return {"success": False, "error": str(err)}
+        except Exception as err:
+            _LOGGER.error("Failed to get availability: %s", err)
+            return {"success": False, "error": str(err)}
+
+    async def export_ics(call: ServiceCall) -> ServiceResponse:
+        """Write the events of a date range to an iCalendar file in the configuration directory."""
+        try:
+            timezone, exporter = _entry_objects(hass, entry.entry_id, "timezone", "exporter")
+            validated_data = EXPORT_ICS_SCHEMA(dict(call.data))
+            start_dt = validated_data["date_start"].astimezone(timezone)
+            end_dt   = validated_data["date_end"].astimezone(timezone)
+            if end_dt <= start_dt:
+                raise ValueError("date_end must be after date_start")
+            path = export_path(hass, validated_data["filename"])
+
+            result = await exporter.async_export(
+                path, start_dt, end_dt, validated_data["include_body"], validated_data["incremental"]
+            )
+            return {"success": True, **result}
+
+        except (vol.Invalid, ValueError) as err:
+            _LOGGER.error("Invalid input for export_ics: %s", err)
+            return {"success": False, "error": str(err)}
+        except Exception as err:
+            _LOGGER.error("Failed to export events: %s", err)
+            return {"success": False, "error": str(err)}
+
     if not hass.services.has_service(DOMAIN, SERVICE_CREATE_EVENT):
-        hass.services.async_register(DOMAIN, SERVICE_CREATE_EVENT, create_event, schema=CREATE_EVENT_SCHEMA, supports_response=SupportsResponse.ONLY)
+        hass.services.async_register(DOMAIN, SERVICE_CREATE_EVENT, create_event, schema=CREATE_EVENT_SERVICE_SCHEMA, supports_response=SupportsResponse.ONLY)
     if not hass.services.has_service(DOMAIN, SERVICE_DELETE_EVENT):
-        hass.services.async_register(DOMAIN, SERVICE_DELETE_EVENT, delete_event)
+        hass.services.async_register(DOMAIN, SERVICE_DELETE_EVENT, delete_event, schema=DELETE_EVENT_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
     if not hass.services.has_service(DOMAIN, SERVICE_SEARCH_EVENT):
         hass.services.async_register(DOMAIN, SERVICE_SEARCH_EVENT, search_event, schema=SEARCH_EVENTS_SCHEMA, supports_response=SupportsResponse.ONLY)
     if not hass.services.has_service(DOMAIN, SERVICE_EDIT_EVENT):
         hass.services.async_register(DOMAIN, SERVICE_EDIT_EVENT, edit_event, schema=EDIT_EVENT_SCHEMA, supports_response=SupportsResponse.ONLY)
+    if not hass.services.has_service(DOMAIN, SERVICE_BULK_CREATE_EVENTS):
+        hass.services.async_register(DOMAIN, SERVICE_BULK_CREATE_EVENTS, bulk_create_events, schema=BULK_CREATE_EVENTS_SCHEMA, supports_response=SupportsResponse.ONLY)
+    if not hass.services.has_service(DOMAIN, SERVICE_BULK_UPDATE_EVENTS):
+        hass.services.async_register(DOMAIN, SERVICE_BULK_UPDATE_EVENTS, bulk_update_events, schema=BULK_UPDATE_EVENTS_SCHEMA, supports_response=SupportsResponse.ONLY)
+    if not hass.services.has_service(DOMAIN, SERVICE_BULK_DELETE_EVENTS):
+        hass.services.async_register(DOMAIN, SERVICE_BULK_DELETE_EVENTS, bulk_delete_events, schema=BULK_DELETE_EVENTS_SCHEMA, supports_response=SupportsResponse.ONLY)
+    if not hass.services.has_service(DOMAIN, SERVICE_GET_AVAILABILITY):
+        hass.services.async_register(DOMAIN, SERVICE_GET_AVAILABILITY, get_availability, schema=GET_AVAILABILITY_SCHEMA, supports_response=SupportsResponse.ONLY)
+    if not hass.services.has_service(DOMAIN, SERVICE_EXPORT_ICS):
+        hass.services.async_register(DOMAIN, SERVICE_EXPORT_ICS, export_ics, schema=EXPORT_ICS_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
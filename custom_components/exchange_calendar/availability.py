@@ -0,0 +1,145 @@
+"""Busy intervals and free slots from Exchange free/busy data."""
+import asyncio
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from exchangelib import EWSDateTime, EWSTimeZone
+from exchangelib.properties import FreeBusyViewOptions, MailboxData, TimeWindow, TimeZone
+from exchangelib.services import GetUserAvailability
+
+from .connection import ExchangeConnection
+from .const import AVAILABILITY_MAX_DAYS, DEFAULT_CALL_TIMEOUT
+from .executor import EwsExecutor
+
+Interval = Tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Merge intervals sorted by start into disjoint ones, joining those that overlap or touch."""
+    merged: List[Interval] = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = merged[-1][0], end
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def merge_busy(busy: Iterable[List[Interval]]) -> List[Interval]:
+    """Merge the sorted busy lists of several mailboxes into one, in a single sweep."""
+    return merge_intervals(heapq.merge(*busy))
+
+
+def free_slots(busy: List[Interval], start: datetime, end: datetime, duration: timedelta) -> List[Interval]:
+    """Return the gaps of at least duration between merged busy intervals, within start and end."""
+    slots  = []
+    cursor = start
+    for busy_start, busy_end in busy:
+        if busy_start - cursor >= duration:
+            slots.append((cursor, busy_start))
+        cursor = max(cursor, busy_end)
+    if end - cursor >= duration:
+        slots.append((cursor, end))
+    return slots
+
+
+def split_window(start: datetime, end: datetime, max_days: int) -> List[Interval]:
+    windows = []
+    while start < end:
+        windows.append((start, min(end, start + timedelta(days=max_days))))
+        start = windows[-1][1]
+    return windows
+
+
+class AvailabilityReader:
+    """Reads the busy times of mailboxes with GetUserAvailability.
+
+    Availability data carries only the start, end and status of each event,
+    so it is much lighter than a CalendarView and works for any mailbox the
+    account may see the free/busy times of, without delegate access. The
+    time zone definition the request needs is looked up once per year rather
+    than with every call, and windows longer than Exchange accepts are split.
+    """
+
+    def __init__(self, connection: ExchangeConnection, executor: EwsExecutor, timezone):
+        self._connection = connection
+        self._executor   = executor
+        self._timezone   = timezone
+        self._ews_tz     = EWSTimeZone.from_timezone(timezone)
+        # Year -> TimeZone element built from the server's definition of the entry's time zone
+        self._timezones: Dict[int, TimeZone] = {}
+
+    async def async_busy(
+        self, mailboxes: List[str], start: datetime, end: datetime, statuses: Iterable[str]
+    ) -> Dict[str, Union[List[Interval], Exception]]:
+        """Return the merged busy intervals of each mailbox, or the error Exchange answered for it."""
+        account  = await self._connection.async_get_account(DEFAULT_CALL_TIMEOUT)
+        statuses = set(statuses)
+        windows  = split_window(start, end, AVAILABILITY_MAX_DAYS)
+        results  = await asyncio.gather(*(
+            self._executor.async_run(
+                self._get_busy, account.protocol, mailboxes, window_start, window_end, statuses,
+                operation="get_user_availability", idempotent=True,
+            )
+            for window_start, window_end in windows
+        ))
+        busy: Dict[str, Union[List[Interval], Exception]] = {}
+        for index, mailbox in enumerate(mailboxes):
+            per_window = [result[index] for result in results]
+            error = next((value for value in per_window if isinstance(value, Exception)), None)
+            # Windows follow each other, so their sorted lists only need joining where they meet
+            busy[mailbox] = error if error is not None else merge_intervals(
+                interval for intervals in per_window for interval in intervals
+            )
+        return busy
+
+    def _server_timezone(self, protocol, year: int) -> TimeZone:
+        timezone = self._timezones.get(year)
+        if timezone is None:
+            definition, = protocol.get_timezones(timezones=[self._ews_tz], return_full_timezone_data=True)
+            timezone = self._timezones[year] = TimeZone.from_server_timezone(tz_definition=definition, for_year=year)
+        return timezone
+
+    def _get_busy(
+        self, protocol, mailboxes: List[str], start: datetime, end: datetime, statuses
+    ) -> List[Union[List[Interval], Exception]]:
+        """Synchronously read one window of availability, returning one entry per mailbox."""
+        window_start = EWSDateTime.from_datetime(start).astimezone(self._ews_tz)
+        window_end   = EWSDateTime.from_datetime(end).astimezone(self._ews_tz)
+        views = GetUserAvailability(protocol).call(
+            tzinfo=self._ews_tz,
+            mailbox_data=[
+                MailboxData(email=mailbox, attendee_type="Required", exclude_conflicts=False) for mailbox in mailboxes
+            ],
+            timezone=self._server_timezone(protocol, window_start.year),
+            # Statuses and times only: no subjects or locations, and no merged slot string
+            free_busy_view_options=FreeBusyViewOptions(
+                time_window=TimeWindow(start=window_start, end=window_end),
+                merged_free_busy_interval=30,
+                requested_view="FreeBusy",
+            ),
+        )
+        results: List[Union[List[Interval], Exception]] = []
+        for view in views:
+            if isinstance(view, Exception):
+                results.append(view)
+                continue
+            intervals = sorted(
+                (
+                    max(self._to_local(event.start), start),
+                    min(self._to_local(event.end), end),
+                )
+                for event in view.calendar_events or ()
+                if event.busy_type in statuses
+            )
+            results.append(merge_intervals(interval for interval in intervals if interval[0] < interval[1]))
+        return results
+
+    def _to_local(self, value) -> datetime:
+        return datetime.fromtimestamp(value.timestamp(), self._timezone)
+
+
+def interval_list(intervals: Optional[List[Interval]]) -> List[Dict[str, str]]:
+    return [{"start": start.isoformat(), "end": end.isoformat()} for start, end in intervals or ()]
@@ -0,0 +1,97 @@
+"""Batched calendar writes, shared by the services and the write queue."""
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from exchangelib import CalendarItem
+from exchangelib.properties import OccurrenceItemId
+
+from .const import DEFAULT_BULK_CHUNK_SIZE
+from .events import split_occurrence_id
+from .executor import EwsExecutor
+from .throttle import REJECTED_ERRORS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def indexed_item(account, item) -> CalendarItem:
+    """Build an updatable CalendarItem from a mirrored item without fetching it."""
+    return CalendarItem(
+        account=account,
+        folder=account.calendar,
+        id=item.item_id,
+        changekey=item.changekey,
+        subject=item.subject,
+    )
+
+
+def item_reference(item_id: str, changekey: Optional[str] = None):
+    """Return what exchangelib takes as the id of an item, addressing occurrences expanded locally by their index."""
+    master_id, index = split_occurrence_id(item_id)
+    if index is None:
+        return item_id, changekey
+    return OccurrenceItemId(id=master_id, instance_index=index)
+
+
+def resolve_occurrences(account, item_ids: Iterable[str]) -> Dict[str, Any]:
+    """Synchronously return occurrence id -> the id Exchange gave the occurrence, or the exception it returned.
+
+    Only the ids of occurrences expanded locally are looked up, all in one
+    GetItem, as UpdateItem takes no OccurrenceItemId.
+    """
+    occurrences = [item_id for item_id in dict.fromkeys(item_ids) if split_occurrence_id(item_id)[1] is not None]
+    if not occurrences:
+        return {}
+    items = account.fetch(ids=[item_reference(item_id) for item_id in occurrences], only_fields=[])
+    return {
+        item_id: item if isinstance(item, Exception) else item.id
+        for item_id, item in zip(occurrences, items)
+    }
+
+
+async def async_bulk(executor: EwsExecutor, func: Callable[[List[Any]], List[Any]], items: List[Any], operation: str) -> List[Any]:
+    """Run func over items in chunks of DEFAULT_BULK_CHUNK_SIZE and return one result or exception per item.
+
+    Each chunk is its own executor call, so the request budget paces the run
+    and a chunk Exchange rejects as busy is retried on its own. Items rejected
+    one by one for the same reason go out again in a later request, and a
+    chunk that still fails only fails its own items.
+    """
+    results: List[Any] = [None] * len(items)
+    pending  = list(range(len(items)))
+    throttle = executor.throttle
+    attempt  = 0
+    while pending:
+        rejected = []
+        for offset in range(0, len(pending), DEFAULT_BULK_CHUNK_SIZE):
+            chunk = pending[offset:offset + DEFAULT_BULK_CHUNK_SIZE]
+            try:
+                chunk_results = await executor.async_run(func, [items[index] for index in chunk], operation=operation)
+            except Exception as err:
+                chunk_results = [err] * len(chunk)
+            for index, result in zip(chunk, chunk_results):
+                results[index] = result
+                if isinstance(result, REJECTED_ERRORS):
+                    rejected.append(index)
+                    if throttle is not None:
+                        throttle.back_off(getattr(result, "back_off", None))
+        if not rejected or throttle is None or attempt >= throttle.max_retries:
+            break
+        _LOGGER.debug("Exchange rejected %d items as busy, sending them again", len(rejected))
+        await asyncio.sleep(throttle.retry_delay(attempt))
+        throttle.retries += 1
+        attempt += 1
+        pending = rejected
+    return results
+
+
+def bulk_response(ids, results) -> Dict[str, Any]:
+    """Build a per-item service response from exchangelib bulk results (values or exceptions)."""
+    items = []
+    for index, (item_id, result) in enumerate(zip(ids, results)):
+        if isinstance(result, Exception):
+            items.append({"index": index, "id": item_id, "success": False, "error": str(result)})
+        else:
+            items.append({"index": index, "id": item_id, "success": True})
+    failed = sum(1 for item in items if not item["success"])
+    return {"success": failed == 0, "results": items, "succeeded": len(items) - failed, "failed": failed}
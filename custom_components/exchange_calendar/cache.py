@@ -0,0 +1,178 @@
+"""Interval-indexed local cache of Exchange calendar events."""
+import bisect
+import logging
+import time
+from datetime import date, datetime, time as dt_time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_CACHE_TTL, DEFAULT_CACHE_MAX_EVENTS, DEFAULT_CACHE_STALE_TTL
+
+if TYPE_CHECKING:
+    from .events import EventRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def as_datetime(value, timezone) -> datetime:
+    """Return an aware datetime for an event boundary (all-day events carry plain dates)."""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone)
+    return datetime.combine(value, dt_time.min, tzinfo=timezone)
+
+
+def timestamp(value: datetime) -> int:
+    """Return a window boundary as a UTC timestamp in whole seconds, comparable with event records."""
+    return int(value.timestamp())
+
+
+def encode_time(value) -> Optional[str]:
+    """Serialize an event boundary for storage."""
+    return value.isoformat() if value is not None else None
+
+
+def decode_time(value: Optional[str]):
+    """Restore an event boundary serialized with encode_time."""
+    if value is None:
+        return None
+    # All-day items carry plain dates, everything else a full timestamp
+    if len(value) == 10:
+        return date.fromisoformat(value)
+    return dt_util.parse_datetime(value)
+
+
+class EventCache:
+    """Cache of calendar windows already fetched from Exchange.
+
+    Fetched windows are kept as a sorted list of disjoint ``[start, end)``
+    intervals, each stamped with the time it was fetched. A lookup returns the
+    cached events for a range together with the gaps that still have to be
+    requested from Exchange. Intervals expire after ``ttl`` seconds and the
+    oldest intervals are evicted once more than ``max_events`` are held.
+    Expired intervals are kept for ``stale_ttl`` seconds more, and answer
+    lookups that explicitly accept stale data (for example while Exchange is
+    unreachable).
+    """
+
+    def __init__(self, timezone, ttl=DEFAULT_CACHE_TTL, max_events=DEFAULT_CACHE_MAX_EVENTS, stale_ttl=DEFAULT_CACHE_STALE_TTL):
+        self._timezone   = timezone
+        self._ttl        = ttl
+        self._stale_ttl  = stale_ttl
+        self._max_events = max_events
+        # Parallel lists sorted by interval start: starts for bisect, (start, end, fetched_at) for the rest
+        self._starts: List[datetime] = []
+        self._intervals: List[Tuple[datetime, datetime, float]] = []
+        # (item_id, start) -> event record
+        self._events: Dict[Tuple[str, int], "EventRecord"] = {}
+        self.hits   = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def lookup(self, start: datetime, end: datetime, allow_stale: bool = False) -> Tuple[List["EventRecord"], List[Tuple[datetime, datetime]]]:
+        """Return the cached events overlapping [start, end) and the uncovered gaps.
+
+        Expired intervals count as gaps unless ``allow_stale`` is set.
+        """
+        self._expire()
+
+        fresh_after = time.monotonic() - self._ttl
+        gaps   = []
+        cursor = start
+        index  = max(bisect.bisect_right(self._starts, start) - 1, 0)
+        for iv_start, iv_end, fetched_at in self._intervals[index:]:
+            if iv_start >= end:
+                break
+            if iv_end <= cursor or (fetched_at < fresh_after and not allow_stale):
+                continue
+            if iv_start > cursor:
+                gaps.append((cursor, iv_start))
+            cursor = max(cursor, iv_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+
+        if not allow_stale:
+            if gaps:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return self._overlapping(start, end), gaps
+
+    def store(self, start: datetime, end: datetime, events: List["EventRecord"], stale: bool = False) -> None:
+        """Record the events Exchange returned for the window [start, end).
+
+        ``stale`` records a window restored from disk: it only answers lookups
+        that accept stale data until Exchange has been asked again.
+        """
+        # Anything still overlapping the window is in the fresh result, so drop what was cached before
+        start_ts, end_ts = timestamp(start), timestamp(end)
+        for key, event in list(self._events.items()):
+            if event.overlaps(start_ts, end_ts):
+                del self._events[key]
+        for event in events:
+            self._events[(event.item_id, event.start)] = event
+
+        self._cut(start, end)
+        index = bisect.bisect_left(self._starts, start)
+        self._starts.insert(index, start)
+        fetched_at = time.monotonic() - (self._ttl if stale else 0)
+        self._intervals.insert(index, (start, end, fetched_at))
+        self._enforce_size()
+
+    def invalidate(self) -> None:
+        """Drop every cached window and event."""
+        self._starts.clear()
+        self._intervals.clear()
+        self._events.clear()
+
+    def _overlapping(self, start: datetime, end: datetime) -> List["EventRecord"]:
+        start_ts, end_ts = timestamp(start), timestamp(end)
+        matches = [event for event in self._events.values() if event.overlaps(start_ts, end_ts)]
+        matches.sort(key=lambda event: event.start)
+        return matches
+
+    def _cut(self, start: datetime, end: datetime) -> None:
+        """Remove [start, end) from the interval index, trimming partially covered intervals."""
+        kept = []
+        for iv_start, iv_end, fetched_at in self._intervals:
+            if iv_end <= start or iv_start >= end:
+                kept.append((iv_start, iv_end, fetched_at))
+                continue
+            if iv_start < start:
+                kept.append((iv_start, start, fetched_at))
+            if iv_end > end:
+                kept.append((end, iv_end, fetched_at))
+        self._intervals = kept
+        self._starts    = [iv[0] for iv in kept]
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self._ttl - self._stale_ttl
+        if not any(fetched_at < cutoff for _, _, fetched_at in self._intervals):
+            return
+        self._intervals = [iv for iv in self._intervals if iv[2] >= cutoff]
+        self._starts    = [iv[0] for iv in self._intervals]
+        self._prune()
+
+    def _enforce_size(self) -> None:
+        while len(self._events) > self._max_events and len(self._intervals) > 1:
+            oldest = min(range(len(self._intervals)), key=lambda i: self._intervals[i][2])
+            del self._intervals[oldest]
+            del self._starts[oldest]
+            self._prune()
+        if len(self._events) > self._max_events:
+            _LOGGER.debug("Calendar window holds %d events, above cache limit %d; not caching it", len(self._events), self._max_events)
+            self.invalidate()
+
+    def _prune(self) -> None:
+        """Drop events no longer covered by any cached interval."""
+        starts = [timestamp(iv_start) for iv_start in self._starts]
+        ends   = [timestamp(iv[1]) for iv in self._intervals]
+        for key, event in list(self._events.items()):
+            # Intervals are disjoint and sorted, so the last one starting before the event ends reaches furthest
+            index = bisect.bisect_right(starts, event.end)
+            if index == 0 or ends[index - 1] < event.start:
+                del self._events[key]
@@ -1,14 +1,16 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 from typing import Any, Dict, List
 
 import pytz
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_TIMEZONE
+from .calendars import PRIMARY_CALENDAR
+from .const import DOMAIN, CONF_TIMEZONE, SIGNAL_CALENDAR_UPDATED
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(
@@ -16,21 +18,56 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities,
 ) -> None:
-    """Set up the calendar platform."""
-    account = hass.data[DOMAIN][entry.entry_id]["account"]
+    """Set up one calendar entity per configured calendar."""
+    clients = hass.data[DOMAIN][entry.entry_id]["clients"]
     timezone = hass.data[DOMAIN][entry.entry_id]["timezone"]
-    async_add_entities([ExchangeCalendarEntity(account, timezone, entry.title)])
+    entities = []
+    for key, client in clients.items():
+        if key == PRIMARY_CALENDAR:
+            entities.append(ExchangeCalendarEntity(client, timezone, entry.title, entry.entry_id))
+        else:
+            entities.append(ExchangeCalendarEntity(
+                client, timezone, f"{entry.title} {client.source.name}", entry.entry_id,
+                unique_id=f"{DOMAIN}_{entry.entry_id}_{key}",
+            ))
+    async_add_entities(entities, update_before_add=True)
+
+def _to_calendar_event(event, timezone, description=None) -> CalendarEvent:
+    """Convert an event record to a CalendarEvent."""
+    return CalendarEvent(
+        summary=event.subject,
+        start=event.local_start(timezone),
+        end=event.local_end(timezone),
+        description=description,
+        location=event.location,
+        uid=event.item_id,
+    )
 
 class ExchangeCalendarEntity(CalendarEntity):
     """A calendar entity for Exchange Calendar."""
 
-    def __init__(self, account, timezone, name):
-        self._account = account
+    def __init__(self, client, timezone, name, entry_id, unique_id=None):
+        self._client = client
         self._timezone = timezone
         self._name = name
-        self._attr_unique_id = f"{DOMAIN}_{name}"
+        self._entry_id = entry_id
+        self._attr_unique_id = unique_id or f"{DOMAIN}_{name}"
         self._event = None
 
+    async def async_added_to_hass(self) -> None:
+        """Refresh as soon as a streaming notification reports a change."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_CALENDAR_UPDATED.format(self._entry_id),
+                self._async_calendar_updated,
+            )
+        )
+
+    @callback
+    def _async_calendar_updated(self) -> None:
+        self.async_schedule_update_ha_state(True)
+
     @property
     def name(self) -> str:
         """Return the name of the calendar."""
@@ -47,54 +84,28 @@ class ExchangeCalendarEntity(CalendarEntity):
         start_date: datetime,
         end_date: datetime,
     ) -> List[CalendarEvent]:
-        """Get events in the given date range."""
+        """Get events in the given date range from the local mirror and cache."""
         try:
-            def fetch_and_materialize_events():
-                """Synchronous function to fetch and fully materialize events."""
-                # Fetch events and convert generator/iterator to a list to ensure all blocking calls happen here
-                events = list(self._account.calendar.view(
-                    start=start_date.astimezone(self._timezone),
-                    end=end_date.astimezone(self._timezone),
-                ))
-                # Convert to list of dicts to avoid passing complex objects across threads
-                return [
-                    {
-                        "subject": event.subject,
-                        "start": event.start,
-                        "end": event.end,
-                        "body": event.body,
-                        "location": event.location,
-                        "item_id": event.id,
-                    }
-                    for event in events
-                ]
+            events = await self._client.async_get_events(start_date, end_date)
 
-            # Run the blocking operation in a thread pool
-            event_dicts = await hass.loop.run_in_executor(None, fetch_and_materialize_events)
-
-            # Convert event dicts to CalendarEvent objects in async context
-            return [
-                CalendarEvent(
-                    summary=event_dict["subject"],
-                    start=event_dict["start"],
-                    end=event_dict["end"],
-                    description=event_dict["body"],
-                    location=event_dict["location"],
-                    uid=event_dict["item_id"],
-                )
-                for event_dict in event_dicts
-            ]
+            # Bodies are not part of the view projection, so panel events carry no description
+            return [_to_calendar_event(event, self._timezone) for event in events]
         except Exception as err:
             _LOGGER.error("Failed to fetch events: %s", err)
             return []
 
     async def async_update(self) -> None:
-        """Update the next event."""
+        """Sync calendar changes and update the next event."""
         now = dt_util.now()
+        await self._client.async_poll()
 
-        events = await self.async_get_events(
-            hass=self.hass,
-            start_date=now,
-            end_date=now + timedelta(days=30),
-        )
-        self._event = min(events, key=lambda x: x.start) if events else None
+        try:
+            # The tracker only goes back to Exchange when its upcoming events run low or the calendar changed
+            next_event = await self._client.next_event.async_next_event(now)
+            if next_event is None:
+                self._event = None
+                return
+            bodies = await self._client.async_load_bodies([next_event])
+            self._event = _to_calendar_event(next_event, self._timezone, bodies.get(next_event.item_id))
+        except Exception as err:
+            _LOGGER.error("Failed to update next event: %s", err)
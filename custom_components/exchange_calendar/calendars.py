@@ -0,0 +1,89 @@
+"""The calendar folders an entry exposes as entities."""
+import threading
+from typing import List, Optional
+
+from exchangelib import Account, DELEGATE
+from homeassistant.util import slugify
+
+from .connection import ExchangeConnection
+
+# Key of the account's own default calendar, which keeps the storage keys and entity of single-calendar entries
+PRIMARY_CALENDAR = "calendar"
+
+
+class CalendarSource:
+    """Where one of the entry's calendars lives: a mailbox and a folder path below its default calendar.
+
+    A calendar of another mailbox (a room, a shared or delegated mailbox)
+    gets its own ``Account`` object, but that shares the configuration of the
+    entry's connection and with it the protocol, its HTTP sessions and the
+    entry's executor. Folders are resolved on first use, from an executor
+    thread, since looking them up talks to the server.
+    """
+
+    def __init__(self, connection: ExchangeConnection, key: str, name: str, mailbox: Optional[str] = None, path: str = ""):
+        self._connection = connection
+        self._lock       = threading.Lock()
+        self._account: Optional[Account] = None
+        self._folder     = None
+        self.key         = key
+        self.name        = name
+        self.mailbox     = mailbox
+        self.path        = path
+
+    @property
+    def in_primary_mailbox(self) -> bool:
+        return self.mailbox is None
+
+    @property
+    def folder_id(self) -> Optional[str]:
+        """Return the EWS id of the folder once it has been resolved."""
+        return self._folder.id if self._folder is not None else None
+
+    def account(self) -> Account:
+        """Synchronously return the account of the mailbox holding the calendar."""
+        if self.mailbox is None:
+            return self._connection.account
+        with self._lock:
+            if self._account is None:
+                self._account = Account(
+                    primary_smtp_address=self.mailbox,
+                    config=self._connection.config,
+                    autodiscover=False,
+                    access_type=DELEGATE,
+                )
+            return self._account
+
+    def folder(self):
+        """Synchronously return the calendar folder, looking it up on first use."""
+        account = self.account()
+        with self._lock:
+            if self._folder is None:
+                folder = account.calendar
+                for part in filter(None, self.path.split("/")):
+                    folder = folder / part
+                self._folder = folder
+            return self._folder
+
+
+def parse_calendars(connection: ExchangeConnection, specs: List[str]) -> List[CalendarSource]:
+    """Return the primary calendar followed by one source per configured calendar.
+
+    Each spec is a folder path below the account's calendar (``Team`` or
+    ``Team/Holidays``), a mailbox address for that mailbox's calendar
+    (``room1@example.com``), or both (``room1@example.com/Bookings``).
+    """
+    sources = [CalendarSource(connection, PRIMARY_CALENDAR, "")]
+    seen    = {PRIMARY_CALENDAR}
+    for spec in specs:
+        spec = spec.strip().strip("/")
+        if not spec:
+            continue
+        first, _, rest = spec.partition("/")
+        mailbox, path  = (first, rest) if "@" in first else (None, spec)
+        key = slugify(spec)
+        if key in seen:
+            continue
+        seen.add(key)
+        sources.append(CalendarSource(connection, key, spec, mailbox, path))
+    return sources
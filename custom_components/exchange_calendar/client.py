@@ -0,0 +1,330 @@
+"""Shared read path for Exchange calendar events."""
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .cache import EventCache, decode_time, encode_time, timestamp
+from .calendars import PRIMARY_CALENDAR, CalendarSource
+from .coalesce import SingleFlight, normalize_window
+from .connection import ExchangeConnection
+from .const import (
+    DOMAIN,
+    EVENT_FIELDS,
+    DEFAULT_BODY_CACHE_SIZE,
+    DEFAULT_CHUNK_MAX_DAYS,
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_VIEW_MAX_ITEMS,
+    SNAPSHOT_DAYS,
+)
+from .events import RECORD_VERSION, EventRecord, split_occurrence_id
+from .executor import EwsExecutor
+from .planner import plan_windows, split_window
+from .sync import CalendarSync
+from .tracker import NextEventTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_STORAGE_VERSION = 1
+
+# Windows are not halved any further than this when a CalendarView result is full
+MIN_SPLIT_WINDOW = timedelta(hours=1)
+
+
+def snapshot_key(entry_id: str, calendar: str = PRIMARY_CALENDAR) -> str:
+    """Return the storage key of the snapshot of one of an entry's calendars."""
+    if calendar == PRIMARY_CALENDAR:
+        return f"{DOMAIN}.{entry_id}.snapshot"
+    return f"{DOMAIN}.{entry_id}.{calendar}.snapshot"
+
+
+def view_operation(start: datetime, end: datetime) -> str:
+    """Return the metrics operation name of a CalendarView, which tells window sizes apart."""
+    length = end - start
+    if length <= timedelta(days=1):
+        return "calendar_view_day"
+    if length <= timedelta(days=7):
+        return "calendar_view_week"
+    if length <= timedelta(days=DEFAULT_CHUNK_MAX_DAYS):
+        return "calendar_view_month"
+    return "calendar_view_long"
+
+
+class ExchangeCalendarClient:
+    """Answers event queries for one calendar of a config entry.
+
+    Queries are served from the SyncFolderItems mirror where it can answer
+    them, and otherwise from the interval cache, which only asks Exchange for
+    the CalendarView windows it has not seen yet.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: ExchangeConnection,
+        source: CalendarSource,
+        timezone,
+        cache: EventCache,
+        sync: CalendarSync,
+        executor: EwsExecutor,
+        snapshot_key: str,
+    ):
+        self._hass     = hass
+        self._connection = connection
+        self._executor = executor
+        self.source    = source
+        self._timezone = timezone
+        self._cache    = cache
+        self._sync     = sync
+        self.streaming = None
+        self._in_flight   = SingleFlight()
+        self._fetch_slots = asyncio.Semaphore(DEFAULT_FETCH_CONCURRENCY)
+        # (item_id, changekey) -> body, least recently used first
+        self._bodies: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+        self.next_event  = NextEventTracker(self.async_get_upcoming)
+        self.mirror_hits = 0
+        self.body_hits   = 0
+        self.body_misses = 0
+        self._snapshot = Store(hass, SNAPSHOT_STORAGE_VERSION, snapshot_key)
+
+    @property
+    def online(self) -> bool:
+        """Return True while reads can go to Exchange instead of falling back to local data."""
+        return self._connection.ready and self._executor.available
+
+    async def async_load_snapshot(self) -> None:
+        """Seed the cache with the events saved at the last shutdown, marked stale."""
+        data = await self._snapshot.async_load()
+        if not data or data.get("records") != RECORD_VERSION or data.get("timezone") != str(self._timezone):
+            return
+        events = [EventRecord.from_json(event) for event in data["events"]]
+        self._cache.store(decode_time(data["start"]), decode_time(data["end"]), events, stale=True)
+        _LOGGER.debug("Restored %d events from the calendar snapshot", len(events))
+
+    async def async_save_snapshot(self, *_) -> None:
+        """Save the locally known events around now for the next warm start."""
+        start  = dt_util.now().astimezone(self._timezone) - timedelta(days=1)
+        end    = start + timedelta(days=SNAPSHOT_DAYS + 1)
+        events = self._local_events(start, end)
+        await self._snapshot.async_save({
+            "records":  RECORD_VERSION,
+            "timezone": str(self._timezone),
+            "start":    encode_time(start),
+            "end":      encode_time(end),
+            "events":   [event.to_json() for event in events],
+        })
+
+    async def async_refresh(self, force: bool = False) -> None:
+        """Pull the changes made since the last poll into the local mirror."""
+        if not self.online:
+            return
+        try:
+            if await self._sync.async_sync(force=force):
+                self._cache.invalidate()
+                self.next_event.invalidate()
+        except Exception as err:
+            _LOGGER.error("Failed to sync calendar changes: %s", err)
+
+    async def async_poll(self) -> None:
+        """Poll for changes unless a streaming subscription is already pushing them."""
+        if self.streaming and self.streaming.connected:
+            return
+        await self.async_refresh()
+
+    async def async_mutated(self) -> None:
+        """Bring local state up to date after this integration changed the calendar."""
+        self._cache.invalidate()
+        self.next_event.invalidate()
+        await self.async_refresh(force=True)
+
+    async def async_get_events(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """Return event records overlapping [start, end), sorted by start."""
+        start = start.astimezone(self._timezone)
+        end   = end.astimezone(self._timezone)
+
+        events = self._sync.events_between(start, end)
+        if events is not None:
+            self.mirror_hits += 1
+            return events
+        if not self.online:
+            # Until Exchange is reachable and healthy, answer from whatever is known locally, however old
+            return self._local_events(start, end)
+
+        # Whole-minute windows let concurrent callers asking for "now" onwards share one request
+        query_start, query_end = (value.astimezone(self._timezone) for value in normalize_window(start, end))
+        cached, gaps = self._cache.lookup(query_start, query_end)
+        records      = {(event.item_id, event.start): event for event in cached}
+        if gaps:
+            # Cached events inside a gap come from an expired window; the fresh fetch replaces them
+            records = {
+                key: event for key, event in records.items()
+                if not any(self._overlaps(event, gap_start, gap_end) for gap_start, gap_end in gaps)
+            }
+            try:
+                fetched = await self._async_fetch_windows(gaps)
+            except Exception:
+                if self._executor.available:
+                    raise
+                _LOGGER.warning("Exchange is unavailable, answering from local data")
+                return self._local_events(start, end)
+            for window_start, window_end, window_events in fetched:
+                self._cache.store(window_start, window_end, window_events)
+                # Keying on id and start drops the copies of events that straddle a chunk boundary
+                records.update({(event.item_id, event.start): event for event in window_events})
+
+        return self._sorted_between(records.values(), start, end)
+
+    async def async_get_upcoming(
+        self, start: datetime, end: datetime, max_items: int
+    ) -> Tuple[List[EventRecord], Optional[datetime]]:
+        """Return the first max_items events overlapping [start, end) and the time up to which none are missing.
+
+        Local data answers when it covers the range; otherwise a single
+        CalendarView limited to max_items is requested. While Exchange is
+        unreachable, whatever is known locally is returned without a bound.
+        """
+        start = start.astimezone(self._timezone)
+        end   = end.astimezone(self._timezone)
+
+        events = self._sync.events_between(start, end)
+        if events is not None:
+            self.mirror_hits += 1
+            return events, end
+        if not self.online:
+            return self._local_events(start, end)[:max_items], None
+        cached, gaps = self._cache.lookup(start, end)
+        if not gaps:
+            return self._sorted_between(cached, start, end), end
+
+        try:
+            events = await self._executor.async_run(
+                self._view, start, end, max_items, operation="next_events", idempotent=True
+            )
+        except Exception:
+            if self._executor.available:
+                raise
+            return self._local_events(start, end)[:max_items], None
+        events = self._sorted_between(events, start, end)
+        if len(events) < max_items:
+            return events, end
+        # The view was cut off: events starting after the last one returned may be missing
+        return events, datetime.fromtimestamp(events[-1].start, self._timezone)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how often reads were answered locally."""
+        return {
+            "mirror_hits":       self.mirror_hits,
+            "cache_hits":        self._cache.hits,
+            "cache_misses":      self._cache.misses,
+            "cached_events":     len(self._cache),
+            "body_hits":         self.body_hits,
+            "body_misses":       self.body_misses,
+            "coalesced_fetches": self._in_flight.coalesced,
+        }
+
+    def _local_events(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """Return the events known locally for [start, end) without contacting Exchange."""
+        events = self._sync.events_between(start, end)
+        if events is not None:
+            return events
+        cached, _ = self._cache.lookup(start, end, allow_stale=True)
+        return self._sorted_between(cached, start, end)
+
+    def _overlaps(self, event: EventRecord, start: datetime, end: datetime) -> bool:
+        return event.overlaps(timestamp(start), timestamp(end))
+
+    def _sorted_between(self, events: Iterable[EventRecord], start: datetime, end: datetime) -> List[EventRecord]:
+        start_ts, end_ts = timestamp(start), timestamp(end)
+        matches = [event for event in events if event.overlaps(start_ts, end_ts)]
+        matches.sort(key=lambda event: event.start)
+        return matches
+
+    async def async_load_bodies(self, events: Iterable[EventRecord]) -> Dict[Any, Optional[str]]:
+        """Return item_id -> body for the given events, fetching missing bodies in one GetItem."""
+        bodies  = {}
+        # (item_id, changekey) -> ids of the events waiting for that body
+        missing: Dict[Any, List[str]] = {}
+        for event in events:
+            # Occurrences expanded locally share their master's body
+            key = (split_occurrence_id(event.item_id)[0], event.changekey)
+            if key in self._bodies:
+                self._bodies.move_to_end(key)
+                bodies[event.item_id] = self._bodies[key]
+                self.body_hits += 1
+            else:
+                missing.setdefault(key, []).append(event.item_id)
+        self.body_misses += len(missing)
+
+        if missing and self.online:
+            fetched = await self._executor.async_run(
+                self._fetch_bodies, list(missing), operation="get_bodies", idempotent=True
+            )
+            for key, body in fetched.items():
+                for item_id in missing[key]:
+                    bodies[item_id] = body
+                self._bodies[key] = body
+            while len(self._bodies) > DEFAULT_BODY_CACHE_SIZE:
+                self._bodies.popitem(last=False)
+        return bodies
+
+    def _fetch_bodies(self, keys):
+        """Synchronous batched GetItem for the body field only."""
+        bodies = {}
+        for key, item in zip(keys, self.source.account().fetch(ids=keys, only_fields=["body"])):
+            if isinstance(item, Exception):
+                _LOGGER.debug("Failed to load body of %s: %s", key[0], item)
+                continue
+            bodies[key] = str(item.body) if item.body is not None else None
+        return bodies
+
+    async def _async_fetch_windows(self, gaps):
+        """Fetch the planned chunks of every gap concurrently on a bounded number of executor jobs."""
+        windows = [window for gap_start, gap_end in gaps for window in plan_windows(gap_start, gap_end, self._timezone)]
+
+        async def fetch_window(window):
+            async with self._fetch_slots:
+                return await self._executor.async_run(
+                    self._fetch_window, *window, operation=view_operation(*window), idempotent=True
+                )
+
+        async def fetch(window):
+            # A window already being fetched for another caller, or inside one, is awaited instead of requested again
+            calendar = self.source.key
+            for key in self._in_flight.keys():
+                if key[0] == calendar and key[1] <= window[0] and key[2] >= window[1]:
+                    events = await self._in_flight.async_join(key)
+                    if events is not None:
+                        return window[0], window[1], [event for event in events if self._overlaps(event, *window)]
+            events = await self._in_flight.async_do((calendar, window[0], window[1]), lambda: fetch_window(window))
+            return window[0], window[1], events
+
+        return await asyncio.gather(*(fetch(window) for window in windows))
+
+    def _fetch_window(self, window_start, window_end):
+        """Synchronous function to fetch and fully materialize the events of one window."""
+        events = self._view(window_start, window_end, DEFAULT_VIEW_MAX_ITEMS)
+        if len(events) >= DEFAULT_VIEW_MAX_ITEMS:
+            # CalendarView cannot page, so a full result may be truncated: fetch each half instead
+            if window_end - window_start > MIN_SPLIT_WINDOW:
+                return [
+                    event
+                    for half_start, half_end in split_window(window_start, window_end)
+                    for event in self._fetch_window(half_start, half_end)
+                ]
+            _LOGGER.warning("More than %d events between %s and %s, results are truncated", DEFAULT_VIEW_MAX_ITEMS, window_start, window_end)
+        return events
+
+    def _view(self, start, end, max_items) -> List[EventRecord]:
+        """Synchronous CalendarView of at most max_items events, fully materialized."""
+        # Fetch events and convert generator/iterator to a list to ensure all blocking calls happen here
+        events = list(
+            self.source.folder().view(start=start, end=end, max_items=max_items).only(*EVENT_FIELDS)
+        )
+
+        # Convert to records to avoid passing complex objects across threads
+        return [EventRecord.from_item(event, self._timezone) for event in events]
@@ -0,0 +1,46 @@
+"""Single-flight coalescing of identical in-flight requests."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+def normalize_window(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """Widen [start, end) to whole UTC minutes so near-identical requests share a key."""
+    start = start.astimezone(timezone.utc).replace(second=0, microsecond=0)
+    end_utc = end.astimezone(timezone.utc)
+    end = end_utc.replace(second=0, microsecond=0)
+    if end < end_utc:
+        end += timedelta(minutes=1)
+    return start, end
+
+
+class SingleFlight:
+    """Registry of in-flight calls; concurrent callers with the same key await one call."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def async_do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of func(), sharing it with any concurrent call for the same key."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shielded so one caller giving up does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def keys(self) -> Iterable[Hashable]:
+        """Return the keys of the calls currently in flight."""
+        return list(self._calls)
+
+    async def async_join(self, key: Hashable) -> Optional[Any]:
+        """Await the in-flight call for key, if there still is one."""
+        task = self._calls.get(key)
+        if task is None:
+            return None
+        self.coalesced += 1
+        return await asyncio.shield(task)
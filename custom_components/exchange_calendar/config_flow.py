@@ -1,6 +1,6 @@
 import logging
+import re
 import voluptuous as vol
-from exchangelib import Account, Credentials, Configuration, DELEGATE
 from homeassistant import config_entries
 from homeassistant.core import callback
 import pytz
@@ -12,12 +12,36 @@ from .const import (
     CONF_PASSWORD,
     CONF_TIMEZONE,
     CONF_AUTH_TYPE,
+    CONF_STREAMING,
+    CONF_CALENDARS,
+    CONF_QUEUE_WRITES,
+    CONF_EXPAND_RECURRENCES,
+    CONF_MAX_WORKERS,
+    CONF_CALL_TIMEOUT,
+    CONF_REQUEST_RATE,
+    CONF_REQUEST_BURST,
+    CONF_MAX_RETRIES,
+    CONF_MAX_CONNECTIONS,
+    CONF_KEEPALIVE,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_CALL_TIMEOUT,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_KEEPALIVE,
     AUTH_TYPES,
 )
+from .manager import async_get_manager, connection_key
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _split_calendars(value: str) -> list:
+    """Split the comma or newline separated extra calendars of the options form."""
+    return [spec.strip() for spec in re.split(r"[,\n]", value) if spec.strip()]
+
+
 class ExchangeCalendarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Exchange Calendar."""
 
@@ -28,22 +52,15 @@ class ExchangeCalendarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         if user_input is not None:
             try:
-                credentials = Credentials(
-                    username=user_input[CONF_EMAIL],
-                    password=user_input[CONF_PASSWORD],
-                )
-                config = Configuration(
-                    server=user_input[CONF_SERVER],
-                    credentials=credentials,
-                    auth_type=user_input[CONF_AUTH_TYPE],
-                )
-                await self.hass.async_add_executor_job(
-                    lambda: Account(
-                        primary_smtp_address=user_input[CONF_EMAIL],
-                        config=config,
-                        autodiscover=False,
-                        access_type=DELEGATE,
-                    )
+                # The connected account is kept, so setting up the entry does not connect again
+                await async_get_manager(self.hass).async_probe(
+                    connection_key(
+                        user_input[CONF_SERVER],
+                        user_input[CONF_EMAIL],
+                        user_input[CONF_PASSWORD],
+                        user_input[CONF_AUTH_TYPE],
+                    ),
+                    DEFAULT_MAX_CONNECTIONS,
                 )
                 return self.async_create_entry(
                     title=user_input[CONF_EMAIL],
@@ -103,6 +120,17 @@ class ExchangeCalendarOptionsFlow(config_entries.OptionsFlow):
                     data={
                         CONF_PASSWORD: user_input[CONF_PASSWORD],
                         CONF_TIMEZONE: user_input[CONF_TIMEZONE],
+                        CONF_STREAMING: user_input.get(CONF_STREAMING, False),
+                        CONF_CALENDARS: _split_calendars(user_input.get(CONF_CALENDARS, "")),
+                        CONF_QUEUE_WRITES: user_input.get(CONF_QUEUE_WRITES, False),
+                        CONF_EXPAND_RECURRENCES: user_input.get(CONF_EXPAND_RECURRENCES, False),
+                        CONF_MAX_WORKERS: user_input.get(CONF_MAX_WORKERS, DEFAULT_MAX_WORKERS),
+                        CONF_CALL_TIMEOUT: user_input.get(CONF_CALL_TIMEOUT, DEFAULT_CALL_TIMEOUT),
+                        CONF_REQUEST_RATE: user_input.get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE),
+                        CONF_REQUEST_BURST: user_input.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST),
+                        CONF_MAX_RETRIES: user_input.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+                        CONF_MAX_CONNECTIONS: user_input.get(CONF_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS),
+                        CONF_KEEPALIVE: user_input.get(CONF_KEEPALIVE, DEFAULT_KEEPALIVE),
                     },
                 )
 
@@ -115,6 +143,17 @@ class ExchangeCalendarOptionsFlow(config_entries.OptionsFlow):
             self.config_entry.options.get(CONF_TIMEZONE)
             or self.config_entry.data.get(CONF_TIMEZONE, "UTC")
         )
+        current_streaming = self.config_entry.options.get(CONF_STREAMING, False)
+        current_calendars = ", ".join(self.config_entry.options.get(CONF_CALENDARS, []))
+        current_queue_writes = self.config_entry.options.get(CONF_QUEUE_WRITES, False)
+        current_expand_recurrences = self.config_entry.options.get(CONF_EXPAND_RECURRENCES, False)
+        current_max_workers = self.config_entry.options.get(CONF_MAX_WORKERS, DEFAULT_MAX_WORKERS)
+        current_call_timeout = self.config_entry.options.get(CONF_CALL_TIMEOUT, DEFAULT_CALL_TIMEOUT)
+        current_request_rate = self.config_entry.options.get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE)
+        current_request_burst = self.config_entry.options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST)
+        current_max_retries = self.config_entry.options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES)
+        current_max_connections = self.config_entry.options.get(CONF_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS)
+        current_keepalive = self.config_entry.options.get(CONF_KEEPALIVE, DEFAULT_KEEPALIVE)
 
         return self.async_show_form(
             step_id="init",
@@ -122,6 +161,31 @@ class ExchangeCalendarOptionsFlow(config_entries.OptionsFlow):
                 {
                     vol.Required(CONF_PASSWORD, default=current_password): str,
                     vol.Required(CONF_TIMEZONE, default=current_timezone): vol.In(pytz.all_timezones),
+                    vol.Optional(CONF_STREAMING, default=current_streaming): bool,
+                    vol.Optional(CONF_CALENDARS, default=current_calendars): str,
+                    vol.Optional(CONF_QUEUE_WRITES, default=current_queue_writes): bool,
+                    vol.Optional(CONF_EXPAND_RECURRENCES, default=current_expand_recurrences): bool,
+                    vol.Optional(CONF_MAX_WORKERS, default=current_max_workers): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=32)
+                    ),
+                    vol.Optional(CONF_CALL_TIMEOUT, default=current_call_timeout): vol.All(
+                        vol.Coerce(int), vol.Range(min=5, max=600)
+                    ),
+                    vol.Optional(CONF_REQUEST_RATE, default=current_request_rate): vol.All(
+                        vol.Coerce(float), vol.Range(min=0.1, max=100)
+                    ),
+                    vol.Optional(CONF_REQUEST_BURST, default=current_request_burst): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=500)
+                    ),
+                    vol.Optional(CONF_MAX_RETRIES, default=current_max_retries): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=10)
+                    ),
+                    vol.Optional(CONF_MAX_CONNECTIONS, default=current_max_connections): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=32)
+                    ),
+                    vol.Optional(CONF_KEEPALIVE, default=current_keepalive): vol.All(
+                        vol.Coerce(int), vol.Range(min=30, max=3600)
+                    ),
                 }
             ),
             errors=errors,
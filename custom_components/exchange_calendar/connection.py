@@ -0,0 +1,101 @@
+"""Lazily established connection to an Exchange account."""
+import asyncio
+import logging
+from typing import Optional
+
+from exchangelib import Account, Configuration, DELEGATE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import RECONNECT_BACKOFF_MIN, RECONNECT_BACKOFF_MAX
+from .executor import EwsExecutor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ExchangeNotConnected(HomeAssistantError):
+    """The Exchange account has not been connected yet."""
+
+
+class ExchangeConnection:
+    """Builds the exchangelib Account in the background.
+
+    Constructing an Account talks to the server, so setup no longer waits for
+    it: callers that need the account await ``async_get_account`` and
+    everything else checks ``ready`` and falls back to local data meanwhile.
+    Failed attempts are retried with exponential backoff.
+    """
+
+    def __init__(self, hass: HomeAssistant, executor: EwsExecutor, email: str, config: Configuration):
+        self._hass      = hass
+        self._executor  = executor
+        self._email     = email
+        self._server    = config.server
+        self._config    = config
+        self._account: Optional[Account] = None
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Return True once the account is available."""
+        return self._account is not None
+
+    @property
+    def config(self) -> Configuration:
+        return self._config
+
+    @property
+    def account(self) -> Account:
+        """Return the connected account."""
+        if self._account is None:
+            raise ExchangeNotConnected(f"Not connected to Exchange server {self._server} yet")
+        return self._account
+
+    @callback
+    def start(self) -> None:
+        """Start connecting in the background."""
+        self._task = self._hass.async_create_background_task(self._connect(), f"exchange_calendar connect {self._email}")
+
+    @callback
+    def adopt(self, account: Account) -> None:
+        """Use an account connected elsewhere, such as by the config flow, instead of connecting again."""
+        self._account = account
+        self._connected.set()
+
+    async def async_stop(self) -> None:
+        """Stop any connection attempt still running."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def async_get_account(self, timeout: Optional[float] = None) -> Account:
+        """Return the account, waiting up to timeout seconds for the connection."""
+        if self._account is None:
+            try:
+                await asyncio.wait_for(self._connected.wait(), timeout)
+            except asyncio.TimeoutError as err:
+                raise ExchangeNotConnected(f"Not connected to Exchange server {self._server} yet") from err
+        return self._account
+
+    async def _connect(self) -> None:
+        backoff = RECONNECT_BACKOFF_MIN
+        while self._account is None:
+            try:
+                self._account = await self._executor.async_run(
+                    lambda: Account(
+                        primary_smtp_address=self._email,
+                        config=self._config,
+                        autodiscover=False,
+                        access_type=DELEGATE,
+                    ),
+                    operation="connect",
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                _LOGGER.error("Failed to connect to Exchange server %s, retrying in %ss: %s", self._server, backoff, err)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX)
+        _LOGGER.debug("Connected to Exchange server %s", self._server)
+        self._connected.set()
@@ -6,6 +6,17 @@ CONF_PASSWORD = "password"
 CONF_SERVER = "server"
 CONF_TIMEZONE = "timezone"
 CONF_AUTH_TYPE = "auth_type"
+CONF_STREAMING = "streaming"
+CONF_CALENDARS = "calendars"
+CONF_QUEUE_WRITES = "queue_writes"
+CONF_EXPAND_RECURRENCES = "expand_recurrences"
+CONF_MAX_WORKERS = "max_workers"
+CONF_CALL_TIMEOUT = "call_timeout"
+CONF_REQUEST_RATE = "request_rate"
+CONF_REQUEST_BURST = "request_burst"
+CONF_MAX_RETRIES = "max_retries"
+CONF_MAX_CONNECTIONS = "max_connections"
+CONF_KEEPALIVE = "keepalive"
 
 AUTH_TYPES = ["NTLM", "basic"]
 
@@ -13,3 +24,98 @@ SERVICE_CREATE_EVENT = "create_event"
 SERVICE_DELETE_EVENT = "delete_event"
 SERVICE_SEARCH_EVENT = "search_event"
 SERVICE_EDIT_EVENT = "edit_event"
+SERVICE_BULK_CREATE_EVENTS = "bulk_create_events"
+SERVICE_BULK_UPDATE_EVENTS = "bulk_update_events"
+SERVICE_BULK_DELETE_EVENTS = "bulk_delete_events"
+SERVICE_GET_AVAILABILITY = "get_availability"
+SERVICE_EXPORT_ICS = "export_ics"
+
+# Event fired with the outcome of each change written from the write queue
+EVENT_MUTATION_RESULT = f"{DOMAIN}_mutation_result"
+# Seconds queued changes wait to be written together, and seconds an idempotency key is remembered after its write
+WRITE_BEHIND_DELAY = 2
+IDEMPOTENCY_KEY_TTL = 86400
+
+# Items sent to Exchange per CreateItem/UpdateItem/DeleteItem request by the bulk services
+DEFAULT_BULK_CHUNK_SIZE = 100
+
+# Item fields requested by calendar view queries; bodies are loaded separately on demand.
+# exchangelib only turns the start and end of all-day items into dates when is_all_day is fetched.
+EVENT_FIELDS = [
+    "subject", "start", "end", "is_all_day", "location", "categories", "organizer", "legacy_free_busy_status",
+]
+# Values of an event's busy status, as search_event filters on them
+BUSY_STATUSES = ["Free", "Tentative", "Busy", "OOF", "WorkingElsewhere", "NoData"]
+# Statuses get_availability counts as busy unless told otherwise
+DEFAULT_BUSY_STATUSES = ["Tentative", "Busy", "OOF"]
+# Longest window Exchange returns availability data for in one request
+AVAILABILITY_MAX_DAYS = 42
+# Number of event bodies kept in memory once loaded
+DEFAULT_BODY_CACHE_SIZE = 500
+
+# Seconds a fetched calendar window stays valid in the local event cache
+DEFAULT_CACHE_TTL = 300
+# Upper bound on the number of events held in the local event cache
+DEFAULT_CACHE_MAX_EVENTS = 5000
+# Seconds an expired window is still kept to answer queries while Exchange is unreachable
+DEFAULT_CACHE_STALE_TTL = 86400
+# Days ahead of now covered by the event snapshot saved for a warm start
+SNAPSHOT_DAYS = 30
+# Seconds between periodic saves of the event snapshot
+SNAPSHOT_SAVE_INTERVAL = 900
+# Upcoming events requested at a time by the next-event tracker, looking at most this many days ahead
+NEXT_EVENT_BATCH = 10
+NEXT_EVENT_HORIZON_DAYS = 30
+# With fewer events than this left, the tracker asks again once its complete range ends within the lookahead
+# seconds, or once the refill interval in seconds has passed, so events entering the horizon still show up
+NEXT_EVENT_LOW_WATERMARK = 2
+NEXT_EVENT_LOOKAHEAD = 86400
+NEXT_EVENT_REFILL_INTERVAL = 3600
+# Minimum seconds between SyncFolderItems polls of the calendar folder
+DEFAULT_SYNC_INTERVAL = 30
+
+# Dispatcher signal sent when a calendar's local state changed, formatted with the entry id
+SIGNAL_CALENDAR_UPDATED = f"{DOMAIN}_calendar_updated_{{}}"
+
+# Minutes a single GetStreamingEvents connection stays open before it is renewed
+STREAMING_CONNECTION_TIMEOUT = 5
+# Seconds to wait before reconnecting or re-subscribing after a failure, doubling up to the maximum
+RECONNECT_BACKOFF_MIN = 5
+RECONNECT_BACKOFF_MAX = 300
+# hass.data key of the connections shared by the entries and the config flow
+DATA_CONNECTIONS = f"{DOMAIN}_connections"
+# HTTP sessions kept open to one server per set of credentials, shared by every entry using them
+DEFAULT_MAX_CONNECTIONS = 4
+# Seconds an idle HTTP session is kept open before it is closed, and seconds between the checks
+DEFAULT_KEEPALIVE = 300
+KEEPALIVE_CHECK_INTERVAL = 60
+# Seconds an account connected by the config flow is kept for the entry it creates
+PROBE_TTL = 300
+# Seconds to gather a burst of notifications into one refresh
+STREAMING_DEBOUNCE = 2
+
+# Ranges longer than this many days are fetched in per-month CalendarView chunks
+DEFAULT_CHUNK_MAX_DAYS = 31
+# CalendarView chunks fetched from Exchange at the same time
+DEFAULT_FETCH_CONCURRENCY = 4
+# Items requested per CalendarView; a full result means the window is split and refetched
+DEFAULT_VIEW_MAX_ITEMS = 1000
+
+# Worker threads dedicated to one account's EWS calls
+DEFAULT_MAX_WORKERS = 4
+# Seconds before a single EWS call is given up on
+DEFAULT_CALL_TIMEOUT = 60
+# Upper bounds in seconds of the EWS call latency histogram buckets
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Sustained EWS requests per second allowed for one account, and the burst allowed on top
+DEFAULT_REQUEST_RATE = 10
+DEFAULT_REQUEST_BURST = 50
+# Retries of a call Exchange rejected as busy, or of a read that failed in transit
+DEFAULT_MAX_RETRIES = 3
+# Seconds of the first retry delay, doubling per retry up to the maximum, before jitter
+RETRY_BACKOFF_MIN = 1
+RETRY_BACKOFF_MAX = 30
+# Transient failures in a row that open the circuit, and seconds before a probe call is let through
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60
@@ -0,0 +1,36 @@
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .calendars import PRIMARY_CALENDAR
+from .manager import async_get_manager
+from .const import DOMAIN, CONF_EMAIL, CONF_PASSWORD, CONF_CALENDARS
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, CONF_CALENDARS}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return the entry's configuration and its EWS call statistics."""
+    data   = hass.data[DOMAIN][entry.entry_id]
+    client = data["client"]
+    # A list rather than keyed by calendar, since the keys carry mailbox addresses and folder names
+    calendars = [
+        {"primary": key == PRIMARY_CALENDAR, "streaming": calendar.streaming is not None, "reads": calendar.stats()}
+        for key, calendar in data["clients"].items()
+    ]
+    return {
+        "entry": {
+            "data":    async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "connected": data["connection"].ready,
+        "streaming": client.streaming.connected if client.streaming else None,
+        "executor":  data["executor"].stats(),
+        "reads":     client.stats(),
+        "calendars": calendars,
+        "queue":     data["queue"].stats(),
+        "connections": async_get_manager(hass).stats(),
+        "ews":       data["metrics"].as_dict(),
+    }
@@ -0,0 +1,220 @@
+"""Compact event records built from exchangelib items, and the search over them."""
+import base64
+import binascii
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Iterable, List, Optional, Tuple
+
+from .cache import as_datetime
+
+# Version of the serialized form of records, stored with the mirror and the snapshot
+RECORD_VERSION = 2
+# Separates the master id from the instance index in the ids of occurrences expanded locally;
+# EWS ids are base64, so it never appears in an id Exchange gave out
+OCCURRENCE_SEPARATOR = "#"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+def to_timestamp(value, timezone) -> int:
+    """Return an event boundary as a UTC timestamp in whole seconds; dates count from local midnight."""
+    return int(as_datetime(value, timezone).timestamp())
+
+
+def local_time(value: int, all_day: bool, timezone):
+    """Return a timestamp as an aware local datetime, or as the local date for all-day events."""
+    local = datetime.fromtimestamp(value, timezone)
+    return local.date() if all_day else local
+
+
+def occurrence_id(master_id: str, index: int) -> str:
+    """Return the id of an occurrence expanded locally, from its master's id and its instance index (from 1)."""
+    return f"{master_id}{OCCURRENCE_SEPARATOR}{index}"
+
+
+def split_occurrence_id(item_id: str) -> Tuple[str, Optional[int]]:
+    """Return the master id and instance index of an occurrence id, or the id and None for any other item."""
+    master_id, separator, index = item_id.rpartition(OCCURRENCE_SEPARATOR)
+    if separator and index.isdigit():
+        return master_id, int(index)
+    return item_id, None
+
+
+class EventRecord:
+    """One calendar event: the fields of EVENT_FIELDS and the item's id.
+
+    Records are what the mirror, the caches, the entity and the services
+    share; CalendarEvent objects and JSON are only built from them at the
+    edges. Times are UTC timestamps in whole seconds. All-day events are
+    flagged ``all_day`` and run from local midnight of the entry's time zone
+    to the midnight after their last day, like CalendarEvent expects.
+    Subjects, locations, organizers, categories and statuses repeat across
+    the occurrences of a series, so they are interned and held once.
+    """
+
+    __slots__ = (
+        "item_id", "changekey", "subject", "location", "start", "end",
+        "all_day", "categories", "organizer", "busy_status",
+    )
+
+    def __init__(
+        self,
+        item_id: str,
+        changekey: Optional[str],
+        subject: Optional[str],
+        location: Optional[str],
+        start: int,
+        end: int,
+        all_day: bool = False,
+        categories: Optional[Iterable[str]] = None,
+        organizer: Optional[str] = None,
+        busy_status: Optional[str] = None,
+    ):
+        self.item_id     = item_id
+        self.changekey   = changekey
+        self.subject     = _intern(subject)
+        self.location    = _intern(location)
+        self.start       = start
+        self.end         = end
+        self.all_day     = all_day
+        self.categories  = tuple(_intern(category) for category in categories) if categories else None
+        self.organizer   = _intern(organizer)
+        self.busy_status = _intern(busy_status)
+
+    @classmethod
+    def from_item(cls, item, timezone) -> "EventRecord":
+        """Return the record of a calendar item fetched with EVENT_FIELDS, safe to pass across threads."""
+        all_day = bool(item.is_all_day)
+        end     = item.end
+        if all_day and not isinstance(end, datetime):
+            # exchangelib gives all-day items their last day as end; records end at the next midnight
+            end += timedelta(days=1)
+        return cls(
+            item.id,
+            item.changekey,
+            item.subject,
+            item.location,
+            to_timestamp(item.start, timezone),
+            to_timestamp(end, timezone),
+            all_day,
+            item.categories,
+            item.organizer.email_address if item.organizer else None,
+            item.legacy_free_busy_status,
+        )
+
+    def moved(self, start: int, end: int, item_id: Optional[str] = None) -> "EventRecord":
+        """Return a copy at other times, such as another occurrence of the same series under its own id."""
+        record = EventRecord.__new__(EventRecord)
+        for name in self.__slots__:
+            setattr(record, name, getattr(self, name))
+        record.start = start
+        record.end   = end
+        if item_id is not None:
+            record.item_id = item_id
+        return record
+
+    def overlaps(self, start: int, end: int) -> bool:
+        # CalendarView also returns items that end exactly on the range start
+        return self.start < end and self.end >= start
+
+    def local_start(self, timezone):
+        return local_time(self.start, self.all_day, timezone)
+
+    def local_end(self, timezone):
+        return local_time(self.end, self.all_day, timezone)
+
+    def to_json(self) -> List[Any]:
+        """Serialize the record for storage, as a list in slot order."""
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_json(cls, data: List[Any]) -> "EventRecord":
+        return cls(*data)
+
+    def __repr__(self) -> str:
+        return f"EventRecord({self.item_id!r}, {self.subject!r}, {self.start}, {self.end})"
+
+
+def _contains(value: Optional[str], needle: Optional[str]) -> bool:
+    return needle is None or (value is not None and needle in value.lower())
+
+
+class EventFilter:
+    """Matches event records against the optional filters of search_event.
+
+    Text filters are case-insensitive substrings. ``categories`` and
+    ``busy_status`` take lists and match an event carrying any of the values.
+    """
+
+    def __init__(
+        self,
+        subject: Optional[str] = None,
+        location: Optional[str] = None,
+        categories: Optional[Iterable[str]] = None,
+        organizer: Optional[str] = None,
+        busy_status: Optional[Iterable[str]] = None,
+    ):
+        self.subject     = subject.lower() if subject else None
+        self.location    = location.lower() if location else None
+        self.categories  = {category.lower() for category in categories} if categories else None
+        self.organizer   = organizer.lower() if organizer else None
+        self.busy_status = set(busy_status) if busy_status else None
+
+    def __bool__(self) -> bool:
+        return any(
+            value is not None
+            for value in (self.subject, self.location, self.categories, self.organizer, self.busy_status)
+        )
+
+    def matches(self, event: EventRecord) -> bool:
+        if not _contains(event.subject, self.subject) or not _contains(event.location, self.location):
+            return False
+        if not _contains(event.organizer, self.organizer):
+            return False
+        if self.categories is not None and not self.categories.intersection(
+            category.lower() for category in event.categories or ()
+        ):
+            return False
+        return self.busy_status is None or event.busy_status in self.busy_status
+
+
+def _sort_key(event: EventRecord) -> Tuple[int, str]:
+    return event.start, event.item_id
+
+
+def encode_cursor(key: Tuple[int, str]) -> str:
+    """Return an opaque cursor resuming after the event with the given sort key."""
+    return base64.urlsafe_b64encode(f"{key[0]}|{key[1]}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    try:
+        start, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return int(start), item_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise ValueError(f"Invalid cursor: {cursor}") from err
+
+
+def paginate(
+    events: List[EventRecord],
+    limit: Optional[int],
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Tuple[List[EventRecord], Optional[str]]:
+    """Return one page of events and the cursor of the next page, or None on the last page.
+
+    Events are ordered by start and then id. A cursor resumes after the last
+    event of the previous page, so events created or deleted in between do
+    not shift the following pages the way an offset would.
+    """
+    keyed = sorted(((_sort_key(event), event) for event in events), key=lambda pair: pair[0])
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        keyed = [pair for pair in keyed if pair[0] > after]
+    keyed = keyed[offset:]
+    if limit is None or len(keyed) <= limit:
+        return [event for _, event in keyed], None
+    page = keyed[:limit]
+    return [event for _, event in page], encode_cursor(page[-1][0])
@@ -0,0 +1,145 @@
+"""Dedicated bounded executor for blocking exchangelib calls."""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import EwsMetrics, timed_call
+from .throttle import REJECTED_ERRORS, TRANSIENT_ERRORS, RequestThrottle
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EwsExecutor:
+    """Runs the blocking EWS work of one account on its own thread pool.
+
+    A slow or hanging Exchange server can then only tie up this account's
+    threads, never Home Assistant's shared executor. At most ``max_workers``
+    calls run at once; further calls wait in the queue. A call that exceeds
+    its timeout raises ``asyncio.TimeoutError`` to the caller, but keeps its
+    slot until the thread actually returns so the bound always holds.
+
+    With a ``RequestThrottle`` every call first waits for its turn under the
+    account's request budget. Calls Exchange rejected as busy are retried
+    after a jittered exponential delay; other transient failures only when
+    the caller marks the call idempotent, since a write may have been applied
+    before the connection failed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        timeout: Optional[float],
+        metrics: Optional[EwsMetrics] = None,
+        throttle: Optional[RequestThrottle] = None,
+    ):
+        self._pool      = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"exchange_calendar_{name}")
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._timeout   = timeout
+        self._metrics   = metrics
+        self.throttle   = throttle
+        self.max_workers = max_workers
+        self.queued     = 0
+        self.running    = 0
+        self.timeouts   = 0
+
+    @property
+    def available(self) -> bool:
+        """Return False while the circuit breaker refuses calls to Exchange."""
+        return self.throttle is None or self.throttle.available
+
+    async def async_run(
+        self,
+        func: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        operation: Optional[str] = None,
+        idempotent: bool = False,
+    ) -> Any:
+        """Run func(*args) on the pool and return its result.
+
+        The call is recorded in the metrics under operation, or the function's name.
+        """
+        timeout   = timeout if timeout is not None else self._timeout
+        operation = operation or getattr(func, "__name__", "call")
+        stats     = self._metrics.operation(operation) if self._metrics else None
+        attempt   = 0
+        while True:
+            if self.throttle is not None:
+                await self.throttle.async_acquire()
+            try:
+                result = await self._async_call(func, args, timeout, operation, stats)
+            except asyncio.TimeoutError:
+                if self.throttle is not None:
+                    self.throttle.record_failure(asyncio.TimeoutError())
+                raise
+            except TRANSIENT_ERRORS as err:
+                if self.throttle is None:
+                    raise
+                self.throttle.record_failure(err)
+                retryable = idempotent or isinstance(err, REJECTED_ERRORS)
+                if not retryable or attempt >= self.throttle.max_retries or not self.throttle.available:
+                    raise
+                delay = self.throttle.retry_delay(attempt)
+                attempt += 1
+                self.throttle.retries += 1
+                _LOGGER.debug("EWS call %s failed (%s), retry %d in %.1fs", operation, err, attempt, delay)
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                # The server answered, so it is healthy even if the request was not
+                if self.throttle is not None:
+                    self.throttle.record_success()
+                raise
+            if self.throttle is not None:
+                self.throttle.record_success()
+            return result
+
+    async def _async_call(self, func: Callable, args, timeout: Optional[float], operation: str, stats) -> Any:
+        self.queued += 1
+        if self.queued > self.max_workers:
+            _LOGGER.debug("%d EWS calls waiting for a free worker", self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._pool, functools.partial(timed_call, stats, func, *args))
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            # Shielded so a timeout or cancellation does not detach the slot from the running thread
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            if stats is not None:
+                stats.record_timeout()
+            _LOGGER.warning("EWS call %s timed out after %ss", operation, timeout)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current pool usage, and the throttle's state if there is one."""
+        stats = {
+            "max_workers": self.max_workers,
+            "running":     self.running,
+            "queued":      self.queued,
+            "timeouts":    self.timeouts,
+        }
+        if self.throttle is not None:
+            stats.update(self.throttle.stats())
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop accepting work and drop calls that have not started yet."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self) -> None:
+        self.running -= 1
+        self._semaphore.release()
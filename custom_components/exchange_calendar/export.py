@@ -0,0 +1,253 @@
+"""Streaming iCalendar export of calendar ranges."""
+import asyncio
+import hashlib
+import logging
+import os
+from contextlib import suppress
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .cache import timestamp
+from .client import ExchangeCalendarClient
+from .const import DOMAIN
+from .events import EventRecord
+from .planner import month_windows
+from .throttle import ExchangeUnavailable
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+HEADER = b"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Home Assistant//Exchange Calendar//EN\r\nCALSCALE:GREGORIAN\r\n"
+FOOTER = b"END:VCALENDAR\r\n"
+
+# Bytes copied at a time from the previous export for the months that did not change
+COPY_BLOCK_SIZE = 1 << 16
+
+
+def export_key(entry_id: str) -> str:
+    """Return the storage key of the manifests of an entry's exports."""
+    return f"{DOMAIN}.{entry_id}.export"
+
+
+def export_path(hass: HomeAssistant, filename: str) -> str:
+    """Return the absolute path of an export file, which has to stay inside the configuration directory."""
+    config_dir = os.path.realpath(hass.config.config_dir)
+    path       = os.path.realpath(hass.config.path(filename))
+    if path == config_dir or os.path.commonpath([config_dir, path]) != config_dir:
+        raise ValueError(f"The export file must be inside the configuration directory: {filename}")
+    return path
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line into lines of at most 75 octets, never inside a UTF-8 sequence."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while data:
+        cut = min(limit, len(data))
+        while cut < len(data) and data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode())
+        data  = data[cut:]
+        # Continuation lines start with a space, which counts towards their length
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _time(name: str, value: int, all_day: bool, timezone) -> str:
+    if all_day:
+        return f"{name};VALUE=DATE:{datetime.fromtimestamp(value, timezone):%Y%m%d}"
+    return f"{name}:{datetime.fromtimestamp(value, dt_timezone.utc):%Y%m%dT%H%M%SZ}"
+
+
+def vevent(event: EventRecord, body: Optional[str], stamp: str, timezone) -> str:
+    """Render an event record as a VEVENT.
+
+    Every occurrence of a series is its own VEVENT; the UID joins the
+    Exchange item id with the start, since locally expanded occurrences share
+    their master's id.
+    """
+    start = _time("DTSTART", event.start, event.all_day, timezone)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event.item_id}-{start.rpartition(':')[2]}",
+        f"DTSTAMP:{stamp}",
+        start,
+        _time("DTEND", event.end, event.all_day, timezone),
+        f"SUMMARY:{_escape(event.subject or '')}",
+    ]
+    if event.location:
+        lines.append(f"LOCATION:{_escape(event.location)}")
+    if event.categories:
+        lines.append("CATEGORIES:" + ",".join(_escape(category) for category in event.categories))
+    if event.organizer:
+        lines.append(f"ORGANIZER:mailto:{event.organizer}")
+    if event.busy_status:
+        lines.append(f"TRANSP:{'TRANSPARENT' if event.busy_status == 'Free' else 'OPAQUE'}")
+        lines.append(f"X-MICROSOFT-CDO-BUSYSTATUS:{event.busy_status.upper()}")
+    if body:
+        lines.append(f"DESCRIPTION:{_escape(body)}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def _digest(events: List[EventRecord]) -> str:
+    """Fingerprint the events of a month; a change key changes with every edit of its item, body included."""
+    digest = hashlib.sha1()
+    for event in events:
+        digest.update(f"{event.item_id}|{event.changekey}|{event.start}|{event.end}\n".encode())
+    return digest.hexdigest()
+
+
+class _IcsWriter:
+    """Synchronous writer of an export into a temporary file that replaces the export once complete."""
+
+    def __init__(self, path: str, previous: bool):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._path   = path
+        self._temp   = f"{path}.tmp"
+        self._source = open(path, "rb") if previous else None
+        self._file   = open(self._temp, "wb")
+        self._file.write(HEADER)
+        self.size    = len(HEADER)
+
+    def write(self, text: str) -> int:
+        data = text.encode()
+        self._file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def copy(self, offset: int, length: int) -> int:
+        """Copy a month of the previous export, block by block."""
+        self._source.seek(offset)
+        remaining = length
+        while remaining:
+            block = self._source.read(min(COPY_BLOCK_SIZE, remaining))
+            if not block:
+                raise OSError(f"{self._path} is shorter than when it was exported")
+            self._file.write(block)
+            remaining -= len(block)
+        self.size += length
+        return length
+
+    def finish(self) -> None:
+        self._file.write(FOOTER)
+        self.size += len(FOOTER)
+        self._close()
+        os.replace(self._temp, self._path)
+
+    def abort(self) -> None:
+        self._close()
+        with suppress(OSError):
+            os.remove(self._temp)
+
+    def _close(self) -> None:
+        self._file.close()
+        if self._source is not None:
+            self._source.close()
+
+
+def _size(path: str) -> Optional[int]:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class CalendarExporter:
+    """Writes calendar ranges to iCalendar files one month at a time.
+
+    Each month is read through the client, so the mirror, the cache and the
+    chunked CalendarView all apply, rendered and appended to the file before
+    the next one is read; only one month of events and bodies is held at a
+    time. The file is written next to the target and moved over it when
+    complete.
+
+    A manifest of every export keeps each month's fingerprint and position in
+    the file. An incremental export reuses the bytes of the months whose
+    events did not change, so their bodies are not loaded and their events
+    not rendered again, and falls back to a full export when the previous
+    file or its options do not match.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: ExchangeCalendarClient, timezone, storage_key: str):
+        self._hass     = hass
+        self._client   = client
+        self._timezone = timezone
+        self._store    = Store(hass, STORAGE_VERSION, storage_key)
+        self._lock     = asyncio.Lock()
+
+    async def async_export(
+        self, path: str, start: datetime, end: datetime, include_body: bool = False, incremental: bool = False
+    ) -> Dict[str, Any]:
+        """Export the events starting in [start, end), and those already running at start, to path."""
+        async with self._lock:
+            manifests = await self._store.async_load() or {}
+            previous  = manifests.get(path) if incremental else None
+            if previous is not None and (
+                previous["include_body"] != include_body
+                or await self._hass.async_add_executor_job(_size, path) != previous["size"]
+            ):
+                _LOGGER.info("%s does not match its last export, exporting every month", path)
+                previous = None
+            old_months = previous["months"] if previous is not None else {}
+
+            await self._client.async_refresh(force=True)
+            stamp   = dt_util.utcnow().strftime("%Y%m%dT%H%M%SZ")
+            writer  = await self._hass.async_add_executor_job(_IcsWriter, path, previous is not None)
+            months  = {}
+            total   = 0
+            written = 0
+            try:
+                for window_start, window_end in month_windows(start, end, self._timezone):
+                    events = await self._client.async_get_events(window_start, window_end)
+                    if not self._client.online:
+                        # The client answered from whatever it had locally, which may be incomplete
+                        raise ExchangeUnavailable("Exchange became unavailable during the export")
+                    # Each event goes into the month it starts in; the first month also takes those running into the range
+                    first  = timestamp(window_start)
+                    events = [
+                        event for event in events
+                        if event.start >= first or (window_start == start and event.end > first)
+                    ]
+                    events.sort(key=lambda event: (event.start, event.item_id))
+
+                    key    = f"{window_start.isoformat()}/{window_end.isoformat()}"
+                    digest = _digest(events)
+                    offset = writer.size
+                    old    = old_months.get(key)
+                    if old is not None and old[0] == digest:
+                        length = await self._hass.async_add_executor_job(writer.copy, old[1], old[2])
+                    else:
+                        bodies = await self._client.async_load_bodies(events) if include_body else {}
+                        if not self._client.online:
+                            raise ExchangeUnavailable("Exchange became unavailable during the export")
+                        text   = "".join(
+                            vevent(event, bodies.get(event.item_id), stamp, self._timezone) for event in events
+                        )
+                        length = await self._hass.async_add_executor_job(writer.write, text)
+                        written += 1
+                    months[key] = [digest, offset, length]
+                    total += len(events)
+                await self._hass.async_add_executor_job(writer.finish)
+            except BaseException:
+                await self._hass.async_add_executor_job(writer.abort)
+                raise
+
+            manifests[path] = {"include_body": include_body, "size": writer.size, "months": months}
+            await self._store.async_save(manifests)
+            _LOGGER.info("Exported %d events to %s, %d of %d months rewritten", total, path, written, len(months))
+            return {"path": path, "events": total, "months": len(months), "rewritten": written}
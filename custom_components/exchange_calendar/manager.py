@@ -0,0 +1,203 @@
+"""Exchange connections shared by the config entries and the config flow."""
+import logging
+import time
+from contextlib import suppress
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from exchangelib import Account, Configuration, Credentials, DELEGATE
+from exchangelib.protocol import Protocol
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .connection import ExchangeConnection
+from .const import DATA_CONNECTIONS, KEEPALIVE_CHECK_INTERVAL, PROBE_TTL
+from .executor import EwsExecutor
+from .metrics import install_http_adapter, seconds_since_request
+
+_LOGGER = logging.getLogger(__name__)
+
+# (server, email, password, auth_type)
+ConnectionKey = Tuple[str, str, str, str]
+
+
+def connection_key(server: str, email: str, password: str, auth_type: str) -> ConnectionKey:
+    return server.strip().lower(), email.strip().lower(), password, auth_type
+
+
+def _configuration(key: ConnectionKey, max_connections: int) -> Configuration:
+    server, email, password, auth_type = key
+    return Configuration(
+        server=server,
+        credentials=Credentials(username=email, password=password),
+        auth_type=auth_type,
+        max_connections=max_connections,
+    )
+
+
+def _forget_protocol(config: Configuration) -> None:
+    """Drop the protocol exchangelib cached for the configuration, or the error it cached instead."""
+    with suppress(KeyError):
+        del Protocol[config]
+
+
+class SharedConnection:
+    """One connection and its HTTP session pool, and the entries holding it."""
+
+    def __init__(self, connection: ExchangeConnection, executor: EwsExecutor, config: Configuration):
+        self.connection = connection
+        self.executor   = executor
+        self.config     = config
+        # entry id -> (max_connections, keepalive) asked for by that entry's options
+        self.holders: Dict[str, Tuple[int, int]] = {}
+
+    @property
+    def max_connections(self) -> int:
+        return max(max_connections for max_connections, _ in self.holders.values())
+
+    @property
+    def keepalive(self) -> int:
+        return max(keepalive for _, keepalive in self.holders.values())
+
+    def apply_pool_size(self) -> None:
+        """Resize the session pool to the largest size any holder asked for."""
+        self.config.max_connections = self.max_connections
+        if self.connection.ready:
+            self.connection.account.protocol.max_connections = self.max_connections
+
+    def stats(self) -> Dict[str, Any]:
+        protocol = self.connection.account.protocol if self.connection.ready else None
+        return {
+            "entries":         len(self.holders),
+            "max_connections": self.max_connections,
+            "keepalive":       self.keepalive,
+            "open_sessions":   protocol.session_pool_size if protocol else 0,
+        }
+
+
+class ConnectionManager:
+    """Hands out one connection per server and credentials to every entry that uses them.
+
+    exchangelib already caches a protocol, and with it the HTTP sessions, per
+    endpoint and credentials, but each entry used to build its own Account
+    and the default pool holds a single session. The manager connects once,
+    sizes the pool from the entries' options and keeps it until the last
+    entry using it is unloaded, when the sessions are closed and the protocol
+    is dropped from exchangelib's cache.
+
+    The account the config flow connected to validate the input is kept for
+    ``PROBE_TTL`` seconds, so setting up the new entry does not connect again.
+    Sessions idle for longer than the keep-alive are closed and reopened on
+    the next call.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._shared: Dict[ConnectionKey, SharedConnection] = {}
+        # key -> (account connected by the config flow, monotonic time it connected)
+        self._probed: Dict[ConnectionKey, Tuple[Account, float]] = {}
+        self._unsub_keepalive: Optional[Callable[[], None]] = None
+
+    async def async_probe(self, key: ConnectionKey, max_connections: int) -> Account:
+        """Connect to validate config flow input, keeping the account for the entry's setup."""
+        install_http_adapter()
+        self._prune_probes()
+        config = _configuration(key, max_connections)
+        try:
+            account = await self._hass.async_add_executor_job(self._connect, key, config)
+        except Exception:
+            # exchangelib caches a failed endpoint for good, which would fail the corrected input too
+            _forget_protocol(config)
+            raise
+        self._probed[key] = account, time.monotonic()
+        return account
+
+    async def async_acquire(
+        self, entry_id: str, key: ConnectionKey, max_connections: int, keepalive: int, call_timeout: float
+    ) -> ExchangeConnection:
+        """Return the connection for the key, connecting in the background if no entry holds it yet."""
+        install_http_adapter()
+        self._prune_probes()
+        shared = self._shared.get(key)
+        if shared is None:
+            # Connecting and closing only; each entry runs its own calls on its own executor
+            config     = _configuration(key, max_connections)
+            executor   = EwsExecutor(f"connect_{key[1]}", 1, call_timeout)
+            connection = ExchangeConnection(self._hass, executor, key[1], config)
+            shared = self._shared[key] = SharedConnection(connection, executor, config)
+            probed = self._probed.pop(key, None)
+            if probed is not None:
+                _LOGGER.debug("Reusing the account connected by the config flow for %s", key[1])
+                connection.adopt(probed[0])
+            else:
+                connection.start()
+        shared.holders[entry_id] = max_connections, keepalive
+        shared.apply_pool_size()
+        if self._unsub_keepalive is None:
+            self._unsub_keepalive = async_track_time_interval(
+                self._hass, self._async_close_idle, timedelta(seconds=KEEPALIVE_CHECK_INTERVAL)
+            )
+        return shared.connection
+
+    async def async_release(self, entry_id: str, key: ConnectionKey) -> None:
+        """Let go of an entry's hold, closing the connection once no entry holds it."""
+        shared = self._shared.get(key)
+        if shared is None or shared.holders.pop(entry_id, None) is None:
+            return
+        if shared.holders:
+            shared.apply_pool_size()
+            return
+        del self._shared[key]
+        await shared.connection.async_stop()
+        try:
+            await shared.executor.async_run(self._close, shared, operation="close")
+        except Exception as err:
+            _LOGGER.debug("Failed to close the sessions to %s: %s", key[0], err)
+        shared.executor.shutdown()
+        if not self._shared and self._unsub_keepalive is not None:
+            self._unsub_keepalive()
+            self._unsub_keepalive = None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [shared.stats() for shared in self._shared.values()]
+
+    @staticmethod
+    def _connect(key: ConnectionKey, config: Configuration) -> Account:
+        return Account(primary_smtp_address=key[1], config=config, autodiscover=False, access_type=DELEGATE)
+
+    @staticmethod
+    def _close(shared: SharedConnection) -> None:
+        if shared.connection.ready:
+            shared.connection.account.protocol.close()
+        _forget_protocol(shared.config)
+
+    def _prune_probes(self) -> None:
+        now = time.monotonic()
+        for key, (_, connected_at) in list(self._probed.items()):
+            if now - connected_at > PROBE_TTL:
+                del self._probed[key]
+
+    async def _async_close_idle(self, *_) -> None:
+        """Close the idle sessions of pools not used for longer than their keep-alive."""
+        self._prune_probes()
+        for shared in list(self._shared.values()):
+            if not shared.connection.ready:
+                continue
+            protocol = shared.connection.account.protocol
+            idle     = seconds_since_request(protocol.service_endpoint)
+            if idle is None or idle < shared.keepalive or not protocol.session_pool_size:
+                continue
+            _LOGGER.debug("Closing sessions to %s after %ds idle", protocol.server, idle)
+            try:
+                await shared.executor.async_run(protocol.close, operation="close_idle")
+            except Exception as err:
+                _LOGGER.debug("Failed to close the idle sessions to %s: %s", protocol.server, err)
+
+
+@callback
+def async_get_manager(hass: HomeAssistant) -> ConnectionManager:
+    """Return the domain's connection manager, creating it on first use."""
+    manager = hass.data.get(DATA_CONNECTIONS)
+    if manager is None:
+        manager = hass.data[DATA_CONNECTIONS] = ConnectionManager(hass)
+    return manager
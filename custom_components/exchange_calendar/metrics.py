@@ -0,0 +1,195 @@
+"""Timing and counters for the integration's EWS calls."""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from exchangelib.errors import ErrorServerBusy, ErrorTooManyObjectsOpened
+from exchangelib.protocol import BaseProtocol
+
+from .const import METRICS_LATENCY_BUCKETS
+
+THROTTLE_ERRORS = (ErrorServerBusy, ErrorTooManyObjectsOpened)
+
+# Stats of the EWS call running on the current executor thread, for the HTTP adapter
+_current = threading.local()
+# Service endpoint -> monotonic time its last request was sent, whichever entry sent it
+_last_request: Dict[str, float] = {}
+
+
+class OperationStats:
+    """Counters and a latency histogram for one kind of EWS call."""
+
+    def __init__(self, lock: threading.Lock):
+        self._lock          = lock
+        self.calls          = 0
+        self.errors         = 0
+        self.throttled      = 0
+        self.timeouts       = 0
+        self.items          = 0
+        self.item_errors    = 0
+        self.bytes_sent     = 0
+        self.bytes_received = 0
+        self.total_time     = 0.0
+        self.max_time       = 0.0
+        # One count per METRICS_LATENCY_BUCKETS upper bound, plus one for slower calls
+        self.buckets        = [0] * (len(METRICS_LATENCY_BUCKETS) + 1)
+
+    def record(self, duration: float, result: Any = None, error: Optional[BaseException] = None) -> None:
+        """Record one finished call, with its result or the exception it raised."""
+        with self._lock:
+            self.calls      += 1
+            self.total_time += duration
+            self.max_time    = max(self.max_time, duration)
+            self.buckets[bisect.bisect_left(METRICS_LATENCY_BUCKETS, duration)] += 1
+            if isinstance(result, tuple) and result and isinstance(result[0], list):
+                # Sync calls return the changes together with the new sync state
+                result = result[0]
+            if error is not None:
+                self.errors += 1
+                if isinstance(error, THROTTLE_ERRORS):
+                    self.throttled += 1
+            elif isinstance(result, (list, dict)):
+                self.items += len(result)
+                if isinstance(result, list):
+                    # Bulk operations return one exception per failed item instead of raising
+                    for value in result:
+                        if isinstance(value, Exception):
+                            self.item_errors += 1
+                            if isinstance(value, THROTTLE_ERRORS):
+                                self.throttled += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_bytes(self, sent: int, received: int) -> None:
+        with self._lock:
+            self.bytes_sent     += sent
+            self.bytes_received += received
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return the upper bound of the histogram bucket holding the given fraction of calls, capped at the slowest call."""
+        if not self.calls:
+            return None
+        rank  = fraction * self.calls
+        total = 0
+        for bound, count in zip(METRICS_LATENCY_BUCKETS, self.buckets):
+            total += count
+            if total >= rank:
+                return min(bound, self.max_time)
+        return self.max_time
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls":          self.calls,
+                "errors":         self.errors,
+                "throttled":      self.throttled,
+                "timeouts":       self.timeouts,
+                "items":          self.items,
+                "item_errors":    self.item_errors,
+                "bytes_sent":     self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "mean_time":      self.total_time / self.calls if self.calls else None,
+                "p50_time":       self.percentile(0.5),
+                "p95_time":       self.percentile(0.95),
+                "max_time":       self.max_time,
+                "histogram":      {
+                    str(bound): count for bound, count in zip(METRICS_LATENCY_BUCKETS + ("+Inf",), self.buckets)
+                },
+            }
+
+
+class EwsMetrics:
+    """Per-operation EWS statistics of one config entry.
+
+    ``EwsExecutor`` records every call it runs under the operation name it was
+    given. Calls are timed on the worker thread, so queueing for a free worker
+    is not counted as Exchange latency. Bytes are counted by the HTTP adapter
+    installed with ``install_http_adapter``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.operations: Dict[str, OperationStats] = {}
+
+    def operation(self, name: str) -> OperationStats:
+        """Return the stats of an operation, creating them on first use."""
+        with self._lock:
+            stats = self.operations.get(name)
+            if stats is None:
+                stats = self.operations[name] = OperationStats(self._lock)
+            return stats
+
+    def items(self) -> List[Tuple[str, OperationStats]]:
+        """Return (name, stats) of every operation seen so far, sorted by name."""
+        with self._lock:
+            return sorted(self.operations.items())
+
+    def total(self, field: str) -> int:
+        """Return a counter summed over all operations."""
+        return sum(getattr(stats, field) for _, stats in self.items())
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.as_dict() for name, stats in self.items()}
+
+
+@contextmanager
+def metered(stats: Optional[OperationStats]):
+    """Attribute the HTTP traffic of the current thread to stats while the block runs."""
+    previous, _current.stats = getattr(_current, "stats", None), stats
+    try:
+        yield
+    finally:
+        _current.stats = previous
+
+
+def timed_call(stats: Optional[OperationStats], func, *args):
+    """Run func(*args) on the calling thread, recording it in stats."""
+    if stats is None:
+        return func(*args)
+    started = time.monotonic()
+    with metered(stats):
+        try:
+            result = func(*args)
+        except Exception as err:
+            stats.record(time.monotonic() - started, error=err)
+            raise
+    stats.record(time.monotonic() - started, result=result)
+    return result
+
+
+class _MeteredAdapterMixin:
+    """Counts request and response sizes for the EWS call running on the current thread.
+
+    Also notes when each endpoint was last used, so idle sessions can be closed.
+    """
+
+    def send(self, request, **kwargs):
+        _last_request[request.url] = time.monotonic()
+        response = super().send(request, **kwargs)
+        stats = getattr(_current, "stats", None)
+        if stats is not None:
+            body = request.body or b""
+            if kwargs.get("stream"):
+                # Reading a streamed body here would consume it, so trust the header
+                received = int(response.headers.get("Content-Length") or 0)
+            else:
+                received = len(response.content)
+            stats.record_bytes(len(body), received)
+        return response
+
+
+def seconds_since_request(service_endpoint: str) -> Optional[float]:
+    """Return how long ago a request was last sent to the endpoint, or None if none was seen."""
+    sent = _last_request.get(service_endpoint)
+    return time.monotonic() - sent if sent is not None else None
+
+
+def install_http_adapter() -> None:
+    """Make exchangelib sessions count their traffic; sessions created before this are not counted."""
+    adapter_cls = BaseProtocol.HTTP_ADAPTER_CLS
+    if not issubclass(adapter_cls, _MeteredAdapterMixin):
+        BaseProtocol.HTTP_ADAPTER_CLS = type(f"Metered{adapter_cls.__name__}", (_MeteredAdapterMixin, adapter_cls), {})
@@ -0,0 +1,383 @@
+"""Write-behind queue for the create, edit and delete services."""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from exchangelib import CalendarItem
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .bulk import async_bulk, indexed_item, item_reference
+from .client import ExchangeCalendarClient
+from .connection import ExchangeConnection, ExchangeNotConnected
+from .const import (
+    DOMAIN,
+    DEFAULT_BULK_CHUNK_SIZE,
+    DEFAULT_CALL_TIMEOUT,
+    EVENT_MUTATION_RESULT,
+    IDEMPOTENCY_KEY_TTL,
+    RECONNECT_BACKOFF_MAX,
+    WRITE_BEHIND_DELAY,
+)
+from .executor import EwsExecutor
+from .sync import CalendarSync
+from .throttle import TRANSIENT_ERRORS, ExchangeUnavailable
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+UPSERT = "upsert"
+EDIT   = "edit"
+DELETE = "delete"
+
+# Failures that say nothing about the change itself; the change stays queued and is sent again later
+RETRY_ERRORS = TRANSIENT_ERRORS + (ExchangeUnavailable, ExchangeNotConnected, asyncio.TimeoutError)
+
+
+def queue_key(entry_id: str) -> str:
+    """Return the storage key of a config entry's queued changes."""
+    return f"{DOMAIN}.{entry_id}.mutations"
+
+
+def _encode(fields: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: value.isoformat() if isinstance(value, datetime) else value for name, value in fields.items()}
+
+
+def _targets(mutation: Dict[str, Any]) -> Set[str]:
+    """Return what a change looks its event up by: lower-cased subjects, or the id of the event to delete."""
+    if mutation["kind"] == DELETE:
+        return {mutation["item_id"]}
+    targets = {mutation["subject"].lower()}
+    if "subject" in mutation["fields"]:
+        targets.add(mutation["fields"]["subject"].lower())
+    return targets
+
+
+def _conflicts(targets: Set[str], seen: Set[str]) -> bool:
+    # Edits match subjects by substring, so a subject containing another may name the same event
+    return any(target in other or other in target for target in targets for other in seen)
+
+
+class MutationQueue:
+    """Persisted queue of calendar changes, written to Exchange in the background.
+
+    Queued service calls return as soon as the change is stored. Changes are
+    written ``WRITE_BEHIND_DELAY`` seconds later, so a burst of calls goes out
+    together: one sync to resolve subjects through the local mirror, then one
+    bulk CreateItem, UpdateItem and DeleteItem request each. A change to an
+    event that already has a change waiting is folded into it, so several
+    edits in a row cost a single save of the union of their fields.
+
+    Every change gets an id, and callers may pass an idempotency key: a key
+    seen within ``IDEMPOTENCY_KEY_TTL`` seconds is not queued again. The
+    outcome of each change is fired as an ``EVENT_MUTATION_RESULT`` event.
+    Changes that fail for transient reasons stay queued and are retried with
+    backoff, also across restarts.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        connection: ExchangeConnection,
+        executor: EwsExecutor,
+        client: ExchangeCalendarClient,
+        sync: CalendarSync,
+        timezone,
+        storage_key: str,
+    ):
+        self._hass       = hass
+        self._entry_id   = entry_id
+        self._connection = connection
+        self._executor   = executor
+        self._client     = client
+        self._sync       = sync
+        self._timezone   = timezone
+        self._store      = Store(hass, STORAGE_VERSION, storage_key)
+        self._pending: List[Dict[str, Any]] = []
+        # Idempotency key -> id of the change it queued and when that change was written
+        self._completed: Dict[str, Dict[str, Any]] = {}
+        # Ids of the changes being written, which later calls must not fold into
+        self._in_flight: Set[str] = set()
+        self._lock       = asyncio.Lock()
+        self._unsub_flush: Optional[CALLBACK_TYPE] = None
+        self._stopped    = False
+        self._retry_delay = WRITE_BEHIND_DELAY
+        self.coalesced   = 0
+        self.written     = 0
+        self.failed      = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def async_load(self) -> None:
+        """Restore the changes left queued by the previous run."""
+        data = await self._store.async_load()
+        if data:
+            self._pending   = data.get("pending", [])
+            self._completed = data.get("completed", {})
+
+    async def async_enqueue(
+        self, kind: str, subject: Optional[str] = None, fields: Optional[Dict[str, Any]] = None,
+        item_id: Optional[str] = None, window: Optional[List[datetime]] = None, idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Queue a change and return the service response for it."""
+        self._prune_completed()
+        if idempotency_key is not None:
+            if idempotency_key in self._completed:
+                return {
+                    "success": True, "queued": False, "duplicate": True,
+                    "mutation_id": self._completed[idempotency_key]["mutation_id"],
+                }
+            for mutation in self._pending:
+                if idempotency_key in mutation["keys"]:
+                    return {"success": True, "queued": True, "duplicate": True, "mutation_id": mutation["id"]}
+
+        mutation = {
+            "id":        uuid.uuid4().hex,
+            "keys":      [idempotency_key] if idempotency_key is not None else [],
+            "kind":      kind,
+            "subject":   subject,
+            "item_id":   item_id,
+            "window":    [value.isoformat() for value in window] if window else None,
+            "fields":    _encode(fields or {}),
+            "queued_at": dt_util.utcnow().isoformat(),
+        }
+        target = self._coalesce_target(mutation)
+        if target is not None:
+            if kind == UPSERT:
+                target["subject"] = subject
+                target["fields"]  = mutation["fields"]
+            else:
+                target["fields"].update(mutation["fields"])
+            target["keys"].extend(mutation["keys"])
+            self.coalesced += 1
+            mutation = target
+        else:
+            self._pending.append(mutation)
+
+        await self._async_save()
+        self.schedule()
+        return {"success": True, "queued": True, "coalesced": target is not None, "mutation_id": mutation["id"]}
+
+    @callback
+    def schedule(self, delay: float = WRITE_BEHIND_DELAY) -> None:
+        """Write the queued changes after delay seconds, unless a write is already scheduled."""
+        if self._pending and self._unsub_flush is None and not self._stopped:
+            self._unsub_flush = async_call_later(self._hass, delay, self.async_flush)
+
+    async def async_stop(self) -> None:
+        """Stop scheduled writes; what is still queued is written after the next start."""
+        self._stopped = True
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        # A batch being written finishes first; the entry shuts its executor down only once this returns
+        async with self._lock:
+            await self._async_save()
+
+    async def async_flush(self, *_) -> None:
+        """Write the queued changes, in batches whose changes cannot affect each other."""
+        self._unsub_flush = None
+        async with self._lock:
+            while self._pending and not self._stopped:
+                batch = self._next_batch()
+                self._in_flight = {mutation["id"] for mutation in batch}
+                try:
+                    results = await self._async_write(batch)
+                except Exception as err:
+                    results = [err] * len(batch)
+                finally:
+                    self._in_flight = set()
+
+                retry = [mutation for mutation, result in zip(batch, results) if isinstance(result, RETRY_ERRORS)]
+                done  = {mutation["id"] for mutation in batch} - {mutation["id"] for mutation in retry}
+                for mutation, result in zip(batch, results):
+                    if mutation["id"] in done:
+                        self._report(mutation, result)
+                self._pending = [mutation for mutation in self._pending if mutation["id"] not in done]
+                await self._async_save()
+
+                if retry:
+                    _LOGGER.warning(
+                        "Failed to write %d queued calendar changes, retrying in %ss: %s",
+                        len(retry), self._retry_delay, next(r for r in results if isinstance(r, RETRY_ERRORS)),
+                    )
+                    self.schedule(self._retry_delay)
+                    self._retry_delay = min(self._retry_delay * 2, RECONNECT_BACKOFF_MAX)
+                    return
+                self._retry_delay = WRITE_BEHIND_DELAY
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending":   len(self._pending),
+            "coalesced": self.coalesced,
+            "written":   self.written,
+            "failed":    self.failed,
+        }
+
+    def _coalesce_target(self, mutation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the waiting change the new one can be folded into, if any."""
+        for queued in reversed(self._pending):
+            if queued["id"] in self._in_flight:
+                # The changes being written are the head of the queue, so nothing before them is left
+                return None
+            if queued["kind"] == mutation["kind"] and self._same_event(queued, mutation):
+                return queued
+            if _conflicts(_targets(queued), _targets(mutation)):
+                # Folding into an earlier change would reorder the new one around this one
+                return None
+        return None
+
+    @staticmethod
+    def _same_event(queued: Dict[str, Any], mutation: Dict[str, Any]) -> bool:
+        if mutation["kind"] == DELETE:
+            return queued["item_id"] == mutation["item_id"]
+        if queued["subject"].lower() != mutation["subject"].lower() or queued["window"] != mutation["window"]:
+            return False
+        # After a rename the edit no longer finds the event by the subject it was queued with
+        return mutation["kind"] == UPSERT or "subject" not in queued["fields"]
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        seen: Set[str] = set()
+        for mutation in self._pending:
+            targets = _targets(mutation)
+            if batch and _conflicts(targets, seen):
+                break
+            batch.append(mutation)
+            seen |= targets
+        return batch
+
+    async def _async_write(self, batch: List[Dict[str, Any]]) -> List[Any]:
+        """Write a batch and return a result dict or exception per change."""
+        account = await self._connection.async_get_account(DEFAULT_CALL_TIMEOUT)
+        # One forced sync brings the mirror up to date for every lookup of the batch
+        await self._client.async_refresh(force=True)
+        now     = datetime.now(tz=self._timezone)
+        results: List[Any] = [None] * len(batch)
+        found: Dict[int, Optional[List[Any]]] = {}
+        for index, mutation in enumerate(batch):
+            if mutation["kind"] != DELETE:
+                start, end   = self._window(mutation, now)
+                found[index] = self._sync.find_by_subject(
+                    mutation["subject"], start, end, exact=mutation["kind"] == UPSERT
+                )
+
+        # The mirror cannot answer when a recurring series matches, so those go to CalendarView
+        unresolved = [index for index, matches in found.items() if matches is None]
+        if unresolved:
+            views = await self._executor.async_run(
+                self._find_by_view, account, [batch[index] for index in unresolved], now,
+                operation="find_queued", idempotent=True,
+            )
+            found.update(zip(unresolved, views))
+
+        creates, updates, deletes = [], [], []
+        for index, mutation in enumerate(batch):
+            if mutation["kind"] == DELETE:
+                deletes.append((index, item_reference(mutation["item_id"])))
+                continue
+            matches = [
+                match if isinstance(match, CalendarItem) else indexed_item(account, match) for match in found[index]
+            ]
+            fields  = self._decode(mutation["fields"])
+            if mutation["kind"] == UPSERT and not matches:
+                creates.append((index, CalendarItem(
+                    account=account, folder=account.calendar, subject=mutation["subject"], **fields
+                )))
+            elif not matches:
+                results[index] = ValueError(f"No event found matching subject: '{mutation['subject']}'")
+            elif mutation["kind"] == EDIT and len(matches) > 1:
+                results[index] = ValueError(
+                    f"Multiple events matched '{mutation['subject']}': {[e.subject for e in matches]}. Use a more specific subject."
+                )
+            else:
+                item = matches[0]
+                for name, value in fields.items():
+                    setattr(item, name, value)
+                updates.append((index, (item, list(fields))))
+
+        for writes, func, operation, action in (
+            (creates, lambda chunk: account.bulk_create(folder=account.calendar, items=chunk, chunk_size=DEFAULT_BULK_CHUNK_SIZE), "queued_create", "created"),
+            (updates, lambda chunk: account.bulk_update(items=chunk, chunk_size=DEFAULT_BULK_CHUNK_SIZE), "queued_update", "updated"),
+            (deletes, lambda chunk: account.bulk_delete(ids=chunk, chunk_size=DEFAULT_BULK_CHUNK_SIZE), "queued_delete", "deleted"),
+        ):
+            if not writes:
+                continue
+            written = await async_bulk(self._executor, func, [payload for _, payload in writes], operation)
+            for (index, payload), result in zip(writes, written):
+                if isinstance(result, Exception):
+                    results[index] = result
+                elif action == "created":
+                    results[index] = {"action": action, "item_id": result.id}
+                elif action == "updated":
+                    results[index] = {"action": action, "item_id": payload[0].id}
+                else:
+                    results[index] = {"action": action, "item_id": batch[index]["item_id"]}
+
+        if creates or updates or deletes:
+            await self._client.async_mutated()
+        return results
+
+    def _window(self, mutation: Dict[str, Any], now: datetime):
+        if mutation["window"]:
+            return [dt_util.parse_datetime(value).astimezone(self._timezone) for value in mutation["window"]]
+        # The ranges the direct services search by default, taken at write time so repeated calls fold together
+        if mutation["kind"] == UPSERT:
+            return now, now + timedelta(days=730)
+        return now - timedelta(days=365), now + timedelta(days=365)
+
+    def _decode(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            name: dt_util.parse_datetime(value).astimezone(self._timezone) if name in ("start", "end") else value
+            for name, value in fields.items()
+        }
+
+    def _find_by_view(self, account, mutations: List[Dict[str, Any]], now: datetime) -> List[List[CalendarItem]]:
+        """Synchronously look changes' events up by subject with CalendarView, as the direct services do."""
+        found = []
+        for mutation in mutations:
+            start, end = self._window(mutation, now)
+            needle     = mutation["subject"].lower()
+            events     = account.calendar.view(start=start, end=end).only("subject")
+            if mutation["kind"] == UPSERT:
+                found.append([e for e in events if e.subject and e.subject.lower() == needle])
+            else:
+                found.append([e for e in events if e.subject and needle in e.subject.lower()])
+        return found
+
+    def _report(self, mutation: Dict[str, Any], result: Any) -> None:
+        data = {
+            "entry_id":    self._entry_id,
+            "mutation_id": mutation["id"],
+            "keys":        mutation["keys"],
+            "kind":        mutation["kind"],
+            "subject":     mutation["subject"],
+        }
+        if isinstance(result, Exception):
+            self.failed += 1
+            _LOGGER.error("Failed to write queued %s of '%s': %s", mutation["kind"], mutation["subject"] or mutation["item_id"], result)
+            data.update({"success": False, "error": str(result), "item_id": mutation["item_id"]})
+        else:
+            self.written += 1
+            data.update({"success": True, **result})
+        completed_at = dt_util.utcnow().isoformat()
+        for key in mutation["keys"]:
+            self._completed[key] = {"mutation_id": mutation["id"], "at": completed_at}
+        self._hass.bus.async_fire(EVENT_MUTATION_RESULT, data)
+
+    def _prune_completed(self) -> None:
+        horizon = dt_util.utcnow() - timedelta(seconds=IDEMPOTENCY_KEY_TTL)
+        self._completed = {
+            key: done for key, done in self._completed.items() if dt_util.parse_datetime(done["at"]) >= horizon
+        }
+
+    async def _async_save(self) -> None:
+        await self._store.async_save({"pending": self._pending, "completed": self._completed})
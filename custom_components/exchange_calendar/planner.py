@@ -0,0 +1,39 @@
+"""Split long calendar ranges into bounded CalendarView windows."""
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from .const import DEFAULT_CHUNK_MAX_DAYS
+
+
+def plan_windows(start: datetime, end: datetime, timezone) -> List[Tuple[datetime, datetime]]:
+    """Return the windows to fetch for [start, end).
+
+    Ranges up to DEFAULT_CHUNK_MAX_DAYS are fetched whole. Longer ranges are
+    cut on local month boundaries, which keeps every request well inside
+    Exchange's CalendarView limits and lets the chunks be fetched concurrently.
+    """
+    if end - start <= timedelta(days=DEFAULT_CHUNK_MAX_DAYS):
+        return [(start, end)]
+    return month_windows(start, end, timezone)
+
+
+def month_windows(start: datetime, end: datetime, timezone) -> List[Tuple[datetime, datetime]]:
+    """Cut [start, end) on local month boundaries."""
+    windows = []
+    cursor  = start
+    while cursor < end:
+        local = cursor.astimezone(timezone)
+        if local.month == 12:
+            boundary = datetime(local.year + 1, 1, 1, tzinfo=timezone)
+        else:
+            boundary = datetime(local.year, local.month + 1, 1, tzinfo=timezone)
+        window_end = min(boundary, end)
+        windows.append((cursor, window_end))
+        cursor = window_end
+    return windows
+
+
+def split_window(start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+    """Halve a window whose CalendarView result hit the item limit."""
+    middle = start + (end - start) / 2
+    return [(start, middle), (middle, end)]
@@ -0,0 +1,192 @@
+"""Local expansion of recurring series from their pattern and exceptions."""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from exchangelib import CalendarItem
+from exchangelib.recurrence import DailyPattern, EndDatePattern, NoEndPattern, NumberedPattern, WeeklyPattern
+
+from .cache import timestamp
+from .const import EVENT_FIELDS
+from .events import EventRecord, occurrence_id, to_timestamp
+
+# exchangelib keeps an item's time zones in internal fields, which it only names through timezone_fields()
+_, START_TIMEZONE_FIELD, _ = CalendarItem.timezone_fields()
+
+# Master fields describing the series, fetched in the GetItem that already asks for the last occurrence
+SERIES_FIELDS = ["recurrence", "modified_occurrences", "deleted_occurrences", START_TIMEZONE_FIELD.name]
+# Version of the serialized form of series, stored with the mirror
+SERIES_VERSION = 1
+
+DAILY  = "daily"
+WEEKLY = "weekly"
+
+
+def _series(recurrence) -> Optional[Dict[str, Any]]:
+    """Return the plain pattern of a recurrence, or None for the patterns expanded by Exchange only."""
+    pattern, boundary = recurrence.pattern, recurrence.boundary
+    if isinstance(pattern, DailyPattern):
+        series = {"pattern": DAILY, "interval": pattern.interval}
+    elif isinstance(pattern, WeeklyPattern):
+        weekdays = pattern.weekdays if isinstance(pattern.weekdays, list) else [pattern.weekdays]
+        # Besides ISO weekdays EWS knows Day, Weekday and WeekendDay, which are left to Exchange
+        if not weekdays or not all(isinstance(weekday, int) and 1 <= weekday <= 7 for weekday in weekdays):
+            return None
+        series = {
+            "pattern":           WEEKLY,
+            "interval":          pattern.interval,
+            "weekdays":          sorted(set(weekdays)),
+            "first_day_of_week": pattern.first_day_of_week or 1,
+        }
+    else:
+        return None
+
+    if not isinstance(boundary, (NoEndPattern, EndDatePattern, NumberedPattern)):
+        return None
+    first = boundary.start
+    until = boundary.end if isinstance(boundary, EndDatePattern) else None
+    series.update({
+        "first": first.date() if isinstance(first, datetime) else first,
+        "until": until.date() if isinstance(until, datetime) else until,
+        "count": boundary.number if isinstance(boundary, NumberedPattern) else None,
+    })
+    return series
+
+
+def _zone_key(master) -> Optional[str]:
+    """Return the IANA key of the zone a series was created in, or None to fall back to the entry's zone."""
+    key = getattr(getattr(master, START_TIMEZONE_FIELD.name, None), "key", None)
+    if not key:
+        return None
+    try:
+        ZoneInfo(key)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+    return key
+
+
+def fetch_series(account, masters, timezone) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Synchronously return master id -> series of masters fetched with SERIES_FIELDS.
+
+    The modified occurrences of all masters are loaded in one GetItem and
+    kept as [original start, record] pairs. A series is None when its pattern
+    is not expanded locally or one of its exceptions could not be loaded,
+    which leaves it to CalendarView.
+    """
+    series: Dict[str, Optional[Dict[str, Any]]] = {}
+    modified = []
+    for master in masters:
+        pattern = _series(master.recurrence) if master.recurrence else None
+        series[master.id] = pattern
+        if pattern is None:
+            continue
+        pattern["deleted"]  = [to_timestamp(occurrence.start, timezone) for occurrence in master.deleted_occurrences or ()]
+        pattern["modified"] = []
+        # Occurrences recur at the same wall-clock time in the zone the series was created in
+        pattern["timezone"] = _zone_key(master)
+        modified.extend((master.id, occurrence) for occurrence in master.modified_occurrences or ())
+
+    if modified:
+        items = account.fetch(
+            ids=[(occurrence.id, occurrence.changekey) for _, occurrence in modified], only_fields=EVENT_FIELDS
+        )
+        for (master_id, occurrence), item in zip(modified, items):
+            if isinstance(item, Exception):
+                series[master_id] = None
+            elif series[master_id] is not None:
+                series[master_id]["modified"].append(
+                    [to_timestamp(occurrence.original_start, timezone), EventRecord.from_item(item, timezone)]
+                )
+    return series
+
+
+def _days(series: Dict[str, Any], from_day: date) -> Iterator[Tuple[int, date]]:
+    """Yield the instance index (from 1) and day of the occurrences in order, starting with the period containing from_day."""
+    first, count, until = series["first"], series["count"], series["until"]
+    if series["pattern"] == DAILY:
+        anchor  = first
+        offsets = [0]
+        period  = series["interval"]
+    else:
+        # Weekly periods start on the series' first day of the week, in the week the series starts
+        anchor  = first - timedelta(days=(first.isoweekday() - series["first_day_of_week"]) % 7)
+        offsets = sorted((weekday - series["first_day_of_week"]) % 7 for weekday in series["weekdays"])
+        period  = 7 * series["interval"]
+
+    # Days of the first period before the series starts are not occurrences, and do not count towards the number
+    before_first = sum(1 for offset in offsets if anchor + timedelta(days=offset) < first)
+    cycle = max(0, (from_day - anchor).days // period)
+    index = cycle * len(offsets) - before_first if cycle else 0
+    while True:
+        cycle_start = anchor + timedelta(days=cycle * period)
+        for offset in offsets:
+            day = cycle_start + timedelta(days=offset)
+            if day < first:
+                continue
+            if (count is not None and index >= count) or (until is not None and day > until):
+                return
+            index += 1
+            yield index, day
+        cycle += 1
+
+
+def expand(master: EventRecord, series: Dict[str, Any], start: datetime, end: datetime, timezone) -> List[EventRecord]:
+    """Return the occurrences of a mirrored master overlapping [start, end), with its exceptions applied.
+
+    Occurrences get ids made of the master's id and their instance index,
+    which the services turn back into an OccurrenceItemId, and recur at the
+    master's wall-clock time in the series' own time zone. Modified
+    occurrences are returned as Exchange stored them, under their own ids.
+    """
+    start_ts, end_ts = timestamp(start), timestamp(end)
+    duration = master.end - master.start
+    # All-day occurrences span whole local days, whatever the length of those days
+    days     = round(duration / 86400)
+    # All-day records are stored at midnight of the entry's time zone, so their days are counted there
+    zone     = ZoneInfo(series["timezone"]) if series["timezone"] and not master.all_day else timezone
+    at_time  = None if master.all_day else datetime.fromtimestamp(master.start, zone).time()
+    skipped  = set(series["deleted"])
+    skipped.update(original_start for original_start, _ in series["modified"])
+
+    occurrences = []
+    # An occurrence starting up to its duration before the range still overlaps it
+    from_day = (start.astimezone(zone) - timedelta(seconds=duration)).date() - timedelta(days=1)
+    last_day = end.astimezone(zone).date()
+    for index, day in _days(series, from_day):
+        if day > last_day:
+            break
+        if master.all_day:
+            occurrence_start = to_timestamp(day, timezone)
+            occurrence_end   = to_timestamp(day + timedelta(days=days), timezone)
+        else:
+            occurrence_start = int(datetime.combine(day, at_time, tzinfo=zone).timestamp())
+            occurrence_end   = occurrence_start + duration
+        if occurrence_start in skipped:
+            continue
+        if occurrence_start < end_ts and occurrence_end >= start_ts:
+            occurrences.append(master.moved(occurrence_start, occurrence_end, occurrence_id(master.item_id, index)))
+
+    for _, event in series["modified"]:
+        if event.overlaps(start_ts, end_ts):
+            occurrences.append(event)
+    return occurrences
+
+
+def encode_series(series: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialize a series for storage."""
+    return {
+        **series,
+        "first":    series["first"].isoformat(),
+        "until":    series["until"].isoformat() if series["until"] is not None else None,
+        "modified": [[original_start, event.to_json()] for original_start, event in series["modified"]],
+    }
+
+
+def decode_series(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore a series serialized with encode_series."""
+    return {
+        **data,
+        "first":    date.fromisoformat(data["first"]),
+        "until":    date.fromisoformat(data["until"]) if data["until"] is not None else None,
+        "modified": [[original_start, EventRecord.from_json(event)] for original_start, event in data["modified"]],
+    }
@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+# The metrics are in memory, so polling them is free
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+def _per_operation(field: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    return lambda data: {name: getattr(stats, field) for name, stats in data["metrics"].items()}
+
+
+def _p95_latency(data: Dict[str, Any]) -> Optional[float]:
+    """Return the slowest operation's 95th percentile latency in milliseconds."""
+    values = [stats.percentile(0.95) for _, stats in data["metrics"].items() if stats.calls]
+    return round(max(values) * 1000) if values else None
+
+
+def _read_stats(data: Dict[str, Any]) -> Dict[str, int]:
+    """Return the read counters summed over the entry's calendars."""
+    totals: Dict[str, int] = {}
+    for client in data["clients"].values():
+        for key, value in client.stats().items():
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def _cache_hit_rate(data: Dict[str, Any]) -> Optional[float]:
+    """Return the share of event reads answered by the mirror or the interval cache."""
+    stats = _read_stats(data)
+    local = stats["mirror_hits"] + stats["cache_hits"]
+    total = local + stats["cache_misses"]
+    return round(100 * local / total, 1) if total else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class ExchangeSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor computed from an entry's runtime data."""
+
+    value_fn: Callable[[Dict[str, Any]], Any]
+    attributes_fn: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+
+
+SENSORS = (
+    ExchangeSensorEntityDescription(
+        key="ews_requests",
+        name="EWS requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data["metrics"].total("calls"),
+        attributes_fn=_per_operation("calls"),
+    ),
+    ExchangeSensorEntityDescription(
+        key="ews_errors",
+        name="EWS errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data["metrics"].total("errors") + data["metrics"].total("timeouts"),
+        attributes_fn=lambda data: {
+            name: {"errors": stats.errors, "timeouts": stats.timeouts, "item_errors": stats.item_errors}
+            for name, stats in data["metrics"].items()
+        },
+    ),
+    ExchangeSensorEntityDescription(
+        key="ews_throttled",
+        name="EWS throttled",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data["metrics"].total("throttled"),
+        attributes_fn=_per_operation("throttled"),
+    ),
+    ExchangeSensorEntityDescription(
+        key="ews_latency_p95",
+        name="EWS latency p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_p95_latency,
+        attributes_fn=lambda data: {
+            name: {
+                "p50_ms":  round(stats.percentile(0.5) * 1000),
+                "p95_ms":  round(stats.percentile(0.95) * 1000),
+                "max_ms":  round(stats.max_time * 1000),
+                "mean_ms": round(stats.total_time / stats.calls * 1000),
+            }
+            for name, stats in data["metrics"].items() if stats.calls
+        },
+    ),
+    ExchangeSensorEntityDescription(
+        key="ews_items",
+        name="EWS items received",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data["metrics"].total("items"),
+        attributes_fn=_per_operation("items"),
+    ),
+    ExchangeSensorEntityDescription(
+        key="ews_bytes_received",
+        name="EWS data received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.KILOBYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data["metrics"].total("bytes_received"),
+        attributes_fn=_per_operation("bytes_received"),
+    ),
+    ExchangeSensorEntityDescription(
+        key="cache_hit_rate",
+        name="Calendar cache hit rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_cache_hit_rate,
+        attributes_fn=_read_stats,
+    ),
+    ExchangeSensorEntityDescription(
+        key="ews_workers_busy",
+        name="EWS workers busy",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data["executor"].running,
+        attributes_fn=lambda data: data["executor"].stats(),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities,
+) -> None:
+    """Set up the diagnostic sensors."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        [ExchangeDiagnosticSensor(data, entry, description) for description in SENSORS],
+        update_before_add=True,
+    )
+
+
+class ExchangeDiagnosticSensor(SensorEntity):
+    """A diagnostic sensor reporting on an entry's EWS traffic and caches."""
+
+    entity_description: ExchangeSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, data: Dict[str, Any], entry: ConfigEntry, description: ExchangeSensorEntityDescription):
+        self.entity_description = description
+        self._data = data
+        self._attr_name = f"{entry.title} {description.name}"
+        self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_{description.key}"
+
+    async def async_update(self) -> None:
+        """Read the current values from memory."""
+        self._attr_native_value = self.entity_description.value_fn(self._data)
+        if self.entity_description.attributes_fn:
+            self._attr_extra_state_attributes = self.entity_description.attributes_fn(self._data)
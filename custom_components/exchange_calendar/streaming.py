@@ -0,0 +1,142 @@
+"""EWS streaming notifications for the calendar folders of the account's mailbox."""
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Set
+
+from exchangelib.folders import FolderCollection
+from exchangelib.properties import StatusEvent
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+
+from .calendars import CalendarSource
+from .connection import ExchangeConnection
+from .const import (
+    DEFAULT_CALL_TIMEOUT,
+    STREAMING_CONNECTION_TIMEOUT,
+    RECONNECT_BACKOFF_MIN,
+    RECONNECT_BACKOFF_MAX,
+    STREAMING_DEBOUNCE,
+)
+from .executor import EwsExecutor
+from .metrics import EwsMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CalendarStreamingListener:
+    """Keeps one EWS streaming subscription open on several calendar folders of a mailbox.
+
+    Runs as a background task: each notification other than the keep-alive
+    status events triggers ``on_change`` (debounced, so a burst of changes
+    costs a single refresh) with the ids of the folders that changed, or
+    None when any of them may have. A dropped subscription is re-established
+    with exponential backoff, and ``connected`` tells pollers whether they
+    still need to poll in the meantime.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: ExchangeConnection,
+        sources: List[CalendarSource],
+        on_change: Callable[[Optional[Set[str]]], Awaitable[None]],
+        metrics: Optional[EwsMetrics] = None,
+    ):
+        self._hass       = hass
+        self._connection = connection
+        self._sources    = sources
+        self._on_change  = on_change
+        # Folders reported changed since the last flush; everything when _all_changed is set
+        self._changed: Set[str] = set()
+        self._all_changed = False
+        self._task: Optional[asyncio.Task] = None
+        self._subscription_id: Optional[str] = None
+        self._stopping = False
+        # GetStreamingEvents holds a thread for minutes at a time, so the listener has its own pool:
+        # one worker for the open connection and one for subscribing and unsubscribing
+        self._executor = EwsExecutor("streaming", 2, None, metrics)
+        self._debouncer = Debouncer(
+            hass, _LOGGER, cooldown=STREAMING_DEBOUNCE, immediate=False, function=self._async_flush
+        )
+        self.connected = False
+
+    @callback
+    def start(self) -> None:
+        """Start the background subscription task."""
+        self._task = self._hass.async_create_background_task(self._run(), "exchange_calendar streaming subscription")
+
+    async def async_stop(self) -> None:
+        """Cancel the subscription task and unsubscribe."""
+        self._stopping = True
+        self.connected = False
+        self._debouncer.async_cancel()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._subscription_id:
+            subscription_id, self._subscription_id = self._subscription_id, None
+            try:
+                await self._executor.async_run(
+                    self._connection.account.calendar.unsubscribe, subscription_id,
+                    timeout=DEFAULT_CALL_TIMEOUT, operation="unsubscribe",
+                )
+            except Exception as err:
+                _LOGGER.debug("Failed to unsubscribe streaming subscription: %s", err)
+        self._executor.shutdown()
+
+    async def _run(self) -> None:
+        account = await self._connection.async_get_account()
+        backoff = RECONNECT_BACKOFF_MIN
+        while not self._stopping:
+            try:
+                if not self._subscription_id:
+                    self._subscription_id = await self._executor.async_run(
+                        self._subscribe, account, timeout=DEFAULT_CALL_TIMEOUT, operation="subscribe"
+                    )
+                    _LOGGER.debug("Opened calendar streaming subscription on %d folders", len(self._sources))
+                    # Anything changed while we were not subscribed has to be picked up once
+                    self._all_changed = True
+                    await self._debouncer.async_call()
+                self.connected = True
+                # Blocks for up to the connection timeout, then the same subscription is reopened
+                await self._executor.async_run(self._stream, self._subscription_id, operation="streaming_events")
+                backoff = RECONNECT_BACKOFF_MIN
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self.connected = False
+                self._subscription_id = None
+                _LOGGER.warning("Calendar streaming subscription dropped, retrying in %ss: %s", backoff, err)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX)
+
+    def _subscribe(self, account) -> str:
+        """Synchronously subscribe to all the folders at once, resolving them first."""
+        folders = [source.folder() for source in self._sources]
+        return FolderCollection(account=account, folders=folders).subscribe_to_streaming()
+
+    def _stream(self, subscription_id: str) -> None:
+        """Synchronous GetStreamingEvents connection; reports changes back to the event loop."""
+        for notification in self._connection.account.calendar.get_streaming_events(
+            subscription_id, connection_timeout=STREAMING_CONNECTION_TIMEOUT
+        ):
+            if self._stopping:
+                return
+            folder_ids = {
+                (event.parent_folder_id or event.folder_id).id
+                for event in notification.events
+                if not isinstance(event, StatusEvent) and (event.parent_folder_id or event.folder_id)
+            }
+            if folder_ids:
+                self._hass.loop.call_soon_threadsafe(self._notify, folder_ids)
+
+    @callback
+    def _notify(self, folder_ids: Set[str]) -> None:
+        self._changed |= folder_ids
+        self._hass.async_create_task(self._debouncer.async_call())
+
+    async def _async_flush(self) -> None:
+        changed = None if self._all_changed else self._changed
+        self._changed     = set()
+        self._all_changed = False
+        await self._on_change(changed)
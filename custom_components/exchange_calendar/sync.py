@@ -0,0 +1,312 @@
+"""Incremental calendar sync built on EWS SyncFolderItems."""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from exchangelib.errors import ErrorInvalidSyncStateData
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .cache import timestamp
+from .calendars import PRIMARY_CALENDAR, CalendarSource
+from .connection import ExchangeConnection
+from .const import DOMAIN, DEFAULT_SYNC_INTERVAL, EVENT_FIELDS
+from .events import RECORD_VERSION, EventRecord, to_timestamp
+from .executor import EwsExecutor
+from .recurrence import SERIES_FIELDS, SERIES_VERSION, decode_series, encode_series, expand, fetch_series
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+SYNC_FIELDS = EVENT_FIELDS + ["type"]
+RECURRING_MASTER = "RecurringMaster"
+
+
+def storage_key(entry_id: str, calendar: str = PRIMARY_CALENDAR) -> str:
+    """Return the storage key of the mirror of one of a config entry's calendars."""
+    if calendar == PRIMARY_CALENDAR:
+        return f"{DOMAIN}.{entry_id}.sync"
+    return f"{DOMAIN}.{entry_id}.{calendar}.sync"
+
+
+class CalendarSync:
+    """Local mirror of the calendar folder kept current with SyncFolderItems.
+
+    The sync state and the last known items are persisted in Home Assistant's
+    storage, so every poll (and every restart) only transfers the creates,
+    updates and deletes made since the previous one.
+
+    With ``expand`` set, the recurrence pattern and exceptions of recurring
+    masters are mirrored as well, and the occurrences of daily and weekly
+    series are expanded locally instead of asking Exchange for a CalendarView.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: ExchangeConnection,
+        source: CalendarSource,
+        timezone,
+        storage_key: str,
+        executor: EwsExecutor,
+        expand: bool = False,
+    ):
+        self._hass       = hass
+        self._connection = connection
+        self._source     = source
+        self._executor   = executor
+        self._expand     = expand
+        self._timezone   = timezone
+        self._store      = Store(hass, STORAGE_VERSION, storage_key)
+        self._items: Dict[str, EventRecord] = {}
+        # Recurring master id -> end of its last occurrence, or None when unknown
+        self._masters: Dict[str, Optional[int]] = {}
+        # Ids of the masters with modified occurrences, which carry subjects of their own
+        self._modified: Set[str] = set()
+        # Lower-cased subject -> ids of the mirrored items carrying it
+        self._subjects: Dict[str, Set[str]] = {}
+        # Master id -> series expanded locally, or None when only Exchange can expand it
+        self._series: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._sync_state: Optional[str] = None
+        self._lock       = asyncio.Lock()
+        self._last_sync  = 0.0
+        self.ready       = False
+
+    async def async_load(self) -> None:
+        """Restore the mirror and sync state from storage."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        if data.get("fields") != SYNC_FIELDS:
+            # Items mirrored with fewer fields would never gain the new ones, so start over
+            _LOGGER.info("The calendar mirror was stored with other fields, resynchronising the calendar")
+            return
+        if data.get("expand", False) != self._expand:
+            _LOGGER.info("Local recurrence expansion was switched, resynchronising the calendar")
+            return
+        if (
+            data.get("records") != RECORD_VERSION
+            or data.get("patterns") != SERIES_VERSION
+            or data.get("timezone") != str(self._timezone)
+            or "modified" not in data
+        ):
+            # All-day events are stored at midnight of the time zone they were mirrored in
+            _LOGGER.info("The calendar mirror was stored in another format or time zone, resynchronising the calendar")
+            return
+        self._sync_state = data.get("sync_state")
+        self._items = {item[0]: EventRecord.from_json(item) for item in data.get("items", [])}
+        self._masters = dict(data.get("masters", {}))
+        self._modified = set(data["modified"])
+        self._series = {
+            item_id: decode_series(series) if series is not None else None
+            for item_id, series in data.get("series", {}).items()
+        }
+        self._subjects.clear()
+        for item in self._items.values():
+            self._index(item)
+        self.ready = self._sync_state is not None
+        _LOGGER.debug("Restored %d mirrored calendar items", len(self._items))
+
+    async def async_sync(self, force: bool = False) -> bool:
+        """Apply the changes made since the last sync. Return True if anything changed."""
+        async with self._lock:
+            if not self._connection.ready:
+                return False
+            if not force and self.ready and time.monotonic() - self._last_sync < DEFAULT_SYNC_INTERVAL:
+                return False
+
+            try:
+                changes, sync_state = await self._executor.async_run(self._fetch_changes, self._sync_state, operation="sync_items", idempotent=True)
+            except ErrorInvalidSyncStateData:
+                _LOGGER.warning("Exchange rejected the stored sync state, resynchronising the calendar")
+                self._items.clear()
+                self._masters.clear()
+                self._modified.clear()
+                self._subjects.clear()
+                self._series.clear()
+                changes, sync_state = await self._executor.async_run(self._fetch_changes, None, operation="sync_items", idempotent=True)
+                changes.append(("reset", None))
+
+            for change_type, value in changes:
+                if change_type == "delete":
+                    self._unindex(self._items.pop(value, None))
+                    self._masters.pop(value, None)
+                    self._modified.discard(value)
+                    self._series.pop(value, None)
+                elif change_type in ("create", "update"):
+                    item = value["record"]
+                    self._unindex(self._items.get(item.item_id))
+                    if value["master"]:
+                        self._masters[item.item_id] = value["last_end"]
+                    else:
+                        self._masters.pop(item.item_id, None)
+                    if value.get("modified"):
+                        self._modified.add(item.item_id)
+                    else:
+                        self._modified.discard(item.item_id)
+                    if "series" in value:
+                        self._series[item.item_id] = value["series"]
+                    else:
+                        self._series.pop(item.item_id, None)
+                    self._items[item.item_id] = item
+                    self._index(item)
+
+            self._sync_state = sync_state
+            self._last_sync  = time.monotonic()
+            self.ready       = True
+            if changes:
+                _LOGGER.debug("Applied %d calendar changes", len(changes))
+                self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+            return bool(changes)
+
+    def events_between(self, start: datetime, end: datetime) -> Optional[List[EventRecord]]:
+        """Return mirrored events overlapping [start, end), sorted by start.
+
+        SyncFolderItems reports recurring series as their master item only, so
+        None is returned when a series may have occurrences in the range and
+        is not expanded locally, and the caller has to ask Exchange for the
+        expanded view.
+        """
+        if not self.ready:
+            return None
+
+        start_ts, end_ts = timestamp(start), timestamp(end)
+        matches = []
+        for item in self._items.values():
+            if item.item_id in self._masters:
+                if self._series_overlaps(item, start_ts, end_ts):
+                    series = self._series.get(item.item_id)
+                    if series is None:
+                        return None
+                    matches.extend(expand(item, series, start, end, self._timezone))
+                continue
+            if item.overlaps(start_ts, end_ts):
+                matches.append(item)
+        matches.sort(key=lambda item: item.start)
+        return matches
+
+    def find_by_subject(self, subject: str, start: datetime, end: datetime, exact: bool = True) -> Optional[List[EventRecord]]:
+        """Return mirrored items whose subject matches and that overlap [start, end), sorted by start.
+
+        Matching is case-insensitive, on the whole subject when ``exact`` is set
+        and on a substring otherwise. None is returned when the mirror cannot
+        answer: before the first sync, when a recurring series overlapping the
+        range matches, since its occurrences are only known to CalendarView,
+        and when such a series has modified occurrences that are not mirrored,
+        since their subjects may differ from the master's. The modified
+        occurrences of series expanded locally are matched like mirrored items.
+        """
+        if not self.ready:
+            return None
+
+        needle = subject.lower()
+        if exact:
+            item_ids = self._subjects.get(needle, ())
+        else:
+            item_ids = [item_id for key, ids in self._subjects.items() if needle in key for item_id in ids]
+
+        start_ts, end_ts = timestamp(start), timestamp(end)
+        matches = []
+        for item_id in item_ids:
+            item = self._items[item_id]
+            if item_id in self._masters:
+                if self._series_overlaps(item, start_ts, end_ts):
+                    return None
+            elif item.overlaps(start_ts, end_ts):
+                matches.append(item)
+        for master_id in self._modified:
+            if not self._series_overlaps(self._items[master_id], start_ts, end_ts):
+                continue
+            series = self._series.get(master_id)
+            if series is None:
+                return None
+            for _, event in series["modified"]:
+                key = (event.subject or "").lower()
+                if (key == needle if exact else needle in key) and event.overlaps(start_ts, end_ts):
+                    matches.append(event)
+        matches.sort(key=lambda item: item.start)
+        return matches
+
+    def _series_overlaps(self, master: EventRecord, start: int, end: int) -> bool:
+        """Return whether the occurrences of a mirrored master may overlap [start, end)."""
+        last_end = self._masters[master.item_id]
+        return master.start < end and (last_end is None or last_end >= start)
+
+    def _index(self, item: EventRecord) -> None:
+        if item.subject:
+            self._subjects.setdefault(item.subject.lower(), set()).add(item.item_id)
+
+    def _unindex(self, item: Optional[EventRecord]) -> None:
+        if not item or not item.subject:
+            return
+        key = item.subject.lower()
+        ids = self._subjects.get(key)
+        if ids is not None:
+            ids.discard(item.item_id)
+            if not ids:
+                del self._subjects[key]
+
+    def _fetch_changes(self, sync_state: Optional[str]):
+        """Synchronous SyncFolderItems round trip; returns the changes and the new sync state."""
+        account  = self._source.account()
+        calendar = self._source.folder()
+        calendar.item_sync_state = sync_state
+        changes = []
+        masters = []
+        for change_type, item in calendar.sync_items(sync_state=sync_state, only_fields=SYNC_FIELDS):
+            if change_type == "delete":
+                changes.append((change_type, item.id))
+            elif change_type in ("create", "update"):
+                changes.append((change_type, {
+                    "record":   EventRecord.from_item(item, self._timezone),
+                    "master":   item.type == RECURRING_MASTER,
+                    "last_end": None,
+                    # Until the master is fetched, assume its occurrences may have been modified
+                    "modified": item.type == RECURRING_MASTER,
+                }))
+                if item.type == RECURRING_MASTER:
+                    masters.append(item)
+
+        if masters:
+            # Occurrence bounds are not returned by SyncFolderItems, so fetch them for all masters in one GetItem
+            only_fields = ["last_occurrence"] + (SERIES_FIELDS if self._expand else ["modified_occurrences"])
+            fetched = [
+                master for master in account.fetch(ids=masters, only_fields=only_fields)
+                if not isinstance(master, Exception)
+            ]
+            last_ends = {
+                master.id: to_timestamp(master.last_occurrence.end, self._timezone) if master.last_occurrence else None
+                for master in fetched
+            }
+            modified  = {master.id for master in fetched if master.modified_occurrences}
+            series    = fetch_series(account, fetched, self._timezone) if self._expand else {}
+            for change_type, value in changes:
+                item_id = value["record"].item_id if change_type != "delete" else None
+                if item_id in last_ends:
+                    value["last_end"] = last_ends[item_id]
+                    value["modified"] = item_id in modified
+                    if item_id in series:
+                        value["series"] = series[item_id]
+
+        return changes, calendar.item_sync_state
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {
+            "fields":     SYNC_FIELDS,
+            "expand":     self._expand,
+            "records":    RECORD_VERSION,
+            "patterns":   SERIES_VERSION,
+            "timezone":   str(self._timezone),
+            "sync_state": self._sync_state,
+            "items":      [item.to_json() for item in self._items.values()],
+            "masters":    self._masters,
+            "modified":   sorted(self._modified),
+            "series": {
+                item_id: encode_series(series) if series is not None else None
+                for item_id, series in self._series.items()
+            },
+        }
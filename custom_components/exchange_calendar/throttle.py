@@ -0,0 +1,160 @@
+"""Pacing, retries and a circuit breaker for one account's EWS calls."""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, Optional
+
+from exchangelib.errors import (
+    ErrorInternalServerTransientError,
+    ErrorServerBusy,
+    ErrorTimeoutExpired,
+    ErrorTooManyObjectsOpened,
+    TransportError,
+)
+from exchangelib.util import CONNECTION_ERRORS
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import RETRY_BACKOFF_MIN, RETRY_BACKOFF_MAX
+
+_LOGGER = logging.getLogger(__name__)
+
+# Exchange rejected the request without acting on it, so even writes can be sent again
+REJECTED_ERRORS = (ErrorServerBusy, ErrorTooManyObjectsOpened, ErrorInternalServerTransientError)
+# Errors that say nothing about the request itself, only about the health of the server or the network
+TRANSIENT_ERRORS = REJECTED_ERRORS + (ErrorTimeoutExpired, TransportError) + CONNECTION_ERRORS
+
+
+class ExchangeUnavailable(HomeAssistantError):
+    """Exchange kept failing, so calls are held off until it has had time to recover."""
+
+
+class CircuitBreaker:
+    """Stops calling Exchange after repeated transient failures.
+
+    After ``threshold`` failures in a row the circuit opens and calls fail
+    with ``ExchangeUnavailable`` straight away, which lets readers answer
+    from the local cache instead. Once ``reset_timeout`` seconds have passed
+    a single probe call is let through: it closes the circuit if it
+    succeeds and opens it again if it fails. A probe that never reports back
+    is given up on after another ``reset_timeout``.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self._threshold     = threshold
+        self._reset_timeout = reset_timeout
+        self._failures      = 0
+        self._opened_at: Optional[float] = None
+        # Monotonic start of the probe call let through while half open
+        self._probing: Optional[float] = None
+        self.trips          = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self._reset_timeout:
+            return "open"
+        return "half_open"
+
+    def before_call(self) -> None:
+        """Raise ExchangeUnavailable unless the call may go ahead."""
+        state = self.state
+        if state == "closed":
+            return
+        now = time.monotonic()
+        if state == "open" or (self._probing is not None and now - self._probing < self._reset_timeout):
+            raise ExchangeUnavailable("Exchange is unavailable after repeated failures, retrying later")
+        self._probing = now
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            _LOGGER.info("Exchange is responding again, closing the circuit")
+        self._failures  = 0
+        self._opened_at = None
+        self._probing   = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing is not None or (self._opened_at is None and self._failures >= self._threshold):
+            if self._probing is None:
+                self.trips += 1
+                _LOGGER.warning("Opening the circuit after %d failed EWS calls in a row", self._failures)
+            self._opened_at = time.monotonic()
+        self._probing = None
+
+
+class RequestThrottle:
+    """Paces an account's EWS calls and decides how failed ones are retried.
+
+    Calls draw from a token bucket refilled at ``rate`` requests per second
+    up to ``burst``, so bulk runs and cold reads spread out instead of
+    tripping Exchange's throttling budget. When Exchange answers
+    ``ErrorServerBusy`` with a back-off hint, every call of the account waits
+    it out, not only the one that was rejected.
+    """
+
+    def __init__(self, rate: float, burst: int, max_retries: int, breaker: CircuitBreaker):
+        self._rate         = rate
+        self._burst        = burst
+        self._tokens       = float(burst)
+        self._refilled_at  = time.monotonic()
+        # Monotonic time until which Exchange asked for no further requests
+        self._paused_until = 0.0
+        self.max_retries   = max_retries
+        self.breaker       = breaker
+        self.waits         = 0
+        self.waited        = 0.0
+        self.back_offs     = 0
+        self.retries       = 0
+
+    @property
+    def available(self) -> bool:
+        """Return False while the circuit is open and calls would be refused."""
+        return self.breaker.state != "open"
+
+    async def async_acquire(self) -> None:
+        """Wait for the account's turn to call Exchange."""
+        self.breaker.before_call()
+        while True:
+            now  = time.monotonic()
+            wait = self._paused_until - now
+            if wait <= 0:
+                self._tokens      = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            self.waits  += 1
+            self.waited += wait
+            await asyncio.sleep(wait)
+
+    def record_success(self) -> None:
+        self.breaker.record_success()
+
+    def record_failure(self, err: BaseException) -> None:
+        """Count a transient failure and apply the back-off Exchange asked for."""
+        self.breaker.record_failure()
+        self.back_off(getattr(err, "back_off", None))
+
+    def back_off(self, seconds: Optional[float]) -> None:
+        """Hold off every call of the account for the seconds Exchange asked for."""
+        if seconds:
+            self.back_offs    += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            _LOGGER.debug("Exchange asked to back off for %ss", seconds)
+
+    def retry_delay(self, attempt: int) -> float:
+        """Return the jittered exponential delay before the given retry, counting from zero."""
+        return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_MIN * 2 ** attempt))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit":       self.breaker.state,
+            "circuit_trips": self.breaker.trips,
+            "rate_waits":    self.waits,
+            "rate_waited":   round(self.waited, 3),
+            "back_offs":     self.back_offs,
+            "retries":       self.retries,
+        }
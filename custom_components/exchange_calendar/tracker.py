@@ -0,0 +1,75 @@
+"""Next-event tracking for the calendar entity's state."""
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from .const import (
+    NEXT_EVENT_BATCH, NEXT_EVENT_HORIZON_DAYS, NEXT_EVENT_LOOKAHEAD, NEXT_EVENT_LOW_WATERMARK, NEXT_EVENT_REFILL_INTERVAL,
+)
+from .events import EventRecord
+
+# (start, end, max_items) -> (events sorted by start, time up to which no event is missing, or None if unknown)
+UpcomingFetcher = Callable[[datetime, datetime, int], Awaitable[Tuple[List[EventRecord], Optional[datetime]]]]
+
+
+class NextEventTracker:
+    """Keeps the upcoming events in a heap ordered by start.
+
+    The entity only needs the current or next event, so instead of reading a
+    month of events on every poll the tracker asks for the first
+    ``NEXT_EVENT_BATCH`` events and pops them locally as they end. It asks
+    again only when a change was reported (``invalidate``), or when fewer
+    than ``NEXT_EVENT_LOW_WATERMARK`` events are left and either the range
+    known to be complete ends within ``NEXT_EVENT_LOOKAHEAD`` seconds or
+    ``NEXT_EVENT_REFILL_INTERVAL`` seconds passed since the last refill. An
+    event entering the ``NEXT_EVENT_HORIZON_DAYS`` horizon therefore shows up
+    within the interval, while a nearly empty calendar is not read on every
+    poll.
+    """
+
+    def __init__(self, fetch_upcoming: UpcomingFetcher):
+        self._fetch_upcoming = fetch_upcoming
+        self._heap: List[Tuple[int, int, int, EventRecord]] = []
+        self._counter        = itertools.count()
+        # Every event starting before this is in the heap
+        self._complete_until: Optional[datetime] = None
+        self._refilled_at: Optional[datetime] = None
+        self._stale          = True
+        self.refills         = 0
+
+    def invalidate(self) -> None:
+        """Drop what is known, so the next lookup asks again."""
+        self._stale = True
+
+    async def async_next_event(self, now: datetime) -> Optional[EventRecord]:
+        """Return the event in progress at now, or else the next one to start."""
+        self._pop_ended(now)
+        if self._needs_refill(now):
+            await self._async_refill(now)
+            self._pop_ended(now)
+        return self._heap[0][3] if self._heap else None
+
+    def _needs_refill(self, now: datetime) -> bool:
+        if self._stale:
+            return True
+        return len(self._heap) < NEXT_EVENT_LOW_WATERMARK and (
+            self._complete_until < now + timedelta(seconds=NEXT_EVENT_LOOKAHEAD)
+            or now - self._refilled_at >= timedelta(seconds=NEXT_EVENT_REFILL_INTERVAL)
+        )
+
+    async def _async_refill(self, now: datetime) -> None:
+        end = now + timedelta(days=NEXT_EVENT_HORIZON_DAYS)
+        events, self._complete_until = await self._fetch_upcoming(now, end, NEXT_EVENT_BATCH)
+        # Without a completeness bound (local data while Exchange is unreachable) the next lookup asks again
+        self._stale       = self._complete_until is None
+        self._refilled_at = now
+        self.refills     += 1
+
+        self._heap = [(event.start, event.end, next(self._counter), event) for event in events]
+        heapq.heapify(self._heap)
+
+    def _pop_ended(self, now: datetime) -> None:
+        now = now.timestamp()
+        while self._heap and self._heap[0][1] <= now:
+            heapq.heappop(self._heap)
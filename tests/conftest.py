@@ -0,0 +1,59 @@
+"""Shared fixtures: calendar items parsed from EWS XML the way exchangelib parses Exchange's responses."""
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable
+from xml.sax.saxutils import escape
+
+import pytest
+from exchangelib import CalendarItem
+from exchangelib.winzone import CLDR_TO_MS_TIMEZONE_MAP
+from lxml import etree
+
+TNS = "http://schemas.microsoft.com/exchange/services/2006/types"
+
+
+def _time(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _zone(value) -> str:
+    return CLDR_TO_MS_TIMEZONE_MAP[str(value)][0]
+
+
+# Field name -> element Exchange returns for it
+ELEMENTS: Dict[str, Callable[[Any], str]] = {
+    "subject":                 lambda value: f"<t:Subject>{escape(value)}</t:Subject>",
+    "start":                   lambda value: f"<t:Start>{_time(value)}</t:Start>",
+    "end":                     lambda value: f"<t:End>{_time(value)}</t:End>",
+    "is_all_day":              lambda value: f"<t:IsAllDayEvent>{str(value).lower()}</t:IsAllDayEvent>",
+    "location":                lambda value: f"<t:Location>{escape(value)}</t:Location>",
+    "categories":              lambda value: "<t:Categories>" + "".join(f"<t:String>{escape(v)}</t:String>" for v in value) + "</t:Categories>",
+    "organizer":               lambda value: f"<t:Organizer><t:Mailbox><t:EmailAddress>{escape(value)}</t:EmailAddress></t:Mailbox></t:Organizer>",
+    "legacy_free_busy_status": lambda value: f"<t:LegacyFreeBusyStatus>{value}</t:LegacyFreeBusyStatus>",
+    "type":                    lambda value: f"<t:CalendarItemType>{value}</t:CalendarItemType>",
+    "_start_timezone":         lambda value: f'<t:StartTimeZone Id="{_zone(value)}"/>',
+    "_end_timezone":           lambda value: f'<t:EndTimeZone Id="{_zone(value)}"/>',
+}
+
+
+@pytest.fixture
+def calendar_item() -> Callable[..., CalendarItem]:
+    """Return a factory parsing an item that carries only the given fields, as a request with only_fields gets it.
+
+    ``zone`` is the time zone the item was created in. exchangelib adds the
+    start and end time zones to every request that asks for start and end,
+    so they are returned along with those.
+    """
+
+    def build(fields: Iterable[str], zone, item_id: str = "AAMkItem", changekey: str = "1", **values) -> CalendarItem:
+        fields = list(fields)
+        values = {**values, "_start_timezone": zone, "_end_timezone": zone}
+        if "start" in fields:
+            fields.append("_start_timezone")
+        if "end" in fields:
+            fields.append("_end_timezone")
+        parts = [f'<t:ItemId Id="{item_id}" ChangeKey="{changekey}"/>']
+        parts.extend(ELEMENTS[name](values[name]) for name in fields if values.get(name) is not None)
+        element = etree.fromstring(f'<t:CalendarItem xmlns:t="{TNS}">{"".join(parts)}</t:CalendarItem>')
+        return CalendarItem.from_xml(elem=element, account=None)
+
+    return build
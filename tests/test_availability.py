@@ -0,0 +1,44 @@
+"""Merging busy intervals and finding the free slots between them."""
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from custom_components.exchange_calendar.availability import free_slots, merge_busy, merge_intervals, split_window
+
+ZONE = ZoneInfo("Europe/Berlin")
+
+
+def _at(hour: float) -> datetime:
+    return datetime(2026, 3, 2, tzinfo=ZONE) + timedelta(hours=hour)
+
+
+def _span(start: float, end: float):
+    return _at(start), _at(end)
+
+
+def test_overlapping_and_touching_intervals_are_joined():
+    assert merge_intervals([_span(9, 10), _span(9.5, 11), _span(11, 12), _span(10, 10.5), _span(13, 14)]) == [
+        _span(9, 12), _span(13, 14),
+    ]
+
+
+def test_mailboxes_are_merged_in_one_sweep():
+    room   = [_span(9, 10), _span(14, 15)]
+    person = [_span(8, 8.5), _span(9.5, 11), _span(16, 17)]
+    assert merge_busy([room, person, []]) == [_span(8, 8.5), _span(9, 11), _span(14, 15), _span(16, 17)]
+
+
+def test_free_slots_lie_between_busy_intervals():
+    busy = [_span(7, 9), _span(10, 10.25), _span(12, 13), _span(17, 19)]
+    assert free_slots(busy, _at(8), _at(18), timedelta(minutes=30)) == [_span(9, 10), _span(10.25, 12), _span(13, 17)]
+    assert free_slots(busy, _at(8), _at(18), timedelta(hours=2)) == [_span(13, 17)]
+
+
+def test_free_slots_of_an_empty_window():
+    assert free_slots([], _at(8), _at(18), timedelta(minutes=30)) == [_span(8, 18)]
+    assert free_slots([_span(0, 24)], _at(8), _at(18), timedelta(minutes=30)) == []
+
+
+def test_long_windows_are_split():
+    windows = split_window(_at(0), _at(24 * 100), 42)
+    assert [end - start for start, end in windows] == [timedelta(days=42), timedelta(days=42), timedelta(days=16)]
+    assert windows[0][0] == _at(0) and windows[-1][1] == _at(24 * 100)
@@ -0,0 +1,101 @@
+"""Windows, expiry and eviction of the event cache."""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.exchange_calendar import cache
+from custom_components.exchange_calendar.cache import EventCache
+from custom_components.exchange_calendar.events import EventRecord
+
+ZONE = ZoneInfo("Europe/Berlin")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def _day(day: int) -> datetime:
+    return datetime(2026, 3, day, tzinfo=ZONE)
+
+
+def _event(item_id, day, hours=1):
+    start = int(_day(day).timestamp()) + 9 * 3600
+    return EventRecord(item_id, "1", item_id, None, start, start + hours * 3600)
+
+
+def _ids(events):
+    return [event.item_id for event in events]
+
+
+def test_lookup_returns_the_gaps_around_cached_windows(clock):
+    events = EventCache(ZONE)
+    events.store(_day(3), _day(5), [_event("A", 3), _event("B", 4)])
+    events.store(_day(7), _day(8), [_event("C", 7)])
+
+    found, gaps = events.lookup(_day(2), _day(9))
+    assert _ids(found) == ["A", "B", "C"]
+    assert gaps == [(_day(2), _day(3)), (_day(5), _day(7)), (_day(8), _day(9))]
+    assert events.lookup(_day(4), _day(5))[1] == []
+    assert (events.hits, events.misses) == (1, 1)
+
+
+def test_storing_a_window_replaces_what_it_covers(clock):
+    events = EventCache(ZONE)
+    events.store(_day(1), _day(10), [_event("A", 3), _event("B", 4), _event("C", 8)])
+    clock.now += 10
+    # B was deleted and A moved
+    events.store(_day(3), _day(5), [_event("A", 4)])
+
+    found, gaps = events.lookup(_day(1), _day(10))
+    assert _ids(found) == ["A", "C"] and found[0].start == _event("A", 4).start
+    assert gaps == []
+    assert len(events) == 2
+
+
+def test_expired_windows_only_answer_stale_lookups(clock):
+    events = EventCache(ZONE, ttl=60, stale_ttl=600)
+    events.store(_day(3), _day(4), [_event("A", 3)])
+
+    clock.now += 61
+    assert events.lookup(_day(3), _day(4))[1] == [(_day(3), _day(4))]
+    found, gaps = events.lookup(_day(3), _day(4), allow_stale=True)
+    assert _ids(found) == ["A"] and gaps == []
+
+    # Past the stale ttl the window and its events are pruned
+    clock.now += 600
+    assert events.lookup(_day(3), _day(4), allow_stale=True) == ([], [(_day(3), _day(4))])
+    assert len(events) == 0
+
+
+def test_windows_restored_from_disk_are_stale(clock):
+    events = EventCache(ZONE, ttl=60)
+    events.store(_day(3), _day(4), [_event("A", 3)], stale=True)
+    clock.now += 1
+
+    assert events.lookup(_day(3), _day(4))[1] == [(_day(3), _day(4))]
+    assert _ids(events.lookup(_day(3), _day(4), allow_stale=True)[0]) == ["A"]
+
+
+def test_oldest_windows_are_evicted_with_their_events(clock):
+    events = EventCache(ZONE, max_events=3)
+    events.store(_day(1), _day(3), [_event("A", 1), _event("Long", 2, hours=30)])
+    clock.now += 1
+    events.store(_day(3), _day(5), [_event("Long", 2, hours=30), _event("B", 3), _event("C", 4)])
+
+    found, gaps = events.lookup(_day(1), _day(5))
+    # The event running into the kept window stays with it
+    assert _ids(found) == ["Long", "B", "C"]
+    assert gaps == [(_day(1), _day(3))]
+
+
+def test_window_above_the_limit_is_not_cached(clock):
+    events = EventCache(ZONE, max_events=2)
+    events.store(_day(1), _day(5), [_event(item_id, 2) for item_id in "ABC"])
+
+    assert len(events) == 0
+    assert events.lookup(_day(1), _day(5)) == ([], [(_day(1), _day(5))])
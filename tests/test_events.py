@@ -0,0 +1,101 @@
+"""Event records built from the items Exchange returns through the integration's projections, and their pages."""
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.exchange_calendar.const import EVENT_FIELDS
+from custom_components.exchange_calendar.events import (
+    EventRecord,
+    occurrence_id,
+    paginate,
+    split_occurrence_id,
+)
+from custom_components.exchange_calendar.sync import SYNC_FIELDS
+
+ZONE = ZoneInfo("Europe/Berlin")
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time(), tzinfo=ZONE).astimezone(timezone.utc)
+
+
+def _all_day(calendar_item, fields, subject, first, last):
+    # Exchange returns all-day items as UTC instants of the creator's midnights, ending at the midnight after
+    return calendar_item(
+        fields, ZONE, subject=subject, start=_midnight(first), end=_midnight(last + timedelta(days=1)), is_all_day=True
+    )
+
+
+@pytest.mark.parametrize("fields", [EVENT_FIELDS, SYNC_FIELDS], ids=["calendar_view", "sync_items"])
+def test_all_day_items_span_their_days(calendar_item, fields):
+    # Berlin midnight is the evening before in UTC, so a date taken in the wrong zone is a day early
+    holiday = EventRecord.from_item(_all_day(calendar_item, fields, "Holiday", date(2026, 7, 1), date(2026, 7, 1)), ZONE)
+    trip    = EventRecord.from_item(_all_day(calendar_item, fields, "Trip", date(2026, 7, 2), date(2026, 7, 3)), ZONE)
+
+    assert holiday.all_day and trip.all_day
+    assert (holiday.local_start(ZONE), holiday.local_end(ZONE)) == (date(2026, 7, 1), date(2026, 7, 2))
+    assert (trip.local_start(ZONE), trip.local_end(ZONE)) == (date(2026, 7, 2), date(2026, 7, 4))
+    assert holiday.overlaps(int(_midnight(date(2026, 7, 1)).timestamp()) + 43200, int(_midnight(date(2026, 7, 2)).timestamp()))
+
+
+@pytest.mark.parametrize("fields", [EVENT_FIELDS, SYNC_FIELDS], ids=["calendar_view", "sync_items"])
+def test_timed_items_keep_their_times(calendar_item, fields):
+    start   = datetime(2026, 7, 1, 9, tzinfo=ZONE)
+    item    = calendar_item(
+        fields, ZONE, subject="Meeting", start=start, end=start + timedelta(hours=1), is_all_day=False,
+        location="Room A", categories=["Blue"], organizer="alice@example.com", legacy_free_busy_status="Busy",
+    )
+    meeting = EventRecord.from_item(item, ZONE)
+
+    assert not meeting.all_day
+    assert meeting.local_start(ZONE) == start
+    assert meeting.end - meeting.start == 3600
+    assert (meeting.location, meeting.categories, meeting.organizer, meeting.busy_status) == (
+        "Room A", ("Blue",), "alice@example.com", "Busy",
+    )
+    assert EventRecord.from_json(meeting.to_json()).to_json() == meeting.to_json()
+
+
+def test_occurrence_ids_round_trip():
+    assert split_occurrence_id(occurrence_id("AAMk+/=", 12)) == ("AAMk+/=", 12)
+    assert split_occurrence_id("AAMk+/=") == ("AAMk+/=", None)
+
+
+def _events(count):
+    # Two events per start, so the id breaks the ties
+    return [EventRecord(f"id{index:02d}", "1", f"Event {index}", None, 1000 + index // 2 * 60, 2000 + index, False) for index in range(count)]
+
+
+def test_cursor_pages_cover_every_event_once():
+    events = _events(7)
+    seen   = []
+    cursor = None
+    while True:
+        page, cursor = paginate(list(reversed(events)), 3, cursor=cursor)
+        seen.extend(event.item_id for event in page)
+        if cursor is None:
+            break
+    assert seen == [event.item_id for event in events]
+
+
+def test_cursor_is_not_shifted_by_deletions():
+    events       = _events(6)
+    page, cursor = paginate(events, 2)
+    assert [event.item_id for event in page] == ["id00", "id01"]
+
+    # Deleting an event of the first page would shift an offset by one
+    page, _ = paginate(events[1:], 2, cursor=cursor)
+    assert [event.item_id for event in page] == ["id02", "id03"]
+    page, _ = paginate(events[1:], 2, offset=2)
+    assert [event.item_id for event in page] == ["id03", "id04"]
+
+
+def test_last_page_has_no_cursor():
+    page, cursor = paginate(_events(3), 2, offset=1)
+    assert [event.item_id for event in page] == ["id01", "id02"] and cursor is None
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        paginate(_events(2), 1, cursor="not a cursor")
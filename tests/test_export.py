@@ -0,0 +1,135 @@
+"""iCalendar rendering and incremental exports."""
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.exchange_calendar.events import EventRecord
+from custom_components.exchange_calendar.export import CalendarExporter, _escape, _fold, vevent
+
+ZONE  = ZoneInfo("Europe/Berlin")
+STAMP = "20260301T000000Z"
+
+
+def _ts(*args) -> int:
+    return int(datetime(*args, tzinfo=ZONE).timestamp())
+
+
+def test_text_is_escaped():
+    assert _escape("a,b;c\\d\r\ne\nf") == "a\\,b\\;c\\\\d\\ne\\nf"
+
+
+def test_long_lines_are_folded_at_75_octets():
+    line   = "DESCRIPTION:" + "x" * 200
+    folded = _fold(line)
+    lines  = folded[:-2].split("\r\n")
+
+    assert folded.endswith("\r\n")
+    assert len(lines[0]) == 75 and all(len(part) <= 75 and part.startswith(" ") for part in lines[1:])
+    assert "".join(part[1:] if index else part for index, part in enumerate(lines)) == line
+    assert _fold("SUMMARY:short") == "SUMMARY:short\r\n"
+
+
+def test_folds_never_split_a_character():
+    line  = "SUMMARY:" + "ä€😀" * 30
+    lines = _fold(line)[:-2].split("\r\n")
+
+    assert all(len(part.encode()) <= 75 for part in lines)
+    assert "".join(part[1:] if index else part for index, part in enumerate(lines)) == line
+
+
+def test_vevent_of_timed_and_all_day_events():
+    meeting = EventRecord("A", "1", "Review, final", "Room 1", _ts(2026, 3, 2, 9), _ts(2026, 3, 2, 10), busy_status="Free")
+    text    = vevent(meeting, "Agenda", STAMP, ZONE)
+    assert text.split("\r\n")[:-1] == [
+        "BEGIN:VEVENT", "UID:A-20260302T080000Z", f"DTSTAMP:{STAMP}", "DTSTART:20260302T080000Z",
+        "DTEND:20260302T090000Z", "SUMMARY:Review\\, final", "LOCATION:Room 1", "TRANSP:TRANSPARENT",
+        "X-MICROSOFT-CDO-BUSYSTATUS:FREE", "DESCRIPTION:Agenda", "END:VEVENT",
+    ]
+
+    holiday = EventRecord("B", "1", "Holiday", None, _ts(2026, 3, 2), _ts(2026, 3, 3), True)
+    assert "DTSTART;VALUE=DATE:20260302\r\nDTEND;VALUE=DATE:20260303\r\n" in vevent(holiday, None, STAMP, ZONE)
+
+
+class _Client:
+    def __init__(self, events):
+        self.events = events
+        self.online = True
+        self.bodies = 0
+
+    async def async_refresh(self, force=False):
+        pass
+
+    async def async_get_events(self, start, end):
+        return [event for event in self.events if event.overlaps(int(start.timestamp()), int(end.timestamp()))]
+
+    async def async_load_bodies(self, events):
+        self.bodies += len(events)
+        return {event.item_id: f"Body of {event.subject}" for event in events}
+
+
+class _Store:
+    def __init__(self):
+        self.data = None
+
+    async def async_load(self):
+        return self.data
+
+    async def async_save(self, data):
+        self.data = data
+
+
+def _exporter(client):
+    async def run_job(func, *args):
+        return func(*args)
+
+    exporter = CalendarExporter(SimpleNamespace(async_add_executor_job=run_job), client, ZONE, "test")
+    exporter._store = _Store()
+    return exporter
+
+
+def _export(exporter, path, **kwargs):
+    start = datetime(2026, 1, 1, tzinfo=ZONE)
+    end   = datetime(2026, 4, 1, tzinfo=ZONE)
+    return asyncio.run(exporter.async_export(path, start, end, include_body=True, **kwargs))
+
+
+@pytest.fixture
+def events():
+    return [
+        EventRecord("A", "1", "January", None, _ts(2026, 1, 5, 9), _ts(2026, 1, 5, 10)),
+        EventRecord("B", "1", "February", None, _ts(2026, 2, 5, 9), _ts(2026, 2, 5, 10)),
+        EventRecord("C", "1", "March", None, _ts(2026, 3, 5, 9), _ts(2026, 3, 5, 10)),
+    ]
+
+
+def test_incremental_export_rewrites_only_changed_months(tmp_path, events):
+    path     = str(tmp_path / "calendar.ics")
+    client   = _Client(events)
+    exporter = _exporter(client)
+    assert _export(exporter, path)["rewritten"] == 3
+
+    client.events[1] = EventRecord("B", "2", "February (moved)", None, _ts(2026, 2, 6, 9), _ts(2026, 2, 6, 10))
+    client.bodies    = 0
+    result = _export(exporter, path, incremental=True)
+    assert (result["months"], result["rewritten"], result["events"], client.bodies) == (3, 1, 3, 1)
+
+    # The file is the same as a full export of the changed calendar
+    full_path = str(tmp_path / "full.ics")
+    _export(_exporter(_Client(client.events)), full_path)
+    with open(path) as exported, open(full_path) as full:
+        assert [line for line in exported if not line.startswith("DTSTAMP")] == [line for line in full if not line.startswith("DTSTAMP")]
+
+
+def test_incremental_export_starts_over_when_the_file_changed(tmp_path, events):
+    path     = str(tmp_path / "calendar.ics")
+    exporter = _exporter(_Client(events))
+    _export(exporter, path)
+
+    with open(path, "a") as file:
+        file.write("edited\r\n")
+    assert _export(exporter, path, incremental=True)["rewritten"] == 3
+    with open(path) as file:
+        assert "edited" not in file.read()
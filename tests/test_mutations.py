@@ -0,0 +1,92 @@
+"""Folding and batching of queued calendar changes."""
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.exchange_calendar.mutations import DELETE, EDIT, UPSERT, MutationQueue
+
+ZONE = ZoneInfo("Europe/Berlin")
+
+
+@pytest.fixture
+def queue():
+    queue = MutationQueue(None, "entry", None, None, None, None, ZONE, "test")
+
+    async def save():
+        pass
+
+    queue._async_save = save
+    queue.schedule    = lambda delay=None: None
+    return queue
+
+
+def _enqueue(queue, kind, subject=None, **kwargs):
+    return asyncio.run(queue.async_enqueue(kind, subject, **kwargs))
+
+
+def _kinds(mutations):
+    return [(mutation["kind"], mutation["subject"] or mutation["item_id"]) for mutation in mutations]
+
+
+def test_edits_of_the_same_event_are_folded(queue):
+    first  = _enqueue(queue, EDIT, "Review", fields={"location": "Room 1"})
+    second = _enqueue(queue, EDIT, "review", fields={"start": datetime(2026, 3, 2, 9, tzinfo=ZONE)}, idempotency_key="k")
+
+    assert second["coalesced"] and second["mutation_id"] == first["mutation_id"]
+    assert queue.pending == 1 and queue.coalesced == 1
+    assert queue._pending[0]["fields"] == {"location": "Room 1", "start": "2026-03-02T09:00:00+01:00"}
+    assert _enqueue(queue, EDIT, "Review", idempotency_key="k")["duplicate"]
+
+
+def test_later_upsert_replaces_the_fields(queue):
+    _enqueue(queue, UPSERT, "Review", fields={"location": "Room 1", "body": "Agenda"})
+    _enqueue(queue, UPSERT, "Review", fields={"location": "Room 2"})
+
+    assert queue.pending == 1 and queue._pending[0]["fields"] == {"location": "Room 2"}
+
+
+def test_changes_are_not_folded_across_a_rename_or_another_window(queue):
+    _enqueue(queue, EDIT, "Review", fields={"subject": "Final review"})
+    _enqueue(queue, EDIT, "Review", fields={"location": "Room 1"})
+    _enqueue(queue, EDIT, "Standup", window=[datetime(2026, 3, 1, tzinfo=ZONE), datetime(2026, 3, 2, tzinfo=ZONE)])
+    _enqueue(queue, EDIT, "Standup", window=[datetime(2026, 3, 2, tzinfo=ZONE), datetime(2026, 3, 3, tzinfo=ZONE)])
+
+    assert queue.pending == 4 and queue.coalesced == 0
+
+
+def test_changes_are_not_folded_over_a_conflicting_one(queue):
+    _enqueue(queue, EDIT, "Review", fields={"location": "Room 1"})
+    # Edits match by substring, so this may be the same event
+    _enqueue(queue, UPSERT, "Review notes")
+    _enqueue(queue, EDIT, "Review", fields={"location": "Room 2"})
+
+    assert queue.pending == 3
+
+
+def test_deletes_of_the_same_id_are_folded(queue):
+    _enqueue(queue, DELETE, item_id="A")
+    _enqueue(queue, DELETE, item_id="B")
+    _enqueue(queue, DELETE, item_id="A")
+
+    assert _kinds(queue._pending) == [(DELETE, "A"), (DELETE, "B")]
+
+
+def test_changes_being_written_are_not_folded_into(queue):
+    _enqueue(queue, EDIT, "Review", fields={"location": "Room 1"})
+    queue._in_flight = {queue._pending[0]["id"]}
+    assert not _enqueue(queue, EDIT, "Review", fields={"location": "Room 2"})["coalesced"]
+
+
+def test_batches_stop_before_a_conflicting_change(queue):
+    _enqueue(queue, UPSERT, "Review")
+    _enqueue(queue, EDIT, "Standup", fields={"subject": "Daily"})
+    _enqueue(queue, DELETE, item_id="A")
+    _enqueue(queue, EDIT, "Daily", fields={"location": "Room 1"})
+    _enqueue(queue, UPSERT, "Planning")
+
+    first = queue._next_batch()
+    assert _kinds(first) == [(UPSERT, "Review"), (EDIT, "Standup"), (DELETE, "A")]
+    queue._pending = queue._pending[len(first):]
+    assert _kinds(queue._next_batch()) == [(EDIT, "Daily"), (UPSERT, "Planning")]
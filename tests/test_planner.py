@@ -0,0 +1,47 @@
+"""CalendarView windows of long ranges."""
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from custom_components.exchange_calendar.const import DEFAULT_CHUNK_MAX_DAYS
+from custom_components.exchange_calendar.planner import month_windows, plan_windows, split_window
+
+ZONE = ZoneInfo("Europe/Berlin")
+
+
+def test_short_ranges_are_fetched_whole():
+    start = datetime(2026, 1, 20, 12, tzinfo=ZONE)
+    end   = start + timedelta(days=DEFAULT_CHUNK_MAX_DAYS)
+    assert plan_windows(start, end, ZONE) == [(start, end)]
+
+
+def test_long_ranges_are_cut_on_local_months():
+    start   = datetime(2025, 11, 15, 12, tzinfo=ZONE)
+    end     = datetime(2026, 3, 10, tzinfo=ZONE)
+    windows = plan_windows(start, end, ZONE)
+
+    assert windows == month_windows(start, end, ZONE)
+    assert [window_start for window_start, _ in windows] == [
+        start,
+        datetime(2025, 12, 1, tzinfo=ZONE),
+        datetime(2026, 1, 1, tzinfo=ZONE),
+        datetime(2026, 2, 1, tzinfo=ZONE),
+        datetime(2026, 3, 1, tzinfo=ZONE),
+    ]
+    assert windows[-1][1] == end
+    assert all(previous[1] == following[0] for previous, following in zip(windows, windows[1:]))
+
+
+def test_month_boundaries_follow_the_zone_not_the_bounds():
+    utc     = ZoneInfo("UTC")
+    start   = datetime(2026, 1, 31, 23, 30, tzinfo=utc)
+    windows = month_windows(start, datetime(2026, 3, 15, tzinfo=utc), ZONE)
+
+    # 23:30 UTC on 31 January is already February in Berlin
+    assert windows[0] == (start, datetime(2026, 3, 1, tzinfo=ZONE))
+
+
+def test_split_window_halves():
+    start = datetime(2026, 3, 1, tzinfo=ZONE)
+    assert split_window(start, start + timedelta(days=2)) == [
+        (start, start + timedelta(days=1)), (start + timedelta(days=1), start + timedelta(days=2)),
+    ]
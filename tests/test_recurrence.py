@@ -0,0 +1,130 @@
+"""Local expansion of recurring series."""
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from custom_components.exchange_calendar.events import EventRecord, split_occurrence_id, to_timestamp
+from custom_components.exchange_calendar.recurrence import (
+    DAILY,
+    START_TIMEZONE_FIELD,
+    WEEKLY,
+    _zone_key,
+    decode_series,
+    encode_series,
+    expand,
+)
+
+ZONE     = ZoneInfo("Europe/Berlin")
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def _ts(*args, zone=ZONE) -> int:
+    return int(datetime(*args, tzinfo=zone).timestamp())
+
+
+def _series(pattern=WEEKLY, first=date(2026, 3, 2), count=None, until=None, timezone="Europe/Berlin", **extra):
+    series = {
+        "pattern": pattern, "interval": 1, "first": first, "until": until, "count": count,
+        "deleted": [], "modified": [], "timezone": timezone,
+    }
+    if pattern == WEEKLY:
+        series.update({"weekdays": [1, 3, 5], "first_day_of_week": 1})
+    series.update(extra)
+    return series
+
+
+def _master(start, hours=1, all_day=False):
+    return EventRecord("M", "1", "Standup", None, start, start + int(hours * 3600), all_day)
+
+
+def _window(first: date, last: date):
+    return datetime.combine(first, datetime.min.time(), ZONE), datetime.combine(last, datetime.min.time(), ZONE)
+
+
+def _days(occurrences, zone=ZONE):
+    return [datetime.fromtimestamp(event.start, zone).date() for event in sorted(occurrences, key=lambda event: event.start)]
+
+
+def test_weekly_occurrences_are_numbered_from_the_first():
+    master = _master(_ts(2026, 3, 2, 9))
+    events = expand(master, _series(), *_window(date(2026, 3, 9), date(2026, 3, 14)), ZONE)
+
+    assert _days(events) == [date(2026, 3, 9), date(2026, 3, 11), date(2026, 3, 13)]
+    assert [split_occurrence_id(event.item_id) for event in events] == [("M", 4), ("M", 5), ("M", 6)]
+    assert all(datetime.fromtimestamp(event.start, ZONE).hour == 9 for event in events)
+
+
+def test_deleted_and_modified_occurrences_replace_their_instances():
+    master   = _master(_ts(2026, 3, 2, 9))
+    moved    = EventRecord("X", "2", "Standup (moved)", None, _ts(2026, 3, 12, 15), _ts(2026, 3, 12, 16))
+    series   = _series(deleted=[_ts(2026, 3, 9, 9)], modified=[[_ts(2026, 3, 11, 9), moved]])
+    events   = expand(master, series, *_window(date(2026, 3, 9), date(2026, 3, 14)), ZONE)
+
+    assert sorted(event.item_id for event in events) == ["M#6", "X"]
+    assert _days(events) == [date(2026, 3, 12), date(2026, 3, 13)]
+
+
+def test_numbered_series_stops_after_its_count():
+    master = _master(_ts(2026, 3, 2, 9))
+    events = expand(master, _series(DAILY, count=10), *_window(date(2026, 3, 8), date(2026, 3, 20)), ZONE)
+
+    assert [event.item_id for event in events] == [f"M#{index}" for index in range(7, 11)]
+
+
+def test_occurrences_overlapping_the_range_start_are_included():
+    master = _master(_ts(2026, 3, 2, 22), hours=4)
+    events = expand(master, _series(DAILY), *_window(date(2026, 3, 5), date(2026, 3, 6)), ZONE)
+
+    assert [event.item_id for event in events] == ["M#3", "M#4"]
+
+
+def test_timed_series_recur_in_their_own_zone():
+    # New York moves to summer time on 8 March, three weeks before Berlin
+    master = _master(_ts(2026, 3, 2, 9, zone=NEW_YORK))
+    series = _series(DAILY, timezone="America/New_York")
+    events = expand(master, series, *_window(date(2026, 3, 6), date(2026, 3, 11)), ZONE)
+
+    assert [datetime.fromtimestamp(event.start, NEW_YORK).hour for event in events] == [9] * 5
+    assert [datetime.fromtimestamp(event.start, ZONE).hour for event in events] == [15, 15, 14, 14, 14]
+
+
+def test_series_without_a_zone_recur_in_the_entry_zone():
+    master = _master(_ts(2026, 3, 27, 9))
+    events = expand(master, _series(DAILY, first=date(2026, 3, 27), timezone=None), *_window(date(2026, 3, 27), date(2026, 3, 31)), ZONE)
+
+    assert [datetime.fromtimestamp(event.start, ZONE).hour for event in events] == [9] * 4
+
+
+def test_all_day_occurrences_span_whole_local_days():
+    # Berlin's 29 March is 23 hours long, which must not shift the following days
+    master = _master(to_timestamp(date(2026, 3, 28), ZONE), hours=48, all_day=True)
+    series = _series(DAILY, first=date(2026, 3, 28), timezone="America/New_York", interval=2)
+    events = expand(master, series, *_window(date(2026, 3, 28), date(2026, 4, 2)), ZONE)
+
+    assert [(event.local_start(ZONE), event.local_end(ZONE)) for event in events] == [
+        (date(2026, 3, 28), date(2026, 3, 30)),
+        (date(2026, 3, 30), date(2026, 4, 1)),
+        (date(2026, 4, 1), date(2026, 4, 3)),
+    ]
+
+
+def test_zone_key_falls_back_when_unknown():
+    name = START_TIMEZONE_FIELD.name
+    assert _zone_key(SimpleNamespace(**{name: ZoneInfo("Asia/Tokyo")})) == "Asia/Tokyo"
+    assert _zone_key(SimpleNamespace(**{name: SimpleNamespace(key="Not/AZone")})) is None
+    assert _zone_key(SimpleNamespace(**{name: None})) is None
+    assert _zone_key(SimpleNamespace()) is None
+
+
+def test_series_survive_storage():
+    moved   = EventRecord("X", "2", "Standup (moved)", None, _ts(2026, 3, 12, 15), _ts(2026, 3, 12, 16))
+    series  = _series(until=date(2026, 6, 30), modified=[[_ts(2026, 3, 11, 9), moved]])
+    decoded = decode_series(encode_series(series))
+
+    assert decoded["first"] == series["first"] and decoded["until"] == series["until"]
+    assert decoded["modified"][0][1].to_json() == moved.to_json()
+    master = _master(_ts(2026, 3, 2, 9))
+    window = _window(date(2026, 3, 9), date(2026, 3, 21))
+    assert [event.to_json() for event in expand(master, decoded, *window, ZONE)] == [
+        event.to_json() for event in expand(master, series, *window, ZONE)
+    ]
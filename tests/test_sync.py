@@ -0,0 +1,102 @@
+"""Answers of the calendar mirror, fed with the changes SyncFolderItems reports."""
+import asyncio
+from datetime import date, datetime
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from custom_components.exchange_calendar.events import EventRecord
+from custom_components.exchange_calendar.recurrence import DAILY
+from custom_components.exchange_calendar.sync import CalendarSync
+
+ZONE = ZoneInfo("Europe/Berlin")
+
+
+def _ts(*args) -> int:
+    return int(datetime(*args, tzinfo=ZONE).timestamp())
+
+
+def _day(day: int):
+    return datetime(2026, 3, day, tzinfo=ZONE), datetime(2026, 3, day + 1, tzinfo=ZONE)
+
+
+class _Executor:
+    def __init__(self, changes):
+        self.changes = changes
+
+    async def async_run(self, func, *args, **kwargs):
+        return self.changes, "state"
+
+
+def _create(record, master=False, last_end=None, series=False, modified=False):
+    value = {"record": record, "master": master, "last_end": last_end, "modified": modified}
+    if series is not False:
+        value["series"] = series
+    return "create", value
+
+
+def _mirror(*changes, expand=False) -> CalendarSync:
+    sync = CalendarSync(None, SimpleNamespace(ready=True), None, ZONE, "test", _Executor(list(changes)), expand)
+    sync._store = SimpleNamespace(async_delay_save=lambda *args: None)
+    asyncio.run(sync.async_sync())
+    return sync
+
+
+def _ids(events):
+    return None if events is None else [event.item_id for event in events]
+
+
+MEETING = EventRecord("A", "1", "Review", None, _ts(2026, 3, 10, 9), _ts(2026, 3, 10, 10))
+# Daily series of March 1 to 5
+SERIES  = EventRecord("M", "1", "Review", None, _ts(2026, 3, 1, 14), _ts(2026, 3, 1, 15))
+
+
+def test_unsynced_mirror_cannot_answer():
+    sync = CalendarSync(None, SimpleNamespace(ready=False), None, ZONE, "test", _Executor([]))
+    assert sync.find_by_subject("Review", *_day(10)) is None
+    assert sync.events_between(*_day(10)) is None
+
+
+def test_subjects_match_whole_or_in_part():
+    sync = _mirror(_create(MEETING))
+    assert _ids(sync.find_by_subject("review", *_day(10))) == ["A"]
+    assert _ids(sync.find_by_subject("Revi", *_day(10))) == []
+    assert _ids(sync.find_by_subject("Revi", *_day(10), exact=False)) == ["A"]
+    assert _ids(sync.find_by_subject("Review", *_day(11))) == []
+
+
+def test_series_outside_the_range_do_not_stop_subject_matches():
+    sync = _mirror(_create(MEETING), _create(SERIES, master=True, last_end=_ts(2026, 3, 5, 15)))
+    assert _ids(sync.find_by_subject("Review", *_day(10))) == ["A"]
+    # Only CalendarView knows the occurrences of a series overlapping the range
+    assert sync.find_by_subject("Review", *_day(3)) is None
+    assert sync.events_between(*_day(3)) is None
+
+
+def test_modified_occurrences_of_series_outside_the_range_are_skipped():
+    sync = _mirror(_create(MEETING), _create(SERIES, master=True, last_end=_ts(2026, 3, 5, 15), series=None, modified=True))
+    assert _ids(sync.find_by_subject("Review", *_day(10))) == ["A"]
+    assert sync.find_by_subject("Other", *_day(3)) is None
+
+
+def test_modified_occurrences_of_expanded_series_match_by_their_own_subject():
+    moved  = EventRecord("X", "2", "Moved review", None, _ts(2026, 3, 3, 16), _ts(2026, 3, 3, 17))
+    series = {
+        "pattern": DAILY, "interval": 1, "first": date(2026, 3, 1), "until": None, "count": 5,
+        "deleted": [], "modified": [[_ts(2026, 3, 3, 14), moved]], "timezone": "Europe/Berlin",
+    }
+    sync   = _mirror(
+        _create(SERIES, master=True, last_end=_ts(2026, 3, 5, 15), series=series, modified=True),
+        expand=True,
+    )
+    assert _ids(sync.find_by_subject("Moved review", *_day(3))) == ["X"]
+    assert _ids(sync.find_by_subject("Moved review", *_day(4))) == []
+    assert _ids(sync.events_between(*_day(3))) == ["X"]
+    assert _ids(sync.events_between(*_day(4))) == ["M#4"]
+
+
+def test_deletes_drop_items_and_their_subjects():
+    sync = _mirror(_create(MEETING))
+    sync._executor.changes = [("delete", "A")]
+    asyncio.run(sync.async_sync(force=True))
+    assert _ids(sync.find_by_subject("Review", *_day(10))) == []
+    assert sync._subjects == {}
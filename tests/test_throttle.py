@@ -0,0 +1,117 @@
+"""Circuit breaker states and request pacing."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.exchange_calendar import throttle
+from custom_components.exchange_calendar.const import RETRY_BACKOFF_MAX
+from custom_components.exchange_calendar.throttle import CircuitBreaker, ExchangeUnavailable, RequestThrottle
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+
+    async def sleep(seconds):
+        clock.now += seconds
+
+    monkeypatch.setattr(throttle, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(throttle, "asyncio", SimpleNamespace(sleep=sleep))
+    return clock
+
+
+def _trip(breaker, failures):
+    for _ in range(failures):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_circuit_opens_after_failures_in_a_row(clock):
+    breaker = CircuitBreaker(threshold=3, reset_timeout=60)
+    _trip(breaker, 2)
+    breaker.record_success()
+    _trip(breaker, 2)
+    assert breaker.state == "closed"
+
+    _trip(breaker, 1)
+    assert (breaker.state, breaker.trips) == ("open", 1)
+    with pytest.raises(ExchangeUnavailable):
+        breaker.before_call()
+
+
+def test_one_probe_is_let_through_when_half_open(clock):
+    breaker = CircuitBreaker(threshold=1, reset_timeout=60)
+    _trip(breaker, 1)
+    clock.now += 60
+    assert breaker.state == "half_open"
+
+    breaker.before_call()
+    with pytest.raises(ExchangeUnavailable):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_probe_opens_the_circuit_again(clock):
+    breaker = CircuitBreaker(threshold=1, reset_timeout=60)
+    _trip(breaker, 1)
+    clock.now += 60
+    _trip(breaker, 1)
+    assert breaker.state == "open"
+    # A failed probe reopens the circuit it already counted, without another trip
+    assert breaker.trips == 1
+
+
+def test_lost_probe_is_given_up_on(clock):
+    breaker = CircuitBreaker(threshold=1, reset_timeout=60)
+    _trip(breaker, 1)
+    clock.now += 60
+    breaker.before_call()
+    clock.now += 60
+    breaker.before_call()
+
+
+def _acquire(limiter, calls):
+    async def run():
+        for _ in range(calls):
+            await limiter.async_acquire()
+
+    asyncio.run(run())
+
+
+def test_calls_beyond_the_burst_are_paced(clock):
+    # A rate of a power of two keeps the waits exact on the fake clock
+    limiter = RequestThrottle(rate=8, burst=5, max_retries=3, breaker=CircuitBreaker(5, 60))
+    start   = clock.now
+    _acquire(limiter, 5)
+    assert clock.now == start
+
+    _acquire(limiter, 8)
+    assert clock.now - start == pytest.approx(1.0)
+    assert limiter.waits == 8
+
+
+def test_back_off_holds_every_call(clock):
+    limiter = RequestThrottle(rate=10, burst=5, max_retries=3, breaker=CircuitBreaker(5, 60))
+    start   = clock.now
+    limiter.record_failure(SimpleNamespace(back_off=30))
+    limiter.back_off(10)
+    _acquire(limiter, 1)
+
+    assert clock.now - start == pytest.approx(30)
+    assert limiter.stats()["back_offs"] == 2
+
+
+def test_open_circuit_refuses_calls(clock):
+    limiter = RequestThrottle(rate=10, burst=5, max_retries=3, breaker=CircuitBreaker(1, 60))
+    limiter.record_failure(Exception())
+    assert not limiter.available
+    with pytest.raises(ExchangeUnavailable):
+        _acquire(limiter, 1)
+
+
+def test_retry_delays_grow_up_to_the_maximum():
+    limiter = RequestThrottle(rate=10, burst=5, max_retries=3, breaker=CircuitBreaker(5, 60))
+    assert all(0 <= limiter.retry_delay(attempt) <= min(RETRY_BACKOFF_MAX, 2 ** attempt) for attempt in range(10) for _ in range(20))
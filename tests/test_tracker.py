@@ -0,0 +1,97 @@
+"""Refills of the next-event tracker."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from custom_components.exchange_calendar.const import NEXT_EVENT_BATCH, NEXT_EVENT_REFILL_INTERVAL
+from custom_components.exchange_calendar.events import EventRecord
+from custom_components.exchange_calendar.tracker import NextEventTracker
+
+NOW = datetime(2026, 3, 2, 8, tzinfo=timezone.utc)
+
+
+class _Calendar:
+    """Answers like the client: the first events overlapping the range, and how far they are complete."""
+
+    def __init__(self, events, complete=True):
+        self.events   = events
+        self.complete = complete
+
+    async def fetch_upcoming(self, start, end, max_items):
+        events = [event for event in self.events if event.end > start.timestamp() and event.start < end.timestamp()]
+        events.sort(key=lambda event: event.start)
+        if not self.complete:
+            return events[:max_items], None
+        if len(events) > max_items:
+            return events[:max_items], datetime.fromtimestamp(events[max_items].start, timezone.utc)
+        return events, end
+
+
+def _event(item_id, start, minutes=30):
+    start = int(start.timestamp())
+    return EventRecord(item_id, "1", item_id, None, start, start + minutes * 60)
+
+
+def _poll(tracker, start, end, every=timedelta(seconds=30)):
+    async def run():
+        seen = []
+        now  = start
+        while now < end:
+            event = await tracker.async_next_event(now)
+            seen.append(event.item_id if event else None)
+            now += every
+        return seen
+
+    return asyncio.run(run())
+
+
+def test_events_are_popped_locally_as_they_end():
+    calendar = _Calendar([_event(f"E{hour}", NOW + timedelta(hours=hour)) for hour in range(5)])
+    tracker  = NextEventTracker(calendar.fetch_upcoming)
+
+    seen = _poll(tracker, NOW, NOW + timedelta(hours=2))
+    assert [seen[0], seen[-1]] == ["E0", "E2"]
+    assert tracker.refills == 1
+
+
+def test_nearly_empty_calendar_is_refilled_once_per_interval():
+    calendar = _Calendar([_event("Later", NOW + timedelta(days=40))])
+    tracker  = NextEventTracker(calendar.fetch_upcoming)
+
+    seen = _poll(tracker, NOW, NOW + timedelta(days=1))
+    assert set(seen) == {None}
+    assert tracker.refills == 86400 // NEXT_EVENT_REFILL_INTERVAL
+
+
+def test_event_entering_the_horizon_shows_up_within_the_interval():
+    calendar = _Calendar([_event("Later", NOW + timedelta(days=30, hours=5))])
+    tracker  = NextEventTracker(calendar.fetch_upcoming)
+
+    seen = _poll(tracker, NOW, NOW + timedelta(hours=7), every=timedelta(minutes=1))
+    assert seen.index("Later") <= (5 * 3600 + NEXT_EVENT_REFILL_INTERVAL) // 60
+
+
+def test_refills_when_the_batch_runs_out():
+    calendar = _Calendar([_event(f"E{index}", NOW + timedelta(minutes=30 * index)) for index in range(3 * NEXT_EVENT_BATCH)])
+    tracker  = NextEventTracker(calendar.fetch_upcoming)
+
+    seen = _poll(tracker, NOW, NOW + timedelta(minutes=30 * 3 * NEXT_EVENT_BATCH), every=timedelta(minutes=5))
+    assert [item_id for index, item_id in enumerate(seen) if index % 6 == 0] == [f"E{index}" for index in range(3 * NEXT_EVENT_BATCH)]
+    # One refill per batch, then one more an hour after the last, as the calendar runs nearly empty
+    assert tracker.refills == 5
+
+
+def test_changes_and_incomplete_answers_refill():
+    calendar = _Calendar([_event("E0", NOW + timedelta(hours=1))])
+    tracker  = NextEventTracker(calendar.fetch_upcoming)
+    _poll(tracker, NOW, NOW + timedelta(minutes=5))
+
+    calendar.events.append(_event("Sooner", NOW + timedelta(minutes=20)))
+    assert _poll(tracker, NOW + timedelta(minutes=5), NOW + timedelta(minutes=6), every=timedelta(minutes=1)) == ["E0"]
+    tracker.invalidate()
+    assert _poll(tracker, NOW + timedelta(minutes=6), NOW + timedelta(minutes=7), every=timedelta(minutes=1)) == ["Sooner"]
+
+    calendar.complete = False
+    refills = tracker.refills
+    tracker.invalidate()
+    _poll(tracker, NOW + timedelta(minutes=7), NOW + timedelta(minutes=9))
+    assert tracker.refills == refills + 4